@@ -0,0 +1,47 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+from dbt_graph_loader.loaders.kuzu_loader import DEFAULT_KUZU_DB_PATH, connect, query_rows
+
+
+class KuzuDatabase:
+    """The embedded Kuzu database used when GRAPH_DB=kuzu, opened once per process.
+
+    Opening the database costs far more than a chat query, and Kuzu lets a
+    process open a database file only once, so every query shares one
+    read-only handle, opened on first use. A load needs the file to itself:
+    it runs inside reloading(), which closes the handle, and the next query
+    opens it again on the new data.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = None
+        self._conn = None
+        # Queries share one connection and must not run while the handle is closed for a load
+        self._lock = threading.Lock()
+
+    def query(self, query: str) -> List[Dict[str, Any]]:
+        """Run a Cypher query; returns its rows as dicts keyed by column name"""
+        with self._lock:
+            if self._conn is None:
+                self._db, self._conn = connect(self.db_path, read_only=True)
+            return query_rows(self._conn, query)
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._db.close()
+            self._db = self._conn = None
+
+    @contextmanager
+    def reloading(self):
+        """Close the shared handle for a load; queries wait until the load is done"""
+        with self._lock:
+            self._close()
+            yield
+
+
+kuzu_database = KuzuDatabase(os.getenv("KUZU_DB_PATH", DEFAULT_KUZU_DB_PATH))
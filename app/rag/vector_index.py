@@ -1,7 +1,7 @@
 """GraphRAG: store embeddings directly on dbt_graph nodes and query via KNN."""
 import os
 import logging
-from typing import Optional, List
+from typing import Callable, Optional, List
 
 from falkordb import FalkorDB
 from langchain_core.documents import Document
@@ -10,10 +10,14 @@ from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_core.embeddings import Embeddings
 from pydantic import Field
 
+from dbt_graph_loader.manifest import Manifest, ManifestNode
+from dbt_graph_loader.loaders.falkordb_loader import resolve_graph_name
+
 logger = logging.getLogger(__name__)
 
 EMBEDDING_DIM = 1536  # titan-embed-text-v1 and text-embedding-3-small are both 1536
-GRAPH_NAME = "dbt_graph"
+# FalkorDB graph the server loads uploads into and answers from
+GRAPH_NAME = os.getenv("GRAPH_NAME", "dbt_graph")
 EMBEDDABLE_TYPES = {
     "model": "Model",
     "source": "Source",
@@ -24,7 +28,12 @@ EMBEDDABLE_TYPES = {
 _SPLIT_EMBEDDINGS = os.getenv("SPLIT_EMBEDDINGS", "false").lower() == "true"
 _CHUNK_SIZE = 6_000   # chars — safely under Titan's 8192 token limit
 _CHUNK_OVERLAP = 200  # chars of overlap between consecutive chunks
-CHUNK_GRAPH_NAME = "dbt_graph_chunks"
+CHUNK_GRAPH_NAME = f"{GRAPH_NAME}_chunks"
+
+
+def _chunk_graph_name(graph_name: str) -> str:
+    """Chunk graph paired with a graph, so blue/green slots each get their own"""
+    return CHUNK_GRAPH_NAME if graph_name == GRAPH_NAME else f"{graph_name}_chunks"
 
 
 def _split_text(text: str) -> list[str]:
@@ -50,13 +59,13 @@ def _embedder() -> Embeddings:
         raise ValueError(f"No embedding model available for provider: {model_type}")
 
 
-def _node_text(node_data: dict, catalog_nodes: dict) -> str:
+def _node_text(node: ManifestNode, catalog_nodes: dict) -> str:
     """Build a single text blob to embed for one node."""
-    name = node_data.get("name", "")
-    resource_type = node_data.get("resource_type", "")
-    description = (node_data.get("description") or "").strip()
-    schema = node_data.get("schema", "")
-    materialized = node_data.get("config", {}).get("materialized", "")
+    name = node.name
+    resource_type = node.resource_type
+    description = (node.description or "").strip()
+    schema = node.schema
+    materialized = node.config.get("materialized", "")
 
     lines = [f"{resource_type}: {name}"]
     if schema:
@@ -67,8 +76,8 @@ def _node_text(node_data: dict, catalog_nodes: dict) -> str:
         lines.append(f"Description: {description}")
 
     # Merge manifest + catalog columns
-    node_id = node_data.get("unique_id", "")
-    columns = dict(node_data.get("columns") or {})
+    node_id = node.unique_id
+    columns = dict(node.columns)
     for col_name, col_data in (catalog_nodes.get(node_id, {}).get("columns") or {}).items():
         columns.setdefault(col_name, col_data)
 
@@ -85,35 +94,46 @@ def _node_text(node_data: dict, catalog_nodes: dict) -> str:
     return "\n".join(lines)
 
 
-def _get_changed_node_ids(old_manifest: dict, new_manifest: dict) -> set:
+def _embeddable_nodes(manifest: Manifest) -> dict[str, ManifestNode]:
+    """Model / Source / Seed / Snapshot records of a manifest, keyed by unique_id."""
+    nodes = {}
+    for label in EMBEDDABLE_TYPES.values():
+        nodes.update(manifest.by_label[label])
+    return nodes
+
+
+def _get_changed_node_ids(old_manifest: Manifest, new_manifest: Manifest) -> set:
     """Return unique_ids of nodes that are new or whose embeddable text changed."""
-    def _collect(manifest: dict) -> dict:
-        nodes = {}
-        for node_id, node_data in manifest.get("nodes", {}).items():
-            if node_data.get("resource_type", "") in EMBEDDABLE_TYPES:
-                nodes[node_id] = node_data
-        for source_id, source_data in manifest.get("sources", {}).items():
-            nodes[source_id] = source_data
-        return nodes
-
-    old_nodes = _collect(old_manifest)
-    new_nodes = _collect(new_manifest)
+    old_nodes = _embeddable_nodes(old_manifest)
+    new_nodes = _embeddable_nodes(new_manifest)
 
     changed = set()
-    for uid, node_data in new_nodes.items():
-        if uid not in old_nodes or _node_text(node_data, {}) != _node_text(old_nodes[uid], {}):
+    for uid, node in new_nodes.items():
+        if uid not in old_nodes or _node_text(node, {}) != _node_text(old_nodes[uid], {}):
             changed.add(uid)
     return changed
 
 
+def _get_catalog_changed_node_ids(manifest: Manifest, old_catalog: dict, new_catalog: dict) -> set:
+    """Return unique_ids of nodes whose embeddable text changed with the catalog."""
+    old_catalog_nodes = old_catalog.get("nodes", {})
+    new_catalog_nodes = new_catalog.get("nodes", {})
+    return {
+        uid for uid, node in _embeddable_nodes(manifest).items()
+        if _node_text(node, old_catalog_nodes) != _node_text(node, new_catalog_nodes)
+    }
+
+
 def build_node_embeddings(
-    manifest_data: dict,
+    manifest: Manifest,
     catalog_data: dict,
     host: str = "falkordb",
     port: int = 6379,
     username: Optional[str] = None,
     password: Optional[str] = None,
     node_ids: Optional[set] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    graph_name: Optional[str] = None,
 ) -> None:
     """Compute embeddings and store them as an `embedding` property on existing
     Model / Source / Seed / Snapshot nodes in dbt_graph.
@@ -122,19 +142,19 @@ def build_node_embeddings(
     Safe to call repeatedly – index creation is idempotent.
 
     node_ids: if provided, only re-embed those specific unique_ids (incremental mode).
+    on_progress: called as on_progress(nodes embedded, nodes to embed) as embeddings are stored.
+    graph_name: graph to embed into (e.g. a blue/green staging graph); defaults to the live dbt_graph.
     """
     db = FalkorDB(host=host, port=port, username=username, password=password)
-    graph = db.select_graph(GRAPH_NAME)
+    graph_name = graph_name or resolve_graph_name(db, GRAPH_NAME)
+    graph = db.select_graph(graph_name)
+    chunk_graph_name = _chunk_graph_name(graph_name)
     catalog_nodes = catalog_data.get("nodes", {})
 
-    # Collect nodes to embed: unique_id -> (node_data, label)
-    to_embed: dict[str, tuple[dict, str]] = {}
-    for node_id, node_data in manifest_data.get("nodes", {}).items():
-        rt = node_data.get("resource_type", "")
-        if rt in EMBEDDABLE_TYPES:
-            to_embed[node_id] = (node_data, EMBEDDABLE_TYPES[rt])
-    for source_id, source_data in manifest_data.get("sources", {}).items():
-        to_embed[source_id] = (source_data, "Source")
+    # Collect nodes to embed: unique_id -> (node, label)
+    to_embed: dict[str, tuple[ManifestNode, str]] = {
+        uid: (node, node.label) for uid, node in _embeddable_nodes(manifest).items()
+    }
 
     if node_ids is not None:
         to_embed = {uid: v for uid, v in to_embed.items() if uid in node_ids}
@@ -145,22 +165,24 @@ def build_node_embeddings(
         return
 
     embedder = _embedder()
+    if on_progress is not None:
+        on_progress(0, len(to_embed))
 
     if _SPLIT_EMBEDDINGS:
         # ── Split mode: Chunk nodes stored in a separate graph ──
-        chunk_graph = db.select_graph(CHUNK_GRAPH_NAME)
+        chunk_graph = db.select_graph(chunk_graph_name)
         try:
             chunk_graph.query(
                 f"CREATE VECTOR INDEX FOR (n:Chunk) ON (n.embedding) "
                 f"OPTIONS {{dimension: {EMBEDDING_DIM}, similarityFunction: 'cosine'}}"
             )
-            logger.info("Created vector index on %s Chunk.embedding", CHUNK_GRAPH_NAME)
+            logger.info("Created vector index on %s Chunk.embedding", chunk_graph_name)
         except Exception as e:
             logger.debug("Chunk vector index already exists or failed: %s", e)
 
         updated = 0
-        for uid, (node_data, label) in to_embed.items():
-            text = _node_text(node_data, catalog_nodes)
+        for done, (uid, (node, label)) in enumerate(to_embed.items(), 1):
+            text = _node_text(node, catalog_nodes)
             chunks = _split_text(text)
 
             try:
@@ -172,11 +194,11 @@ def build_node_embeddings(
                 logger.warning("Could not delete old chunks for %s: %s", uid, e)
 
             node_attrs = {
-                "name": node_data.get("name", ""),
-                "description": (node_data.get("description") or "").strip(),
-                "resource_type": node_data.get("resource_type", ""),
-                "schema": node_data.get("schema", ""),
-                "materialized": node_data.get("config", {}).get("materialized", ""),
+                "name": node.name,
+                "description": (node.description or "").strip(),
+                "resource_type": node.resource_type,
+                "schema": node.schema,
+                "materialized": node.config.get("materialized", ""),
                 "parent_label": label,
             }
             vectors = embedder.embed_documents(chunks)
@@ -194,8 +216,10 @@ def build_node_embeddings(
                     updated += 1
                 except Exception as e:
                     logger.error("Error storing chunk %s: %s", chunk_id, e)
+            if on_progress is not None:
+                on_progress(done, len(to_embed))
 
-        logger.info("Stored %d chunks across %d nodes in %s", updated, len(to_embed), CHUNK_GRAPH_NAME)
+        logger.info("Stored %d chunks across %d nodes in %s", updated, len(to_embed), chunk_graph_name)
 
     else:
         # ── Default mode: single embedding stored on the node itself ──
@@ -215,7 +239,7 @@ def build_node_embeddings(
         vectors = embedder.embed_documents(texts)
 
         updated = 0
-        for uid, vec in zip(ids, vectors):
+        for done, (uid, vec) in enumerate(zip(ids, vectors), 1):
             _, label = to_embed[uid]
             try:
                 graph.query(
@@ -225,6 +249,8 @@ def build_node_embeddings(
                 updated += 1
             except Exception as e:
                 logger.error("Error storing embedding for %s: %s", uid, e)
+            if on_progress is not None:
+                on_progress(done, len(ids))
 
         logger.info("Stored embeddings on %d/%d nodes", updated, len(ids))
 
@@ -233,19 +259,35 @@ _FULLTEXT_LABELS = ["Model", "Source", "Seed", "Snapshot"]
 _FULLTEXT_PROPERTIES = ["name", "description", "schema", "alias", "materialized", "resource_type"]
 
 
+def drop_chunk_graph(
+    graph_name: str,
+    host: str = "falkordb",
+    port: int = 6379,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+) -> None:
+    """Drop the chunk graph paired with graph_name, e.g. before re-embedding a blue/green staging graph."""
+    db = FalkorDB(host=host, port=port, username=username, password=password)
+    try:
+        db.select_graph(_chunk_graph_name(graph_name)).delete()
+    except Exception as e:
+        logger.debug("Chunk graph of %s not dropped (may not exist): %s", graph_name, e)
+
+
 def build_fulltext_index(
     host: str = "falkordb",
     port: int = 6379,
     username: Optional[str] = None,
     password: Optional[str] = None,
+    graph_name: Optional[str] = None,
 ) -> None:
     """Create full-text indexes on key string properties of every embeddable label.
 
     Indexes: name, description, schema, alias, materialized, resource_type.
-    Idempotent — safe to call on every upload.
+    Idempotent — safe to call on every upload. Defaults to the live dbt_graph.
     """
     db = FalkorDB(host=host, port=port, username=username, password=password)
-    graph = db.select_graph(GRAPH_NAME)
+    graph = db.select_graph(graph_name or resolve_graph_name(db, GRAPH_NAME))
 
     props = ", ".join(f"n.{p}" for p in _FULLTEXT_PROPERTIES)
     for label in _FULLTEXT_LABELS:
@@ -276,7 +318,8 @@ class FalkorDBFulltextRetriever(BaseRetriever):
             host=self.host, port=self.port,
             username=self.username, password=self.password,
         )
-        graph = db.select_graph(GRAPH_NAME)
+        graph_name = resolve_graph_name(db, GRAPH_NAME)
+        graph = db.select_graph(graph_name)
 
         docs: list[Document] = []
         seen: set[str] = set()
@@ -422,14 +465,15 @@ class FalkorDBNodeRetriever(BaseRetriever):
             host=self.host, port=self.port,
             username=self.username, password=self.password,
         )
-        graph = db.select_graph(GRAPH_NAME)
+        graph_name = resolve_graph_name(db, GRAPH_NAME)
+        graph = db.select_graph(graph_name)
 
         docs: list[Document] = []
         seen: set[str] = set()
 
         if _SPLIT_EMBEDDINGS:
             try:
-                chunk_graph = db.select_graph(CHUNK_GRAPH_NAME)
+                chunk_graph = db.select_graph(_chunk_graph_name(graph_name))
                 # Fetch more chunks than k so deduplication still yields k unique parents
                 chunk_result = chunk_graph.query(
                     "CALL db.idx.vector.queryNodes('Chunk', 'embedding', $k, vecf32($vec)) "
@@ -15,8 +15,10 @@ from app.server.llm import LLMAgent
 from langchain_neo4j import GraphCypherQAChain, Neo4jGraph
 from langchain_core.tools import create_retriever_tool, StructuredTool
 from falkordb import FalkorDB as FalkorDBClient
+from dbt_graph_loader.loaders.falkordb_loader import resolve_graph_name
 
-from app.rag.vector_index import FalkorDBNodeRetriever, FalkorDBFulltextRetriever
+from app.rag.vector_index import FalkorDBNodeRetriever, FalkorDBFulltextRetriever, GRAPH_NAME
+from app.databases.kuzu_db import kuzu_database
 
 chat_router = APIRouter()
 
@@ -63,7 +65,7 @@ async def chat(
         def _run_cypher(query: str) -> str:
             try:
                 db = FalkorDBClient(**_falkor_kwargs)
-                g = db.select_graph("dbt_graph")
+                g = db.select_graph(resolve_graph_name(db, GRAPH_NAME))
                 result = g.query(query)
                 if not result.result_set:
                     return "No results found."
@@ -138,6 +140,30 @@ async def chat(
             ),
         ))
 
+    elif graph_db == 'kuzu':
+        def _run_kuzu_cypher(query: str) -> str:
+            try:
+                rows = kuzu_database.query(query)
+                if not rows:
+                    return "No results found."
+                return str(rows)
+            except Exception as e:
+                return f"Query error: {e}"
+
+        tools.append(StructuredTool.from_function(
+            func=_run_kuzu_cypher,
+            name="Kuzu_Knowledge_Graph_Retriever",
+            description=(
+                "Execute a Cypher query directly against the dbt knowledge graph "
+                "in the embedded Kuzu database and return raw results. Use for "
+                "structural questions: lineage, dependencies, tests, metadata. "
+                "Node labels are Model, Source, Seed, Snapshot, Test, `Macro`, "
+                "Operation and `Column` (Macro and Column are reserved words and "
+                "must be backquoted); use label(n) instead of labels(n). Pass a "
+                "valid Cypher string."
+            ),
+        ))
+
     async def stream_agent_response():
         try:
             async with LLMAgent(tools=tools) as llm_agent:
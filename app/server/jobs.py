@@ -0,0 +1,162 @@
+"""In-process queue of background ingestion jobs.
+
+Uploads are processed one at a time, so overlapping uploads never write to
+the same graph concurrently. A job that is still queued when a newer upload for
+the same graph arrives is superseded and never runs, so bursts of uploads
+collapse into a single reload. A graph is identified by its backend and its
+name, so uploads to other graphs of the same backend are never superseded.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept around for status queries
+MAX_FINISHED_JOBS = 100
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, SUPERSEDED = 'queued', 'running', 'succeeded', 'failed', 'superseded'
+
+# (graph_db, graph_name) of the graph a job writes
+GraphKey = Tuple[str, str]
+
+
+class PhaseProgress:
+    """Items done out of a known total for one phase of a job"""
+
+    def __init__(self):
+        self.done = 0
+        self.total = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def update(self, done: int, total: int):
+        if self.started_at is None:
+            self.started_at = time.time()
+        self.done, self.total = done, total
+        if total and done >= total:
+            self.finished_at = time.time()
+
+    def eta_seconds(self) -> Optional[float]:
+        """Remaining time at the phase's throughput so far"""
+        if self.started_at is None or not self.done or self.finished_at is not None:
+            return None
+        rate = self.done / (time.time() - self.started_at)
+        return round((self.total - self.done) / rate, 1) if rate else None
+
+    def to_dict(self) -> dict:
+        return {'done': self.done, 'total': self.total, 'eta_seconds': self.eta_seconds()}
+
+
+class IngestionJob:
+    """One upload: its status, timings and per-phase progress"""
+
+    PHASES = ('nodes', 'edges', 'embeddings')
+
+    def __init__(self, graph_db: str, graph: str, run: Callable[['IngestionJob'], Awaitable[None]]):
+        self.id = str(uuid.uuid4())
+        self.graph_db = graph_db
+        self.graph = graph
+        self.status = QUEUED
+        self.error: Optional[str] = None
+        self.superseded_by: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Set when the upload matched the content already loaded and nothing was written
+        self.skipped = False
+        self.phases: Dict[str, PhaseProgress] = {phase: PhaseProgress() for phase in self.PHASES}
+        # Dropped once the job is done, so superseded uploads do not hold memory
+        self._run: Optional[Callable[['IngestionJob'], Awaitable[None]]] = run
+
+    @property
+    def key(self) -> GraphKey:
+        return self.graph_db, self.graph
+
+    def progress(self, phase: str, done: int, total: int):
+        """Progress callback for the loaders and the embedding builder"""
+        self.phases[phase].update(done, total)
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'graph_db': self.graph_db,
+            'graph': self.graph,
+            'status': self.status,
+            'error': self.error,
+            'skipped': self.skipped,
+            'superseded_by': self.superseded_by,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'phases': {phase: progress.to_dict() for phase, progress in self.phases.items()},
+        }
+
+
+class JobQueue:
+    """Run ingestion jobs one at a time, coalescing queued jobs per graph"""
+
+    def __init__(self):
+        self.jobs: 'OrderedDict[str, IngestionJob]' = OrderedDict()
+        # (graph_db, graph_name) -> the job waiting to run against that graph
+        self._pending: Dict[GraphKey, IngestionJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def submit(self, graph_db: str, graph: str, run: Callable[[IngestionJob], Awaitable[None]]) -> IngestionJob:
+        """Queue a job for the graph named graph on the graph_db backend, superseding the one still waiting for it"""
+        job = IngestionJob(graph_db, graph, run)
+        previous = self._pending.get(job.key)
+        if previous is not None:
+            previous.status = SUPERSEDED
+            previous.superseded_by = job.id
+            previous.finished_at = time.time()
+            previous._run = None
+            logger.info(f"Job {previous.id} for {graph_db} graph {graph} superseded by {job.id}")
+        self._pending[job.key] = job
+        self.jobs[job.id] = job
+
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._queue.put_nowait(job)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._work())
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self.jobs.get(job_id)
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            if job.status != QUEUED:
+                continue
+            if self._pending.get(job.key) is job:
+                del self._pending[job.key]
+
+            job.status = RUNNING
+            job.started_at = time.time()
+            logger.info(f"Job {job.id} for {job.graph_db} graph {job.graph} started")
+            try:
+                await job._run(job)
+                job.status = SUCCEEDED
+            except Exception as e:
+                logger.exception(f"Job {job.id} for {job.graph_db} graph {job.graph} failed")
+                job.status = FAILED
+                job.error = str(e)
+            finally:
+                job.finished_at = time.time()
+                job._run = None
+            logger.info(f"Job {job.id} for {job.graph_db} graph {job.graph} {job.status}")
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status not in (QUEUED, RUNNING)]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+
+ingestion_jobs = JobQueue()
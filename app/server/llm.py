@@ -16,19 +16,42 @@ graphdb_name = os.environ.get('GRAPH_DB')
 PROMPT_MESSAGE = f"""You are a DBT Knowledge Assistant with access to a {graphdb_name} knowledge graph and a semantic vector index containing our dbt project metadata.
 
 ## Knowledge Graph ({graphdb_name})
-Node types: Model, Source, Macro, Test, Seed, Snapshot
-Model attributes: name, materialized, resource_type, alias, schema, description
-Relationships: DEPENDS_ON, REFERENCES, TESTS, USES_MACRO
-
-Example – find all downstreams of stg_students:
-MATCH (start:Model {{name: 'stg_students'}})<-[:DEPENDS_ON]-(downstream:Model)
+Node types: Model, Source, Macro, Test, Seed, Snapshot, Column
+Model attributes: name, materialized, resource_type, alias, schema, description, lineage_depth
+Column attributes: unique_id, name, parent_id, description, data_type, comment, index
+Relationships: DEPENDS_ON, REFERENCES, TESTS, USES_MACRO, ANCESTOR_OF, HAS_COLUMN, DERIVED_FROM
+DEPENDS_ON links a node to its direct parents only. ANCESTOR_OF is the precomputed
+full lineage between models, sources, seeds and snapshots: (ancestor)-[:ANCESTOR_OF]->(descendant)
+exists for every transitive dependency among them, so never write variable-length
+DEPENDS_ON* traversals for lineage. Tests reach their lineage through the TESTS relationship.
+lineage_depth is the longest dependency path from a node down to a source or seed.
+Every documented or cataloged column of a model, source, seed or snapshot is a Column
+node, linked by (parent)-[:HAS_COLUMN]->(column); parent_id is the parent's unique_id.
+When column lineage is loaded, columns are also linked by (column)-[:DERIVED_FROM]->(upstream column).
+Column unique_ids are the parent unique_id plus the lowercased column name.
+
+Example – find all downstreams of stg_students (direct and transitive):
+MATCH (start:Model {{name: 'stg_students'}})-[:ANCESTOR_OF]->(downstream:Model)
 RETURN downstream.name AS model_name, downstream.materialized AS materialization_type
 ORDER BY model_name
 
-Example – find all upstreams of stg_students:
-MATCH (start:Model {{name: 'stg_students'}})-[:DEPENDS_ON]->(upstream:Model)
-RETURN upstream.name AS model_name, upstream.materialized AS materialization_type
-ORDER BY model_name
+Example – find all upstreams of stg_students (direct and transitive):
+MATCH (upstream)-[:ANCESTOR_OF]->(start:Model {{name: 'stg_students'}})
+RETURN upstream.name AS name, upstream.resource_type AS resource_type, upstream.lineage_depth AS depth
+ORDER BY depth
+
+Example – find where the academic_standing column of student_academic_summary comes from:
+MATCH (m:Model {{name: 'student_academic_summary'}})
+MATCH (c:Column {{parent_id: m.unique_id, name: 'academic_standing'}})-[:DERIVED_FROM*1..10]->(upstream:Column)
+RETURN DISTINCT upstream.parent_id AS parent, upstream.name AS column_name
+
+Example – find every model with a column named student_id:
+MATCH (m:Model)-[:HAS_COLUMN]->(c:Column {{name: 'student_id'}})
+RETURN m.name AS model_name, c.data_type AS data_type
+
+Example – only the direct parents of stg_students:
+MATCH (start:Model {{name: 'stg_students'}})-[:DEPENDS_ON]->(upstream)
+RETURN upstream.name AS name
 
 ## Full-Text Search (DBT_Fulltext_Search)
 A full-text index over model descriptions. Use it to:
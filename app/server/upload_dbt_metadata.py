@@ -1,59 +1,173 @@
-import json
 import os
 
-from fastapi import APIRouter, Request, File, UploadFile
+from fastapi import APIRouter, HTTPException, Request, File, Form, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from typing import Annotated, Optional
 
-from dbt_graph_loader.loaders.falkordb_loader import DBTFalkorDBLoader
-from dbt_graph_loader.loaders.neo4j_loader import DBTNeo4jLoader
-from app.rag.vector_index import build_node_embeddings, build_fulltext_index, _get_changed_node_ids
+from dbt_graph_loader.loaders.async_falkordb_loader import AsyncDBTFalkorDBLoader
+from dbt_graph_loader.loaders.async_neo4j_loader import AsyncDBTNeo4jLoader
+from dbt_graph_loader.loaders.kuzu_loader import DBTKuzuLoader
+from dbt_graph_loader.manifest import Manifest, loads
+from app.rag.vector_index import (build_node_embeddings, build_fulltext_index, drop_chunk_graph, _get_changed_node_ids,
+                                  _get_catalog_changed_node_ids, GRAPH_NAME)
+from app.databases.kuzu_db import kuzu_database
+from app.server.jobs import IngestionJob, ingestion_jobs
 
 embeddings_router = APIRouter()
 
+# Load FalkorDB uploads into a staging graph and swap it in once indexed,
+# so chat keeps querying the previous graph during a reload
+_BLUE_GREEN_RELOAD = os.getenv("BLUE_GREEN_RELOAD", "false").lower() == "true"
+
+# Parse compiled model SQL into Column nodes and DERIVED_FROM relationships on upload
+_COLUMN_LINEAGE = os.getenv("COLUMN_LINEAGE", "false").lower() == "true"
+
 
 @embeddings_router.get("/")
 async def new_chat(request: Request):
     return {'results': 'ok'}
 
 
-@embeddings_router.post("/upload_dbt_to_kg/")
-async def upload_dbt_metadata(catalog_file: Annotated[UploadFile, File()],
-                              manifest_file: Annotated[UploadFile, File()]):
-    manifest_bytes = await manifest_file.read()
-    catalog_bytes = await catalog_file.read()
-
-    manifest_str = manifest_bytes.decode()
-    catalog_str = catalog_bytes.decode() if catalog_bytes else None
+def _load_kuzu(manifest: Manifest, catalog_data: dict):
+    # The chat's read-only handle is closed for the load and reopened by the next query
+    with kuzu_database.reloading():
+        loader = DBTKuzuLoader(kuzu_database.db_path, column_lineage=_COLUMN_LINEAGE)
+        try:
+            loader.load_parsed_manifest(manifest, catalog_data)
+        finally:
+            loader.close()
+
+
+async def _refresh_catalog(job: IngestionJob, loader, manifest_bytes: bytes, catalog_bytes: bytes, graph_db: str,
+                           graph_user: Optional[str], graph_password: Optional[str]):
+    """Apply the uploaded catalog to the loaded graph and re-embed only the nodes whose text it changed"""
+    manifest = await run_in_threadpool(Manifest.from_json, manifest_bytes, _COLUMN_LINEAGE)
+    catalog_data = await run_in_threadpool(loads, catalog_bytes)
+    refresh = await loader.refresh_catalog(manifest, catalog_data)
+    if graph_db == 'falkordb' and refresh:
+        node_ids = _get_catalog_changed_node_ids(manifest, refresh.previous.catalog(), refresh.current.catalog())
+        if node_ids:
+            await run_in_threadpool(
+                build_node_embeddings,
+                manifest=manifest,
+                catalog_data=catalog_data,
+                username=graph_user,
+                password=graph_password,
+                node_ids=node_ids,
+                on_progress=lambda done, total: job.progress('embeddings', done, total),
+            )
+            await run_in_threadpool(build_fulltext_index, username=graph_user, password=graph_password)
+
+
+async def _ingest(job: IngestionJob, manifest_bytes: bytes, catalog_bytes: bytes,
+                  graph_db: str, graph_user: Optional[str], graph_password: Optional[str], force: bool = False,
+                  catalog_only: bool = False):
+    """Load an upload into the graph and rebuild its indexes, reporting progress on the job"""
+    if graph_db == 'kuzu':
+        # Embedded bulk load; it reports no per-batch progress, and catalog-only uploads are loaded in full
+        manifest = await run_in_threadpool(Manifest.from_json, manifest_bytes, _COLUMN_LINEAGE)
+        catalog_data = await run_in_threadpool(loads, catalog_bytes) if catalog_bytes else {}
+        await run_in_threadpool(_load_kuzu, manifest, catalog_data)
+        return
 
+    if graph_db == 'falkordb':
+        loader = AsyncDBTFalkorDBLoader(graph_name=GRAPH_NAME, username=graph_user, password=graph_password,
+                                        column_lineage=_COLUMN_LINEAGE, force=force)
+    else:
+        loader = AsyncDBTNeo4jLoader('neo4j://neo4j:7687', graph_user, graph_password,
+                                     column_lineage=_COLUMN_LINEAGE, force=force)
+    loader.on_progress = job.progress
+    try:
+        # CI uploads after every dbt run; an upload identical to the loaded one is done before parsing
+        fingerprint = await loader.fingerprint_content_async(manifest_bytes, catalog_bytes)
+        if await loader.is_unchanged(fingerprint):
+            job.skipped = True
+            return
+        if catalog_only:
+            await _refresh_catalog(job, loader, manifest_bytes, catalog_bytes, graph_db, graph_user, graph_password)
+            # The graph now holds what a full load of this upload writes, so the same upload is skipped next time
+            await loader.record_load(fingerprint)
+            return
+
+        # Parse once into the compact IR; both the graph load and the embeddings use it.
+        # Parsing and embedding are CPU/IO bound and run in the threadpool, and the
+        # graph writes are awaited, so other requests are served during an upload.
+        manifest = await run_in_threadpool(Manifest.from_json, manifest_bytes, _COLUMN_LINEAGE)
+        catalog_data = await run_in_threadpool(loads, catalog_bytes) if catalog_bytes else {}
+
+        staging = None
+        if graph_db == 'falkordb' and _BLUE_GREEN_RELOAD:
+            staging = await loader.begin_blue_green()
+        await loader.load_parsed_manifest(manifest, catalog_data)
+
+        if graph_db == 'falkordb':
+            if staging is not None:
+                await run_in_threadpool(drop_chunk_graph, staging, username=graph_user, password=graph_password)
+            # Build vector index from model and column descriptions
+            await run_in_threadpool(
+                build_node_embeddings,
+                manifest=manifest,
+                catalog_data=catalog_data,
+                username=graph_user,
+                password=graph_password,
+                on_progress=lambda done, total: job.progress('embeddings', done, total),
+                graph_name=staging,
+            )
+            await run_in_threadpool(
+                build_fulltext_index,
+                username=graph_user,
+                password=graph_password,
+                graph_name=staging,
+            )
+        # Recorded only once the graph is fully indexed, so a failed upload is retried in full
+        await loader.record_load(fingerprint)
+        if staging is not None:
+            # Readers switch to the new graph only once it is fully indexed
+            await loader.promote(staging)
+    finally:
+        await loader.close()
+
+
+@embeddings_router.post("/upload_dbt_to_kg/", status_code=202)
+async def upload_dbt_metadata(catalog_file: Annotated[UploadFile, File()],
+                              manifest_file: Annotated[UploadFile, File()],
+                              force: Annotated[bool, Form()] = False,
+                              catalog_only: Annotated[bool, Form()] = False):
+    """Queue a load of the uploaded manifest and catalog; poll /jobs/{job_id} for progress.
+
+    The job finishes without loading when the graph already holds the same
+    content (``skipped`` in its status), unless force is set. With
+    catalog_only, the graph must already be loaded from the same manifest: only
+    the catalog-derived properties are updated and only the nodes whose text
+    changed are re-embedded.
+    """
     graph_db = os.environ.get('GRAPH_DB')
     graph_user = os.environ.get('GRAPH_USER')
     graph_password = os.environ.get('GRAPH_PASSWORD')
-
-    if graph_db == 'falkordb':
-        loader = DBTFalkorDBLoader(username=graph_user, password=graph_password)
-        loader.load_dbt_to_falkordb_from_strings(manifest_str, catalog_str)
-
-        # Build vector index from model and column descriptions
-        manifest_data = json.loads(manifest_str)
-        catalog_data = json.loads(catalog_str) if catalog_str else {}
-        build_node_embeddings(
-            manifest_data=manifest_data,
-            catalog_data=catalog_data,
-            username=graph_user,
-            password=graph_password,
-        )
-        build_fulltext_index(
-            username=graph_user,
-            password=graph_password,
-        )
-
-    elif graph_db == 'neo4j':
-        loader = DBTNeo4jLoader('neo4j://neo4j:7687', graph_user, graph_password)
-        loader.load_dbt_to_neo4j_from_strings(manifest_str, catalog_str)
-    else:
+    if graph_db not in ('falkordb', 'neo4j', 'kuzu'):
         raise Exception('GRAPH_DB value is incorrect')
 
-    return {'results': 'ok'}
+    manifest_bytes = await manifest_file.read()
+    catalog_bytes = await catalog_file.read()
+
+    # Neo4j uploads go to the default database
+    graph_name = {'falkordb': GRAPH_NAME, 'neo4j': 'neo4j', 'kuzu': kuzu_database.db_path}[graph_db]
+    job = ingestion_jobs.submit(
+        graph_db,
+        graph_name,
+        lambda job: _ingest(job, manifest_bytes, catalog_bytes, graph_db, graph_user, graph_password, force,
+                            catalog_only),
+    )
+    return {'results': 'ok', 'job_id': job.id, 'status': job.status}
+
+
+@embeddings_router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status and per-phase progress (nodes, edges, embeddings) of an ingestion job"""
+    job = ingestion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f'Unknown job {job_id}')
+    return job.to_dict()
 
 
 @embeddings_router.post("/rebuild_embeddings/")
@@ -69,15 +183,15 @@ async def rebuild_embeddings(
     graph_user = os.environ.get('GRAPH_USER')
     graph_password = os.environ.get('GRAPH_PASSWORD')
 
-    manifest_data = json.loads((await manifest_file.read()).decode())
+    manifest = Manifest.from_json(await manifest_file.read())
 
     node_ids = None
     if old_manifest_file is not None:
-        old_manifest_data = json.loads((await old_manifest_file.read()).decode())
-        node_ids = _get_changed_node_ids(old_manifest_data, manifest_data)
+        old_manifest = Manifest.from_json(await old_manifest_file.read())
+        node_ids = _get_changed_node_ids(old_manifest, manifest)
 
     build_node_embeddings(
-        manifest_data=manifest_data,
+        manifest=manifest,
         catalog_data={},
         username=graph_user,
         password=graph_password,
@@ -0,0 +1,275 @@
+"""Full and incremental load benchmarks of the Neo4j and FalkorDB loaders.
+
+For every size, a synthetic project of that many dbt resources (see
+``dbt_graph_loader.synthetic``) is generated once into --data-dir together with
+its next version. Each backend then runs:
+
+- ``full``: a full load of the project, including parsing the manifest; with
+  --pipeline, a pipelined streaming load
+- ``incremental``: an incremental update to the next version, after an
+  untimed full load of the project
+
+While a run is in progress, the resident memory of the process and the rows
+written so far are sampled every --sample-interval seconds. Every run's
+per-phase profile and samples are written to one JSON file in --output-dir.
+With --baseline, runs more than --tolerance slower than the same run in an
+earlier results file are reported and the script exits with status 1.
+
+The Neo4j runs clear the whole database: point them at a scratch instance,
+e.g. the containers started by ``just benchmark``.
+"""
+
+import json
+import logging
+import platform
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import click
+from neo4j.exceptions import ServiceUnavailable
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from dbt_graph_loader.loaders.falkordb_loader import DBTFalkorDBLoader
+from dbt_graph_loader.loaders.neo4j_loader import DBTNeo4jLoader, DEFAULT_BATCH_SIZE
+from dbt_graph_loader.loaders.profiling import current_rss, peak_rss
+from dbt_graph_loader.synthetic import generate_project, mutate_project, scaled_counts, write_project
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+
+
+class Sampler(threading.Thread):
+    """Samples memory and progress of a loader until stopped"""
+
+    def __init__(self, loader, interval: float):
+        super().__init__(daemon=True)
+        self.loader = loader
+        self.interval = interval
+        self.samples: List[Dict[str, Any]] = []
+        self._stop_event = threading.Event()
+        self._start = time.perf_counter()
+
+    def sample(self):
+        # A load replaces loader.profile when it starts, so it is looked up on every sample
+        profile = self.loader.profile
+        self.samples.append({
+            'seconds': round(time.perf_counter() - self._start, 3),
+            'rss_bytes': current_rss() or peak_rss(),
+            'rows': profile.rows,
+            'phase': profile.current_phase,
+        })
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.sample()
+
+
+def project_files(data_dir: Path, nodes: int, seed: int, columns: int, depth: int, fan_in: int) -> Dict[str, str]:
+    """Paths of the generated project of a size and its next version, generating them on first use"""
+    directory = data_dir / f"nodes{nodes}_seed{seed}_columns{columns}_depth{depth}_fanin{fan_in}"
+    files = {
+        'manifest': directory / 'manifest.json', 'catalog': directory / 'catalog.json',
+        'next_manifest': directory / 'manifest_next.json', 'next_catalog': directory / 'catalog_next.json',
+    }
+    if not all(path.exists() for path in files.values()):
+        start = time.perf_counter()
+        manifest, catalog = generate_project(**scaled_counts(nodes), columns=columns, depth=depth, fan_in=fan_in,
+                                             seed=seed)
+        write_project(str(directory), manifest, catalog)
+        write_project(str(directory), *mutate_project(manifest, catalog, seed=seed + 1), suffix='_next')
+        logger.info(f"Generated a {nodes}-node project in {directory} in {time.perf_counter() - start:.1f}s")
+    return {key: str(path) for key, path in files.items()}
+
+
+def connect(backend: str, options: Dict[str, Any], timeout: float = 120.0):
+    """A loader for backend, waiting up to timeout seconds for a freshly started container to accept connections.
+
+    Every load is forced, since the graph usually still holds the project of the previous run.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if backend == 'neo4j':
+                loader = DBTNeo4jLoader(options['neo4j_uri'], options['neo4j_username'], options['neo4j_password'],
+                                        batch_size=options['batch_size'], workers=options['workers'],
+                                        column_lineage=options['column_lineage'], force=True,
+                                        pipeline=options['pipeline'])
+                loader.driver.verify_connectivity()
+            else:
+                loader = DBTFalkorDBLoader(options['falkordb_host'], options['falkordb_port'], options['graph_name'],
+                                           batch_size=options['batch_size'], workers=options['workers'],
+                                           column_lineage=options['column_lineage'], force=True,
+                                           pipeline=options['pipeline'])
+            return loader
+        except (ServiceUnavailable, RedisConnectionError, OSError) as e:
+            if time.monotonic() > deadline:
+                raise
+            logger.info(f"Waiting for {backend}: {e}")
+            time.sleep(2)
+
+
+def full_load(loader, manifest_path: str, catalog_path: str):
+    if isinstance(loader, DBTNeo4jLoader):
+        if loader.pipeline:
+            loader.load_dbt_to_neo4j_streaming(manifest_path, catalog_path)
+        else:
+            loader.load_dbt_to_neo4j_from_files(manifest_path, catalog_path)
+    elif loader.pipeline:
+        loader.load_dbt_to_falkordb_streaming(manifest_path, catalog_path)
+    else:
+        loader.load_dbt_to_falkordb(manifest_path, catalog_path)
+
+
+def run_case(backend: str, mode: str, nodes: int, files: Dict[str, str], options: Dict[str, Any]) -> Dict[str, Any]:
+    loader = connect(backend, options)
+    try:
+        if mode == 'incremental':
+            full_load(loader, files['manifest'], files['catalog'])
+        sampler = Sampler(loader, options['sample_interval'])
+        sampler.start()
+        try:
+            if mode == 'incremental':
+                loader.incremental_update_from_files(files['manifest'], files['next_manifest'], files['next_catalog'])
+            else:
+                full_load(loader, files['manifest'], files['catalog'])
+        finally:
+            sampler.stop()
+        profile = loader.profile
+    finally:
+        loader.close()
+    return {
+        'backend': backend,
+        'mode': mode,
+        'nodes': nodes,
+        'seconds': round(profile.total_seconds, 3),
+        'rows': profile.rows,
+        'rows_per_second': round(profile.rows / profile.total_seconds, 1) if profile.total_seconds else 0.0,
+        'peak_rss_bytes': profile.peak_rss,
+        'profile': profile.to_dict(),
+        'samples': sampler.samples,
+    }
+
+
+def _key(run: Dict[str, Any]) -> Tuple[str, str, int]:
+    return run['backend'], run['mode'], run['nodes']
+
+
+def regressions(runs: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Runs slower than the same run of the baseline by more than tolerance"""
+    previous = {_key(run): run for run in baseline.get('runs', [])}
+    found = []
+    for run in runs:
+        before = previous.get(_key(run))
+        if before and before['seconds'] and run['seconds'] > before['seconds'] * (1 + tolerance):
+            found.append(f"{run['backend']} {run['mode']} {run['nodes']} nodes: {before['seconds']:.2f}s -> "
+                         f"{run['seconds']:.2f}s (+{run['seconds'] / before['seconds'] - 1:.0%})")
+    return found
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def summary(runs: List[Dict[str, Any]]) -> str:
+    lines = [f"{'backend':<10} {'mode':<12} {'nodes':>8} {'seconds':>9} {'rows':>10} {'rows/s':>10} "
+             f"{'peak RSS':>12} {'slowest phase':<16}"]
+    for run in runs:
+        phases = sorted(run['profile']['phases'], key=lambda phase: phase['seconds'], reverse=True)
+        peak = f"{run['peak_rss_bytes'] / 1024 / 1024:.1f} MiB" if run['peak_rss_bytes'] else '-'
+        lines.append(f"{run['backend']:<10} {run['mode']:<12} {run['nodes']:>8} {run['seconds']:>9.2f} "
+                     f"{run['rows']:>10} {run['rows_per_second']:>10.0f} {peak:>12} "
+                     f"{phases[0]['phase'] if phases else '-':<16}")
+    return '\n'.join(lines)
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+@click.command()
+@click.option('--sizes', default='1000,10000,100000', show_default=True,
+              help='Comma-separated project sizes, in dbt resources')
+@click.option('--backends', default='neo4j,falkordb', show_default=True, help='Comma-separated backends to run')
+@click.option('--modes', default='full,incremental', show_default=True, help='Comma-separated load modes to run')
+@click.option('--neo4j-uri', default='bolt://localhost:7687', show_default=True)
+@click.option('--neo4j-username', default='neo4j', show_default=True)
+@click.option('--neo4j-password', default='Testtest123', show_default=True)
+@click.option('--falkordb-host', default='localhost', show_default=True)
+@click.option('--falkordb-port', default=6379, show_default=True)
+@click.option('--graph-name', default='dbt_benchmark', show_default=True, help='FalkorDB graph loaded into')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True, type=click.IntRange(min=1))
+@click.option('--workers', default=1, show_default=True, type=click.IntRange(min=1))
+@click.option('--column-lineage', is_flag=True, default=False, help='Include column-level lineage in every load')
+@click.option('--pipeline', is_flag=True, default=False,
+              help='Run full loads as pipelined streaming loads, writing while the manifest is decoded')
+@click.option('--columns', default=8, show_default=True, help='Columns per relation of the generated projects')
+@click.option('--depth', default=10, show_default=True, help='Model layers of the generated projects')
+@click.option('--fan-in', default=3, show_default=True, help='Most parents of a generated model')
+@click.option('--seed', default=0, show_default=True, help='Seed of the generated projects')
+@click.option('--sample-interval', default=0.25, show_default=True, help='Seconds between memory/progress samples')
+@click.option('--data-dir', default=str(BENCHMARK_DIR / 'data'), show_default=True,
+              help='Where generated projects are cached')
+@click.option('--output-dir', default=str(BENCHMARK_DIR / 'results'), show_default=True,
+              help='Where the results file is written')
+@click.option('--baseline', type=click.Path(exists=True, dir_okay=False),
+              help='Earlier results file to compare against')
+@click.option('--tolerance', default=0.2, show_default=True, help='Slowdown vs the baseline reported as a regression')
+def main(sizes: str, backends: str, modes: str, baseline: str, tolerance: float, data_dir: str, output_dir: str,
+         seed: int, columns: int, depth: int, fan_in: int, **options):
+    """Benchmark full and incremental loads at several project sizes."""
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    logger.setLevel(logging.INFO)
+    started_at = datetime.now(timezone.utc)
+    runs = []
+    for nodes in (int(size) for size in _csv(sizes)):
+        files = project_files(Path(data_dir), nodes, seed, columns, depth, fan_in)
+        for backend in _csv(backends):
+            for mode in _csv(modes):
+                logger.info(f"Running {backend} {mode} at {nodes} nodes")
+                runs.append(run_case(backend, mode, nodes, files, options))
+                logger.info(f"{backend} {mode} at {nodes} nodes: {runs[-1]['seconds']:.2f}s")
+
+    results = {
+        'started_at': started_at.isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'seed': seed, 'columns': columns, 'depth': depth, 'fan_in': fan_in,
+                   'batch_size': options['batch_size'], 'workers': options['workers'],
+                   'column_lineage': options['column_lineage'], 'pipeline': options['pipeline']},
+        'runs': runs,
+    }
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    path = Path(output_dir) / f"loader-{started_at:%Y%m%dT%H%M%SZ}-{results['git_commit']}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    click.echo(summary(runs))
+    click.echo(f"Results written to {path}")
+
+    if baseline:
+        with open(baseline, encoding='utf-8') as f:
+            found = regressions(runs, json.load(f), tolerance)
+        for line in found:
+            click.echo(f"Regression: {line}")
+        if found:
+            sys.exit(1)
+        click.echo(f"No run is more than {tolerance:.0%} slower than {baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,44 +1,171 @@
 """DBT Graph Loader - Load DBT metadata into graph databases."""
 
-from .loaders.neo4j_loader import DBTNeo4jLoader
+from .loaders.neo4j_loader import DBTNeo4jLoader, DEFAULT_BATCH_SIZE
 from .loaders.falkordb_loader import DBTFalkorDBLoader
+from .loaders.async_neo4j_loader import AsyncDBTNeo4jLoader
+from .loaders.async_falkordb_loader import AsyncDBTFalkorDBLoader
+from .loaders.bulk_export import BULK_EXPORTERS, Neo4jBulkExporter, FalkorDBBulkExporter
+from .loaders.kuzu_loader import DBTKuzuLoader, DEFAULT_KUZU_DB_PATH
+from .loaders.profiling import LoadProfile
+from .fingerprint import ManifestFingerprint
+from .multi_project import Project, ProjectResult, find_projects, load_projects
+from .manifest import Manifest, read_json
 
 
-def load_to_neo4j(uri: str, username: str, password: str, manifest_path: str, catalog_path: str = None):
-    """Convenience function to load DBT data into Neo4j."""
-    loader = DBTNeo4jLoader(uri, username, password)
+def load_to_neo4j(uri: str, username: str, password: str, manifest_path: str, catalog_path: str = None,
+                  batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1, streaming: bool = False,
+                  dbt_labels_only: bool = False, column_lineage: bool = False,
+                  parse_processes: int = None, force: bool = False, pipeline: bool = False,
+                  pipeline_process: bool = False, resume: bool = False) -> LoadProfile:
+    """Convenience function to load DBT data into Neo4j; returns the load's profile.
+
+    The load is skipped when the graph already holds the same manifest and catalog content, unless force is set.
+    pipeline (and pipeline_process) and resume imply a streaming load.
+    """
+    loader = DBTNeo4jLoader(uri, username, password, batch_size=batch_size, workers=workers,
+                            dbt_labels_only=dbt_labels_only, column_lineage=column_lineage,
+                            parse_processes=parse_processes, force=force, pipeline=pipeline or pipeline_process,
+                            pipeline_process=pipeline_process, resume=resume)
+    try:
+        if streaming or loader.pipeline or resume:
+            loader.load_dbt_to_neo4j_streaming(manifest_path, catalog_path)
+        else:
+            loader.load_dbt_to_neo4j_from_files(manifest_path, catalog_path)
+        if not loader.profile.skipped:
+            loader.get_graph_stats()
+        return loader.profile
+    finally:
+        loader.close()
+
+
+def incremental_update_neo4j(uri: str, username: str, password: str, old_manifest_path: str,
+                             new_manifest_path: str, catalog_path: str = None,
+                             batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1, column_lineage: bool = False,
+                             parse_processes: int = None) -> LoadProfile:
+    """Incrementally update a Neo4j graph from two manifest files; returns the update's profile."""
+    loader = DBTNeo4jLoader(uri, username, password, batch_size=batch_size, workers=workers,
+                            column_lineage=column_lineage, parse_processes=parse_processes)
     try:
-        loader.load_dbt_to_neo4j_from_files(manifest_path, catalog_path)
+        loader.incremental_update_from_files(old_manifest_path, new_manifest_path, catalog_path)
         loader.get_graph_stats()
+        return loader.profile
+    finally:
+        loader.close()
+
+
+def refresh_catalog_neo4j(uri: str, username: str, password: str, manifest_path: str, catalog_path: str,
+                          batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1) -> LoadProfile:
+    """Update only the catalog-derived properties of a loaded Neo4j graph; returns the refresh's profile."""
+    loader = DBTNeo4jLoader(uri, username, password, batch_size=batch_size, workers=workers)
+    try:
+        loader.refresh_catalog_from_files(manifest_path, catalog_path)
+        return loader.profile
     finally:
         loader.close()
 
 
 def load_to_falkordb(host: str = 'localhost', port: int = 6379, graph_name: str = 'dbt_graph',
                     username: str = None, password: str = None, manifest_path: str = None,
-                    catalog_path: str = None):
-    """Convenience function to load DBT data into FalkorDB."""
-    loader = DBTFalkorDBLoader(host, port, graph_name, username, password)
-    # try:
-    loader.load_dbt_to_falkordb(manifest_path, catalog_path)
-    loader.get_graph_stats()
-    # finally:
-    #     loader.close()
+                    catalog_path: str = None, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1,
+                    streaming: bool = False, blue_green: bool = False, dbt_labels_only: bool = False,
+                    column_lineage: bool = False, parse_processes: int = None, force: bool = False,
+                    pipeline: bool = False, pipeline_process: bool = False, resume: bool = False) -> LoadProfile:
+    """Convenience function to load DBT data into FalkorDB; returns the load's profile.
+
+    The load is skipped when the graph already holds the same manifest and catalog content, unless force is set.
+    pipeline (and pipeline_process) and resume imply a streaming load.
+    """
+    loader = DBTFalkorDBLoader(host, port, graph_name, username, password, batch_size=batch_size, workers=workers,
+                               dbt_labels_only=dbt_labels_only, column_lineage=column_lineage,
+                               parse_processes=parse_processes, force=force, pipeline=pipeline or pipeline_process,
+                               pipeline_process=pipeline_process, resume=resume)
+    streaming = streaming or loader.pipeline or resume
+    try:
+        if blue_green:
+            loader.load_dbt_to_falkordb_blue_green(manifest_path, catalog_path, streaming=streaming)
+        elif streaming:
+            loader.load_dbt_to_falkordb_streaming(manifest_path, catalog_path)
+        else:
+            loader.load_dbt_to_falkordb(manifest_path, catalog_path)
+        if not loader.profile.skipped:
+            loader.get_graph_stats()
+        return loader.profile
+    finally:
+        loader.close()
 
 
 def incremental_update_falkordb(host: str = 'localhost', port: int = 6379, graph_name: str = 'dbt_graph',
                                 username: str = None, password: str = None,
                                 old_manifest_path: str = None, new_manifest_path: str = None,
-                                catalog_path: str = None):
-    """Incrementally update a FalkorDB graph from two manifest files."""
-    loader = DBTFalkorDBLoader(host, port, graph_name, username, password)
-    loader.incremental_update_from_files(old_manifest_path, new_manifest_path, catalog_path)
-    loader.get_graph_stats()
+                                catalog_path: str = None, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1,
+                                column_lineage: bool = False, parse_processes: int = None) -> LoadProfile:
+    """Incrementally update a FalkorDB graph from two manifest files; returns the update's profile."""
+    loader = DBTFalkorDBLoader(host, port, graph_name, username, password, batch_size=batch_size, workers=workers,
+                               column_lineage=column_lineage, parse_processes=parse_processes)
+    try:
+        loader.incremental_update_from_files(old_manifest_path, new_manifest_path, catalog_path)
+        loader.get_graph_stats()
+        return loader.profile
+    finally:
+        loader.close()
+
+
+def refresh_catalog_falkordb(host: str = 'localhost', port: int = 6379, graph_name: str = 'dbt_graph',
+                             username: str = None, password: str = None, manifest_path: str = None,
+                             catalog_path: str = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                             workers: int = 1) -> LoadProfile:
+    """Update only the catalog-derived properties of a loaded FalkorDB graph; returns the refresh's profile."""
+    loader = DBTFalkorDBLoader(host, port, graph_name, username, password, batch_size=batch_size, workers=workers)
+    try:
+        loader.refresh_catalog_from_files(manifest_path, catalog_path)
+        return loader.profile
+    finally:
+        loader.close()
+
+
+def load_to_kuzu(db_path: str = DEFAULT_KUZU_DB_PATH, manifest_path: str = None, catalog_path: str = None,
+                 staging_dir: str = None, dbt_labels_only: bool = False,
+                 column_lineage: bool = False) -> LoadProfile:
+    """Convenience function to bulk-load DBT data into an embedded Kuzu database; returns the load's profile."""
+    loader = DBTKuzuLoader(db_path, staging_dir=staging_dir, dbt_labels_only=dbt_labels_only,
+                           column_lineage=column_lineage)
+    try:
+        loader.load_dbt_to_kuzu(manifest_path, catalog_path)
+        loader.get_graph_stats()
+        return loader.profile
+    finally:
+        loader.close()
+
+
+def export_bulk(manifest_path: str, output_dir: str, catalog_path: str = None, target: str = 'neo4j',
+                graph_name: str = None, column_lineage: bool = False) -> str:
+    """Write bulk-import CSV files for neo4j-admin or falkordb-bulk-insert; returns the import command."""
+    exporter = BULK_EXPORTERS[target](output_dir, column_lineage)
+    catalog_data = read_json(catalog_path) if catalog_path else {}
+    node_files, edge_files = exporter.export(Manifest.from_file(manifest_path, column_lineage), catalog_data)
+    return exporter.import_command(graph_name or ('neo4j' if target == 'neo4j' else 'dbt_graph'),
+                                   node_files, edge_files)
 
 __all__ = [
     'DBTNeo4jLoader',
     'DBTFalkorDBLoader',
+    'DBTKuzuLoader',
+    'AsyncDBTNeo4jLoader',
+    'AsyncDBTFalkorDBLoader',
+    'Neo4jBulkExporter',
+    'FalkorDBBulkExporter',
+    'LoadProfile',
+    'ManifestFingerprint',
+    'Project',
+    'ProjectResult',
+    'find_projects',
+    'load_projects',
     'load_to_neo4j',
+    'incremental_update_neo4j',
+    'refresh_catalog_neo4j',
     'load_to_falkordb',
     'incremental_update_falkordb',
+    'refresh_catalog_falkordb',
+    'load_to_kuzu',
+    'export_bulk',
 ]
\ No newline at end of file
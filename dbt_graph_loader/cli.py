@@ -1,9 +1,17 @@
 """Simple command line interface for DBT Graph Loader."""
 
+import json
+import sys
+import time
+
 import click
-from . import load_to_neo4j, load_to_falkordb, incremental_update_falkordb
-from .loaders.neo4j_loader import DBTNeo4jLoader
+from . import (load_to_neo4j, load_to_falkordb, load_to_kuzu, incremental_update_neo4j, incremental_update_falkordb,
+               refresh_catalog_neo4j, refresh_catalog_falkordb, export_bulk, find_projects, load_projects)
+from .loaders.neo4j_loader import DBTNeo4jLoader, DEFAULT_BATCH_SIZE
 from .loaders.falkordb_loader import DBTFalkorDBLoader
+from .loaders.kuzu_loader import DEFAULT_KUZU_DB_PATH
+from .multi_project import DEFAULT_CONCURRENCY, format_summary
+from .synthetic import generate_project, mutate_project, scaled_counts, write_project
 
 # Get version from package metadata
 try:
@@ -25,18 +33,101 @@ def main():
     pass
 
 
+def profile_options(command):
+    """Add the --profile and --profile-output options to a load command"""
+    command = click.option('--profile-output', type=click.Path(dir_okay=False),
+                           help='Write per-phase timings as JSON, or Prometheus text for a .prom/.txt path')(command)
+    return click.option('--profile', 'show_profile', is_flag=True, default=False,
+                        help='Print the phases of the load ranked by wall time')(command)
+
+
+def pipeline_options(command):
+    """Add the --pipeline and --pipeline-process options to a load command"""
+    command = click.option('--pipeline-process', is_flag=True, default=False,
+                           help='Decode and project the manifest of a --pipeline load in a child process')(command)
+    return click.option('--pipeline', is_flag=True, default=False,
+                        help='Stream the manifest, writing batches from bounded queues while decoding goes on')(command)
+
+
+def resume_option(command):
+    """Add the --resume option to a load command"""
+    return click.option('--resume', is_flag=True, default=False,
+                        help='Journal progress and continue an interrupted load of the same files from its last '
+                             'checkpoint instead of starting over')(command)
+
+
+def report_profile(profile, show_profile: bool, profile_output: str):
+    if profile_output:
+        profile.write(profile_output)
+        click.echo(f"Profile written to {profile_output}")
+    if show_profile:
+        click.echo(profile.format_table())
+
+
+def check_catalog_only(catalog: str, incremental_run: bool):
+    if not catalog:
+        raise click.UsageError("--catalog is required when --catalog-only is set")
+    if incremental_run:
+        raise click.UsageError("--catalog-only and --incremental-run cannot be combined")
+
+
 @main.command()
 @click.option('--uri', required=True, help='Neo4j connection URI')
 @click.option('--username', required=True, help='Neo4j username')
 @click.option('--password', required=True, help='Neo4j password')
 @click.option('--manifest', required=True, help='Path to manifest.json')
 @click.option('--catalog', help='Path to catalog.json (optional)')
-def neo4j(uri: str, username: str, password: str, manifest: str, catalog: str):
+@click.option('--incremental-run', is_flag=True, default=False, help='Only update nodes that changed vs the old manifest')
+@click.option('--old-manifest', help='Path to the previous manifest.json (required when --incremental-run is set)')
+@click.option('--catalog-only', is_flag=True, default=False,
+              help='Only update catalog-derived properties (table metadata, column types, comments) of a loaded graph')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True, type=click.IntRange(min=1),
+              help='Rows sent per UNWIND query / write transaction')
+@click.option('--workers', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Number of concurrent writer threads')
+@click.option('--streaming', is_flag=True, default=False,
+              help='Parse the manifest incrementally to use less memory on large projects')
+@click.option('--dbt-labels-only', is_flag=True, default=False,
+              help='Clear only dbt nodes and their relationships before a full load, keeping other data')
+@click.option('--column-lineage', is_flag=True, default=False,
+              help='Parse compiled model SQL into Column nodes and DERIVED_FROM relationships (needs sqlglot)')
+@click.option('--parse-processes', type=click.IntRange(min=1),
+              help='Worker processes parsing SQL for --column-lineage (default: one per core)')
+@click.option('--force', is_flag=True, default=False,
+              help='Load even when the graph already holds the same manifest and catalog content')
+@resume_option
+@pipeline_options
+@profile_options
+def neo4j(uri: str, username: str, password: str, manifest: str, catalog: str, incremental_run: bool,
+          old_manifest: str, catalog_only: bool, batch_size: int, workers: int, streaming: bool, dbt_labels_only: bool,
+          column_lineage: bool, parse_processes: int, force: bool, resume: bool, pipeline: bool,
+          pipeline_process: bool, show_profile: bool, profile_output: str):
     """Load DBT data into Neo4j."""
     try:
-        click.echo("Loading into Neo4j...")
-        load_to_neo4j(uri, username, password, manifest, catalog)
-        click.echo("✅ Neo4j load completed!")
+        if catalog_only:
+            check_catalog_only(catalog, incremental_run)
+            click.echo("Refreshing Neo4j catalog properties...")
+            profile = refresh_catalog_neo4j(uri, username, password, manifest, catalog, batch_size=batch_size,
+                                            workers=workers)
+            click.echo("✅ Neo4j catalog refresh completed!")
+        elif incremental_run:
+            if not old_manifest:
+                raise click.UsageError("--old-manifest is required when --incremental-run is set")
+            click.echo("Running incremental Neo4j update...")
+            profile = incremental_update_neo4j(uri, username, password, old_manifest, manifest, catalog,
+                                               batch_size=batch_size, workers=workers, column_lineage=column_lineage,
+                                               parse_processes=parse_processes)
+            click.echo("✅ Neo4j incremental update completed!")
+        else:
+            click.echo("Loading into Neo4j...")
+            profile = load_to_neo4j(uri, username, password, manifest, catalog, batch_size=batch_size,
+                                    workers=workers, streaming=streaming, dbt_labels_only=dbt_labels_only,
+                                    column_lineage=column_lineage, parse_processes=parse_processes, force=force,
+                                    pipeline=pipeline, pipeline_process=pipeline_process, resume=resume)
+            click.echo("✅ Neo4j graph unchanged, load skipped" if profile.skipped else "✅ Neo4j load completed!")
+        report_profile(profile, show_profile, profile_output)
+    except click.UsageError:
+        raise
     except Exception as e:
         click.echo(f"❌ Error: {e}")
 
@@ -51,25 +142,202 @@ def neo4j(uri: str, username: str, password: str, manifest: str, catalog: str):
 @click.option('--catalog', help='Path to catalog.json (optional)')
 @click.option('--incremental-run', is_flag=True, default=False, help='Only update nodes that changed vs the old manifest')
 @click.option('--old-manifest', help='Path to the previous manifest.json (required when --incremental-run is set)')
+@click.option('--catalog-only', is_flag=True, default=False,
+              help='Only update catalog-derived properties (table metadata, column types, comments) of a loaded graph')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True, type=click.IntRange(min=1),
+              help='Rows sent per parameterized UNWIND query')
+@click.option('--workers', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Number of concurrent writer threads')
+@click.option('--streaming', is_flag=True, default=False,
+              help='Parse the manifest incrementally to use less memory on large projects')
+@click.option('--blue-green', is_flag=True, default=False,
+              help='Load into a staging graph and swap it in when complete, keeping the graph readable')
+@click.option('--dbt-labels-only', is_flag=True, default=False,
+              help='Clear only dbt nodes and their relationships before a full load, keeping other data')
+@click.option('--column-lineage', is_flag=True, default=False,
+              help='Parse compiled model SQL into Column nodes and DERIVED_FROM relationships (needs sqlglot)')
+@click.option('--parse-processes', type=click.IntRange(min=1),
+              help='Worker processes parsing SQL for --column-lineage (default: one per core)')
+@click.option('--force', is_flag=True, default=False,
+              help='Load even when the graph already holds the same manifest and catalog content')
+@resume_option
+@pipeline_options
+@profile_options
 def falkordb(host: str, port: int, graph_name: str, username: str, password: str,
-             manifest: str, catalog: str, incremental_run: bool, old_manifest: str):
+             manifest: str, catalog: str, incremental_run: bool, old_manifest: str, catalog_only: bool, batch_size: int,
+             workers: int, streaming: bool, blue_green: bool, dbt_labels_only: bool, column_lineage: bool,
+             parse_processes: int, force: bool, resume: bool, pipeline: bool, pipeline_process: bool,
+             show_profile: bool, profile_output: str):
     """Load DBT data into FalkorDB."""
     try:
-        if incremental_run:
+        if catalog_only:
+            check_catalog_only(catalog, incremental_run)
+            click.echo("Refreshing FalkorDB catalog properties...")
+            profile = refresh_catalog_falkordb(host, port, graph_name, username, password, manifest, catalog,
+                                               batch_size=batch_size, workers=workers)
+            click.echo("✅ FalkorDB catalog refresh completed!")
+        elif incremental_run:
             if not old_manifest:
                 raise click.UsageError("--old-manifest is required when --incremental-run is set")
             click.echo("Running incremental FalkorDB update...")
-            incremental_update_falkordb(host, port, graph_name, username, password, old_manifest, manifest, catalog)
+            profile = incremental_update_falkordb(host, port, graph_name, username, password, old_manifest,
+                                                  manifest, catalog, batch_size=batch_size, workers=workers,
+                                                  column_lineage=column_lineage, parse_processes=parse_processes)
             click.echo("✅ FalkorDB incremental update completed!")
         else:
             click.echo("Loading into FalkorDB...")
-            load_to_falkordb(host, port, graph_name, username, password, manifest, catalog)
-            click.echo("✅ FalkorDB load completed!")
+            profile = load_to_falkordb(host, port, graph_name, username, password, manifest, catalog,
+                                       batch_size=batch_size, workers=workers, streaming=streaming,
+                                       blue_green=blue_green, dbt_labels_only=dbt_labels_only,
+                                       column_lineage=column_lineage, parse_processes=parse_processes,
+                                       force=force, pipeline=pipeline, pipeline_process=pipeline_process,
+                                       resume=resume)
+            click.echo("✅ FalkorDB graph unchanged, load skipped" if profile.skipped
+                       else "✅ FalkorDB load completed!")
+        report_profile(profile, show_profile, profile_output)
     except click.UsageError:
         raise
     except Exception as e:
         click.echo(f"❌ Error: {e}")
 
 
+@main.command()
+@click.option('--db-path', default=DEFAULT_KUZU_DB_PATH, show_default=True, help='Kuzu database path')
+@click.option('--manifest', required=True, help='Path to manifest.json')
+@click.option('--catalog', help='Path to catalog.json (optional)')
+@click.option('--staging-dir', help='Keep the CSV files bulk-loaded with COPY in this directory (default: temporary)')
+@click.option('--dbt-labels-only', is_flag=True, default=False,
+              help='Drop only the dbt tables before loading, keeping other tables')
+@click.option('--column-lineage', is_flag=True, default=False,
+              help='Parse compiled model SQL into Column nodes and DERIVED_FROM relationships (needs sqlglot)')
+@profile_options
+def kuzu(db_path: str, manifest: str, catalog: str, staging_dir: str, dbt_labels_only: bool, column_lineage: bool,
+         show_profile: bool, profile_output: str):
+    """Load DBT data into an embedded Kuzu database (no server needed)."""
+    try:
+        click.echo(f"Loading into Kuzu at {db_path}...")
+        profile = load_to_kuzu(db_path, manifest, catalog, staging_dir=staging_dir, dbt_labels_only=dbt_labels_only,
+                               column_lineage=column_lineage)
+        click.echo("✅ Kuzu load completed!")
+        report_profile(profile, show_profile, profile_output)
+    except Exception as e:
+        click.echo(f"❌ Error: {e}")
+
+
+@main.command('load-projects')
+@click.argument('project_dirs', nargs=-1, required=True)
+@click.option('--backend', type=click.Choice(['falkordb', 'neo4j']), default='falkordb', show_default=True,
+              help='Database loaded into: one graph (FalkorDB) or database (Neo4j) per project')
+@click.option('--host', default='localhost', help='FalkorDB host')
+@click.option('--port', default=6379, help='FalkorDB port')
+@click.option('--uri', help='Neo4j connection URI (required with --backend neo4j)')
+@click.option('--username', help='Database username')
+@click.option('--password', help='Database password')
+@click.option('--graph-prefix', default='', help='Prefix of every graph name')
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, show_default=True, type=click.IntRange(min=1),
+              help='Projects loaded at the same time')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True, type=click.IntRange(min=1),
+              help='Rows sent per parameterized UNWIND query')
+@click.option('--workers', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Number of concurrent writer threads per project')
+@click.option('--streaming', is_flag=True, default=False,
+              help='Parse the manifests incrementally to use less memory on large projects')
+@click.option('--blue-green', is_flag=True, default=False,
+              help='Load each project into a staging graph and swap it in when complete (FalkorDB only)')
+@click.option('--column-lineage', is_flag=True, default=False,
+              help='Parse compiled model SQL into Column nodes and DERIVED_FROM relationships (needs sqlglot)')
+@click.option('--parse-processes', type=click.IntRange(min=1),
+              help='Worker processes parsing SQL of each project for --column-lineage (default: one per core)')
+@click.option('--force', is_flag=True, default=False,
+              help='Load even when a graph already holds the same manifest and catalog content')
+@click.option('--summary-output', type=click.Path(dir_okay=False),
+              help='Write the result and profile of every project as JSON')
+@resume_option
+@pipeline_options
+def load_projects_command(project_dirs: tuple, backend: str, graph_prefix: str, concurrency: int,
+                          summary_output: str, **options):
+    """Load several dbt projects in parallel, each into its own graph.
+
+    PROJECT_DIRS are artifact directories holding manifest.json and optionally
+    catalog.json, given as DIR or NAME=DIR. A graph is named after the
+    project_name in its manifest, or NAME.
+    """
+    if backend == 'neo4j' and not options['uri']:
+        raise click.UsageError("--uri is required with --backend neo4j")
+    if backend == 'neo4j' and options['blue_green']:
+        raise click.UsageError("--blue-green is only supported with --backend falkordb")
+    try:
+        projects = find_projects(project_dirs, backend, graph_prefix)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    click.echo(f"Loading {len(projects)} projects into {backend}, {concurrency} at a time...")
+    start = time.perf_counter()
+    results = load_projects(projects, backend, concurrency, **options)
+    click.echo(format_summary(results, time.perf_counter() - start))
+    if summary_output:
+        with open(summary_output, 'w', encoding='utf-8') as f:
+            json.dump([result.to_dict() for result in results], f, indent=2)
+        click.echo(f"Summary written to {summary_output}")
+
+    failed = sum(result.error is not None for result in results)
+    if failed:
+        click.echo(f"❌ {failed} of {len(results)} projects failed")
+        sys.exit(1)
+    click.echo("✅ All projects loaded!")
+
+
+@main.command('export-bulk')
+@click.option('--manifest', required=True, help='Path to manifest.json')
+@click.option('--catalog', help='Path to catalog.json (optional)')
+@click.option('--output-dir', required=True, help='Directory the CSV files are written to')
+@click.option('--format', 'target', type=click.Choice(['neo4j', 'falkordb']), default='neo4j', show_default=True,
+              help='Importer the files are written for (neo4j-admin or falkordb-bulk-insert)')
+@click.option('--graph-name', help='Database (neo4j) or graph (falkordb) name used in the printed import command')
+@click.option('--column-lineage', is_flag=True, default=False,
+              help='Parse compiled model SQL into Column nodes and DERIVED_FROM relationships (needs sqlglot)')
+def export_bulk_command(manifest: str, catalog: str, output_dir: str, target: str, graph_name: str,
+                        column_lineage: bool):
+    """Write node and relationship CSV files for an offline bulk import."""
+    try:
+        click.echo(f"Exporting bulk-import files for {target}...")
+        command = export_bulk(manifest, output_dir, catalog, target=target, graph_name=graph_name,
+                              column_lineage=column_lineage)
+        click.echo("✅ Export completed! Import with:")
+        click.echo(command)
+    except Exception as e:
+        click.echo(f"❌ Error: {e}")
+
+
+@main.command('generate-manifest')
+@click.option('--output-dir', required=True, help='Directory manifest.json and catalog.json are written to')
+@click.option('--nodes', default=1000, show_default=True, type=click.IntRange(min=1),
+              help='Total dbt resources, split between models, tests, sources and macros')
+@click.option('--models', type=click.IntRange(min=1), help='Number of models (overrides the --nodes split)')
+@click.option('--sources', type=click.IntRange(min=1), help='Number of sources (overrides the --nodes split)')
+@click.option('--tests', type=click.IntRange(min=0), help='Number of tests (overrides the --nodes split)')
+@click.option('--macros', type=click.IntRange(min=0), help='Number of project macros (overrides the --nodes split)')
+@click.option('--columns', default=8, show_default=True, type=click.IntRange(min=1), help='Columns per relation')
+@click.option('--depth', default=10, show_default=True, type=click.IntRange(min=1), help='Layers of models in the DAG')
+@click.option('--fan-in', default=3, show_default=True, type=click.IntRange(min=1), help='Most parents of a model')
+@click.option('--seed', default=0, show_default=True, help='Random seed; the same options give the same files')
+@click.option('--next-version', is_flag=True, default=False,
+              help='Also write manifest_next.json/catalog_next.json with changed, added and removed models')
+def generate_manifest(output_dir: str, nodes: int, models: int, sources: int, tests: int, macros: int, columns: int,
+                      depth: int, fan_in: int, seed: int, next_version: bool):
+    """Generate a synthetic dbt project for load testing."""
+    counts = scaled_counts(nodes)
+    for key, value in (('models', models), ('sources', sources), ('tests', tests), ('macros', macros)):
+        if value is not None:
+            counts[key] = value
+    manifest, catalog = generate_project(**counts, columns=columns, depth=depth, fan_in=fan_in, seed=seed)
+    manifest_path, catalog_path = write_project(output_dir, manifest, catalog)
+    click.echo(f"✅ Wrote {manifest_path} and {catalog_path} ({', '.join(f'{v} {k}' for k, v in counts.items())})")
+    if next_version:
+        manifest_path, catalog_path = write_project(output_dir, *mutate_project(manifest, catalog, seed=seed + 1),
+                                                    suffix='_next')
+        click.echo(f"✅ Wrote {manifest_path} and {catalog_path}")
+
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""Content hash of a manifest and catalog, to skip reloading unchanged projects.
+
+dbt rewrites manifest.json on every invocation, so its bytes change even when
+the project did not: ``generated_at``, ``invocation_id`` and ``user_id`` in the
+metadata block at the top of the file and every node's ``created_at`` epoch
+timestamp are new on each run. The hash is taken over the files with those
+values removed, plus the load options that change what a load writes, so equal
+hashes mean a load would write the same graph. The volatile metadata fields are
+only removed from the metadata block. ``created_at`` is removed wherever its
+value is an epoch float, since a streamed file cannot tell a node's own keys
+from those nested in it; a ``created_at`` date or any other value in a node's
+meta, or a column named ``created_at``, is hashed like any other content. Files
+are hashed in chunks, so memory stays bounded for any manifest size.
+"""
+
+import hashlib
+import os
+import re
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Dict, Any, Iterable, Iterator, Optional, Union
+
+CHUNK_SIZE = 1 << 24
+# dbt writes the metadata block first; these bytes always contain it
+_HEAD_SIZE = 1 << 16
+# The leading {"metadata": {...} of a manifest or catalog; its values hold at most one level of nesting (env)
+_HEADER = re.compile(rb'\A\s*\{\s*"metadata"\s*:\s*\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}')
+# Metadata fields whose value changes on every dbt invocation
+_HEADER_VOLATILE = re.compile(
+    rb'"(?:generated_at|invocation_id|invocation_started_at|user_id)"\s*:\s*(?:"[^"\\]*"|null)'
+)
+# The time.time() float dbt stamps on every node as it parses it, or any other epoch float under that name
+_CREATED_AT = re.compile(rb'"created_at"\s*:\s*[0-9]{9,11}\.[0-9]{1,20}(?=\s*[,}])')
+# Longer than any match of _CREATED_AT, so a match never spans two chunks
+_OVERLAP = 256
+
+
+def _normalized(chunks: Iterable[bytes]) -> Iterator[memoryview]:
+    """The concatenated chunks with the volatile fields removed, as slices that are not copied"""
+    chunks = iter(chunks)
+    # The header is matched in one piece, however small the chunks are
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= _HEAD_SIZE:
+            break
+    tail = b''
+    first = True
+    for chunk in chain((head,), chunks):
+        data = tail + chunk if tail else chunk
+        view = memoryview(data)
+        position = 0
+        if first:
+            first = False
+            header = _HEADER.match(data, 0, _HEAD_SIZE)
+            if header is not None:
+                yield memoryview(_HEADER_VOLATILE.sub(b'', header.group()))
+                position = header.end()
+        # Matches starting in the last _OVERLAP bytes may be cut short; they are handled with the next chunk
+        cut = max(0, len(data) - _OVERLAP)
+        for match in _CREATED_AT.finditer(data, position):
+            if match.start() >= cut:
+                break
+            yield view[position:match.start()]
+            position = match.end()
+        cut = max(cut, position)
+        yield view[position:cut]
+        tail = data[cut:]
+    yield memoryview(_CREATED_AT.sub(b'', tail))
+
+
+def _file_chunks(path: str) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _as_bytes(content: Union[str, bytes]) -> bytes:
+    return content.encode('utf-8') if isinstance(content, str) else content
+
+
+def _metadata_value(head: bytes, field: str) -> Optional[str]:
+    match = re.search(rb'"' + field.encode() + rb'"\s*:\s*"([^"\\]*)"', head)
+    return match.group(1).decode('utf-8') if match else None
+
+
+class ManifestFingerprint:
+    """Content hash of a manifest and catalog, with the manifest's identifying metadata"""
+
+    __slots__ = ('manifest_hash', 'project_name', 'dbt_version', 'generated_at')
+
+    def __init__(self, manifest_hash: str, project_name: Optional[str] = None, dbt_version: Optional[str] = None,
+                 generated_at: Optional[str] = None):
+        self.manifest_hash = manifest_hash
+        self.project_name = project_name
+        self.dbt_version = dbt_version
+        self.generated_at = generated_at
+
+    @classmethod
+    def _build(cls, head: bytes, manifest_chunks: Iterable[bytes], catalog_chunks: Iterable[bytes],
+               options: Dict[str, Any]) -> 'ManifestFingerprint':
+        digest = hashlib.sha256()
+        for key in sorted(options):
+            digest.update(f"{key}={options[key]!r};".encode('utf-8'))
+        for name, chunks in (('manifest', manifest_chunks), ('catalog', catalog_chunks)):
+            digest.update(f"\0{name}\0".encode('utf-8'))
+            for piece in _normalized(chunks):
+                digest.update(piece)
+        return cls(digest.hexdigest(), _metadata_value(head, 'project_name'), _metadata_value(head, 'dbt_version'),
+                   _metadata_value(head, 'generated_at'))
+
+    @classmethod
+    def from_files(cls, manifest_path: str, catalog_path: Optional[str] = None,
+                   **options) -> 'ManifestFingerprint':
+        """Fingerprint of manifest.json and an optional catalog.json; options are the load options hashed along"""
+        with open(manifest_path, 'rb') as f:
+            head = f.read(_HEAD_SIZE)
+        catalog_chunks = _file_chunks(catalog_path) if catalog_path and os.path.exists(catalog_path) else ()
+        return cls._build(head, _file_chunks(manifest_path), catalog_chunks, options)
+
+    @classmethod
+    def from_content(cls, manifest: Union[str, bytes], catalog: Optional[Union[str, bytes]] = None,
+                     **options) -> 'ManifestFingerprint':
+        """Fingerprint of manifest and catalog JSON documents"""
+        manifest = _as_bytes(manifest)
+        return cls._build(manifest[:_HEAD_SIZE], (manifest,), (_as_bytes(catalog),) if catalog else (), options)
+
+    def properties(self) -> Dict[str, Any]:
+        """Properties of the LoadMetadata node recording a load of this content"""
+        return {
+            'manifest_hash': self.manifest_hash,
+            'project_name': self.project_name,
+            'dbt_version': self.dbt_version,
+            'generated_at': self.generated_at,
+            'loaded_at': datetime.now(timezone.utc).isoformat(),
+        }
+
+    def __repr__(self):
+        return f"ManifestFingerprint({self.manifest_hash!r})"
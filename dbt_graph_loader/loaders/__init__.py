@@ -2,8 +2,17 @@
 
 from .neo4j_loader import DBTNeo4jLoader
 from .falkordb_loader import DBTFalkorDBLoader
+from .async_neo4j_loader import AsyncDBTNeo4jLoader
+from .async_falkordb_loader import AsyncDBTFalkorDBLoader
+from .bulk_export import Neo4jBulkExporter, FalkorDBBulkExporter
+from .kuzu_loader import DBTKuzuLoader
 
 __all__ = [
     'DBTNeo4jLoader',
     'DBTFalkorDBLoader',
+    'DBTKuzuLoader',
+    'AsyncDBTNeo4jLoader',
+    'AsyncDBTFalkorDBLoader',
+    'Neo4jBulkExporter',
+    'FalkorDBBulkExporter',
 ]
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""asyncio counterpart of the backend-independent loader."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from ..fingerprint import ManifestFingerprint
+from ..manifest import Manifest, loads
+from .base import LoaderCore, DEFAULT_BATCH_SIZE, EdgeGroups, _edge_source
+from .common import (
+    group_edges, edge_query, edge_delete_query, clear_queries, property_update_query,
+    DBT_LABELS, RELATION_LABELS, LOAD_METADATA_QUERY, LOAD_METADATA_WRITE, LOAD_METADATA_DELETE,
+)
+from .catalog_refresh import CatalogRefresh, CatalogState, COLUMN_STATE_QUERY, STALE_COLUMN_DELETE, relation_state_query
+from .profiling import LoadProfile
+
+logger = logging.getLogger(__name__)
+
+# Number of batches awaiting the database at the same time
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+class AsyncBaseDBTLoader(LoaderCore):
+    """Load orchestration for asyncio drivers.
+
+    Projections, relationship derivation and load planning are shared with
+    BaseDBTLoader through LoaderCore; the CPU-bound part of a load (parsing,
+    projection, edge grouping) runs in a thread so the event loop stays
+    responsive, and at most max_in_flight batches are awaiting the database at
+    any time. Subclasses implement
+    create_constraints, _write_batch_async and _delete_batch_async as coroutines.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 dbt_labels_only: bool = False, column_lineage: bool = False, parse_processes: Optional[int] = None,
+                 force: bool = False):
+        super().__init__(batch_size, dbt_labels_only=dbt_labels_only, column_lineage=column_lineage,
+                         parse_processes=parse_processes, force=force)
+        self.max_in_flight = max(1, max_in_flight)
+        # Created on first use so it belongs to the running event loop
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        # Called as on_progress(phase, rows written, rows to write) whenever a
+        # batch of the 'nodes' or 'edges' phase of a load has been written
+        self.on_progress: Optional[Callable[[str, int, int], None]] = None
+        # phase -> [rows written, rows to write]
+        self.progress: Dict[str, List[int]] = {}
+
+    async def clear_database(self, dbt_labels_only: bool = None):
+        """Clear all nodes and relationships, or only the dbt ones, in bounded transactions"""
+        if dbt_labels_only is None:
+            dbt_labels_only = self.dbt_labels_only
+        start = time.perf_counter()
+        if dbt_labels_only:
+            await self._clear_in_batches_async(DBT_LABELS)
+        else:
+            await self._clear_all_async()
+        logger.info(f"Database cleared in {time.perf_counter() - start:.1f}s")
+        self._fresh_load = True
+
+    async def _clear_all_async(self):
+        """Remove everything; backends with a server-side drop override this"""
+        await self._clear_in_batches_async(None)
+
+    async def _clear_in_batches_async(self, labels: Optional[List[str]]):
+        for description, query in clear_queries(labels, self.clear_batch_size):
+            total = 0
+            while True:
+                deleted = await self._delete_batch_async(query)
+                self.profile.record(rows=deleted, queries=1)
+                total += deleted
+                if deleted:
+                    logger.info(f"Deleted {total} {description}")
+                if deleted < self.clear_batch_size:
+                    break
+
+    async def _delete_batch_async(self, query: str) -> int:
+        """Run one bounded delete query in its own transaction; returns the number deleted"""
+        raise NotImplementedError
+
+    async def _read_rows_async(self, query: str) -> List[List[Any]]:
+        """Run a read-only query; returns its rows as lists of column values"""
+        raise NotImplementedError
+
+    async def get_load_metadata(self) -> Optional[Dict[str, Any]]:
+        """Properties of the LoadMetadata node of the graph, or None when there is none"""
+        rows = await self._read_rows_async(LOAD_METADATA_QUERY)
+        return rows[0][0] if rows else None
+
+    async def fingerprint_content_async(self, manifest, catalog=None) -> ManifestFingerprint:
+        """fingerprint_content off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.fingerprint_content, manifest, catalog)
+
+    async def is_unchanged(self, fingerprint: ManifestFingerprint) -> bool:
+        """Whether the graph already holds a load of this content, so loading it again can be skipped"""
+        with self.profile.phase('check'):
+            return self._unchanged(await self.get_load_metadata(), fingerprint)
+
+    async def record_load(self, fingerprint: ManifestFingerprint):
+        """Store the content hash of a completed load, so an identical next load is skipped"""
+        rows = self._metadata_rows(fingerprint)
+        if rows:
+            with self.profile.phase('metadata'):
+                await self._send(LOAD_METADATA_WRITE, rows, "load metadata")
+
+    async def clear_load_metadata(self):
+        """Forget the content hash, e.g. before the graph is changed by a catalog refresh"""
+        with self.profile.phase('metadata'):
+            await self._send(LOAD_METADATA_DELETE, [{}], "load metadata deletion")
+
+    async def create_constraints(self):
+        raise NotImplementedError
+
+    async def _write_batch_async(self, query: str, batch: List[Any], description: str) -> int:
+        """Write one batch; returns the number of rows written"""
+        raise NotImplementedError
+
+    def _advance(self, phase: str, written: int):
+        counts = self.progress.setdefault(phase, [0, 0])
+        counts[0] += written
+        if self.on_progress is not None:
+            self.on_progress(phase, counts[0], counts[1])
+
+    async def _send(self, query: str, batch: List[Any], description: str, phase: Optional[str] = None) -> int:
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        async with self._in_flight:
+            written = await self._write_batch_async(query, batch, description)
+        self.profile.record(rows=written, queries=1)
+        if phase is not None:
+            self._advance(phase, written)
+        return written
+
+    async def _send_sequentially(self, query: str, rows: List[Any], description: str,
+                                 phase: Optional[str] = None) -> int:
+        written = 0
+        for start in range(0, len(rows), self.batch_size):
+            written += await self._send(query, rows[start:start + self.batch_size], description, phase)
+        return written
+
+    async def _write_batches_async(self, query: str, rows: List[Any], description: str = '',
+                                   partition_key: Callable[[Any], str] = None, phase: Optional[str] = None) -> int:
+        """Send rows through an UNWIND query with up to max_in_flight batches pending.
+
+        With a partition_key, rows are split into one bucket per in-flight slot by
+        hash of that key and each bucket is sent one batch after another, so
+        concurrent transactions never lock the same key.
+        """
+        if self.max_in_flight <= 1 or len(rows) <= self.batch_size:
+            return await self._send_sequentially(query, rows, description, phase)
+
+        if partition_key is None:
+            chunks = [rows[start:start + self.batch_size] for start in range(0, len(rows), self.batch_size)]
+            return sum(await asyncio.gather(*(self._send(query, chunk, description, phase) for chunk in chunks)))
+
+        buckets = [[] for _ in range(self.max_in_flight)]
+        for row in rows:
+            buckets[hash(partition_key(row)) % self.max_in_flight].append(row)
+        return sum(await asyncio.gather(*(self._send_sequentially(query, bucket, description, phase)
+                                          for bucket in buckets)))
+
+    async def _write_nodes_async(self, label: str, rows: List[Dict[str, Any]], merge: bool = None) -> int:
+        """Write node property maps for one label"""
+        return await self._write_batches_async(self._node_query(label, merge), rows, f"{label} node", phase='nodes')
+
+    async def _write_edge_groups_async(self, groups: EdgeGroups, verb: Optional[str] = None) -> int:
+        """Write edge groups one after another; batches within a group are pipelined.
+
+        Groups share endpoint nodes, so writing them concurrently would only make
+        their transactions contend for the same node locks.
+        """
+        written = 0
+        for (src_label, dst_label, rel_type), rows in groups.items():
+            written += await self._write_batches_async(
+                edge_query(src_label, dst_label, rel_type, self._edge_verb(verb)), rows,
+                f"{src_label}-[:{rel_type}]->{dst_label}", partition_key=_edge_source, phase='edges',
+            )
+        return written
+
+    async def load_parsed_manifest(self, manifest: Manifest, catalog_data: Optional[Dict[str, Any]] = None
+                                   ) -> LoadProfile:
+        """Replace the graph with an already parsed manifest (see ``dbt_graph_loader.manifest``).
+
+        The plan is computed while the graph is cleared, so the 'plan' phase
+        only counts the time spent waiting for it afterwards.
+        """
+        with self._profiled('load') as profile:
+            loop = asyncio.get_running_loop()
+            plan = loop.run_in_executor(None, self._plan_load, manifest, catalog_data or {})
+            with profile.phase('clear'):
+                await self.clear_database()
+            with profile.phase('constraints'):
+                await self.create_constraints()
+            with profile.phase('plan'):
+                node_rows, edge_groups, source_groups = await plan
+            self.progress = {
+                'nodes': [0, sum(map(len, node_rows.values()))],
+                'edges': [0, sum(len(rows) for groups in (edge_groups, source_groups) for rows in groups.values())],
+            }
+            for phase in self.progress:
+                self._advance(phase, 0)
+
+            try:
+                # Labels are disjoint, so their nodes are written concurrently
+                labels = list(node_rows)
+                with profile.phase('nodes'):
+                    counts = await asyncio.gather(*(self._write_nodes_async(label, node_rows[label])
+                                                    for label in labels))
+                for label, count in zip(labels, counts):
+                    logger.info(f"Created {count} {label} nodes")
+
+                with profile.phase('relationships'):
+                    edge_count = await self._write_edge_groups_async(edge_groups)
+                    logger.info(f"Created {edge_count} relationships")
+                    source_count = await self._write_edge_groups_async(source_groups, verb='MERGE')
+                    logger.info(f"Created {source_count} DEPENDS_ON relationships to sources")
+            finally:
+                # Later writes must not assume an empty graph
+                self._fresh_load = False
+            logger.info(self.resolver.summary())
+        return profile
+
+    async def parse_strings(self, manifest_str: str, catalog_str: Optional[str] = None
+                            ) -> Tuple[Manifest, Dict[str, Any]]:
+        """Parse manifest and optional catalog JSON off the event loop"""
+        loop = asyncio.get_running_loop()
+        with self.profile.phase('parse'):
+            manifest = await loop.run_in_executor(None, Manifest.from_json, manifest_str, self.column_lineage)
+            catalog_data = await loop.run_in_executor(None, loads, catalog_str) if catalog_str else {}
+        return manifest, catalog_data
+
+    async def read_catalog_state(self) -> CatalogState:
+        """Table metadata of the relations and the Column nodes currently in the graph"""
+        relation_rows = {label: await self._read_rows_async(relation_state_query(label)) for label in RELATION_LABELS}
+        return CatalogState.from_rows(relation_rows, await self._read_rows_async(COLUMN_STATE_QUERY))
+
+    async def refresh_catalog(self, manifest: Manifest, catalog_data: Dict[str, Any]) -> CatalogRefresh:
+        """Apply a new catalog to a graph already loaded from manifest, touching nothing else (see BaseDBTLoader)"""
+        with self._profiled('catalog refresh') as profile:
+            logger.info(f"Starting async {self.backend_name} catalog refresh")
+            with profile.phase('read'):
+                state = await self.read_catalog_state()
+            with profile.phase('diff'):
+                loop = asyncio.get_running_loop()
+                refresh = await loop.run_in_executor(None, self._plan_catalog_refresh, state, manifest, catalog_data)
+                self.node_labels = refresh.labels
+            logger.info(refresh.summary())
+            if not refresh:
+                logger.info("Nothing to update")
+                return refresh
+
+            # The graph no longer matches the manifest and catalog of the last full load
+            await self.clear_load_metadata()
+            delta = refresh.delta
+            with profile.phase('deletes'):
+                if delta.removed_nodes:
+                    await self._write_batches_async(STALE_COLUMN_DELETE, sorted(delta.removed_nodes),
+                                                    "stale catalog column deletion")
+                if delta.removed_edges:
+                    groups, _ = group_edges(delta.removed_edges, self.node_labels)
+                    for (src_label, dst_label, rel_type), rows in groups.items():
+                        await self._write_batches_async(edge_delete_query(src_label, dst_label, rel_type), rows,
+                                                        f"{src_label}-[:{rel_type}]->{dst_label} deletion",
+                                                        partition_key=_edge_source)
+            with profile.phase('nodes'):
+                for label, rows in delta.added_nodes.items():
+                    created = await self._write_nodes_async(label, rows, merge=True)
+                    logger.info(f"Upserted {created} {label} nodes")
+                for label, rows in delta.updated_nodes.items():
+                    updated = await self._write_batches_async(property_update_query(label), rows,
+                                                              f"{label} property update")
+                    logger.info(f"Updated {updated} {label} nodes")
+            if delta.added_edges:
+                with profile.phase('relationships'):
+                    groups, _ = group_edges(delta.added_edges, self.node_labels)
+                    count = await self._write_edge_groups_async(groups, verb='MERGE')
+                logger.info(f"Merged {count} relationships")
+
+            logger.info("Catalog refresh completed")
+            return refresh
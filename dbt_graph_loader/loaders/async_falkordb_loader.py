@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+from falkordb.asyncio import FalkorDB
+
+from ..manifest import Manifest
+from .async_base import AsyncBaseDBTLoader, DEFAULT_MAX_IN_FLIGHT
+from .base import DEFAULT_BATCH_SIZE
+from .catalog_refresh import CatalogRefresh
+from .common import LOAD_METADATA_QUERY
+from .falkordb_loader import (
+    DBTFalkorDBLoader, FALKORDB_INDEXES, TRANSIENT_ERRORS, active_graph_key, staging_graph_name, _decode,
+)
+from .profiling import LoadProfile
+
+logger = logging.getLogger(__name__)
+
+
+async def resolve_graph_name_async(db: FalkorDB, graph_name: str) -> str:
+    """Graph that readers should query: the promoted blue/green slot, or graph_name itself"""
+    return _decode(await db.connection.get(active_graph_key(graph_name))) or graph_name
+
+
+class AsyncDBTFalkorDBLoader(AsyncBaseDBTLoader):
+    """Load DBT manifest and catalog data into FalkorDB with the asyncio client"""
+
+    backend_name = 'FalkorDB'
+
+    # Property values are converted exactly as by the synchronous loader
+    _param_value = DBTFalkorDBLoader._param_value
+    _clean_properties = DBTFalkorDBLoader._clean_properties
+    _prepare_row = DBTFalkorDBLoader._prepare_row
+    _tags = DBTFalkorDBLoader._tags
+
+    def __init__(self, host: str = 'falkordb', port: int = 6379, graph_name: str = 'dbt_graph',
+                 username: str = None, password: str = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, dbt_labels_only: bool = False,
+                 column_lineage: bool = False, parse_processes: Optional[int] = None, force: bool = False):
+        """Initialize the async FalkorDB connection"""
+        super().__init__(batch_size, max_in_flight, dbt_labels_only, column_lineage, parse_processes, force)
+        self.db = FalkorDB(host=host, port=port, username=username, password=password)
+        self.graph_name = graph_name
+        self.graph = self.db.select_graph(graph_name)
+        # Set between begin_blue_green() and promote()
+        self.staging: Optional[str] = None
+
+    async def close(self):
+        """Close FalkorDB connection"""
+        if self.db:
+            await self.db.aclose()
+
+    async def _clear_all_async(self):
+        """Clear the live graph in bounded transactions, or drop a blue/green staging slot (see DBTFalkorDBLoader)"""
+        if self.staging is None:
+            await super()._clear_all_async()
+            return
+        if self.graph.name not in await self.db.list_graphs():
+            logger.info(f"Graph {self.graph.name} does not exist yet")
+            return
+        await self.graph.delete()
+
+    async def _delete_batch_async(self, query: str) -> int:
+        result = await self.graph.query(query)
+        return result.result_set[0][0]
+
+    async def _read_graph_rows(self, graph_name: str, query: str) -> List[List[Any]]:
+        if graph_name not in await self.db.list_graphs():
+            return []
+        result = await self.db.select_graph(graph_name).ro_query(query)
+        return result.result_set
+
+    async def _read_rows_async(self, query: str) -> List[List[Any]]:
+        """Run a read-only query on the live graph, or on the staging slot after begin_blue_green()"""
+        return await self._read_graph_rows(self.staging or await resolve_graph_name_async(self.db, self.graph_name),
+                                           query)
+
+    async def get_load_metadata(self) -> Optional[Dict[str, Any]]:
+        """Properties of the LoadMetadata node of the live graph, also during a blue/green load"""
+        rows = await self._read_graph_rows(await resolve_graph_name_async(self.db, self.graph_name),
+                                           LOAD_METADATA_QUERY)
+        return rows[0][0] if rows else None
+
+    async def create_constraints(self):
+        """Create constraints and indexes for better performance"""
+        for constraint in FALKORDB_INDEXES:
+            try:
+                await self.graph.query(constraint)
+            except Exception as e:
+                logger.warning(f"Index creation failed (may already exist): {e}")
+
+        logger.info("Indexes created")
+
+    async def _write_batch_async(self, query: str, batch: List[Dict[str, Any]], description: str) -> int:
+        """Send one batch through a parameterized UNWIND query; returns the number of rows written.
+
+        A batch that fails on a lost connection or a timeout is sent again up to
+        max_retries times with exponential backoff. Any other error, or one that
+        outlasts the retries, fails the load instead of dropping the batch.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.graph.query(query, {'rows': batch})
+                return len(batch)
+            except TRANSIENT_ERRORS as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Giving up on {description} batch of {len(batch)} rows after {attempt} retries: {e}")
+                    self.profile.record(failed=1)
+                    raise
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"Retrying {description} batch of {len(batch)} rows in {delay:.1f}s: {e}")
+                self.profile.record(retries=1)
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error(f"Error writing {description} batch of {len(batch)} rows: {e}")
+                self.profile.record(failed=1)
+                raise
+
+    async def begin_blue_green(self) -> str:
+        """Point the loader at the staging slot and return its name.
+
+        The load's clear_database drops whatever the slot still holds, indexes
+        included; the live graph is left untouched until promote() is called.
+        """
+        live = await resolve_graph_name_async(self.db, self.graph_name)
+        self.staging = staging_graph_name(self.graph_name, live)
+        self.graph = self.db.select_graph(self.staging)
+        logger.info(f"Loading into staging graph {self.staging}")
+        return self.staging
+
+    async def promote(self, graph: str):
+        """Atomically switch readers of graph_name to another graph.
+
+        The previously live graph is kept, so queries still running against it
+        complete; it is only dropped when the next blue/green load reuses its slot.
+        """
+        previous = await resolve_graph_name_async(self.db, self.graph_name)
+        await self.db.connection.set(active_graph_key(self.graph_name), graph)
+        self.graph = self.db.select_graph(graph)
+        self.staging = None
+        logger.info(f"Promoted {graph} to live {self.graph_name} graph (previous: {previous})")
+
+    async def load_parsed_manifest(self, manifest: Manifest, catalog_data: Optional[Dict[str, Any]] = None
+                                   ) -> LoadProfile:
+        """Replace the live graph, or the staging slot after begin_blue_green(), with a parsed manifest"""
+        if self.staging is None:
+            self.graph = self.db.select_graph(await resolve_graph_name_async(self.db, self.graph_name))
+        return await super().load_parsed_manifest(manifest, catalog_data)
+
+    async def refresh_catalog(self, manifest: Manifest, catalog_data: Dict[str, Any]) -> CatalogRefresh:
+        """Apply a new catalog to the live graph, or to the staging slot after begin_blue_green()"""
+        if self.staging is None:
+            self.graph = self.db.select_graph(await resolve_graph_name_async(self.db, self.graph_name))
+        return await super().refresh_catalog(manifest, catalog_data)
+
+    async def load_dbt_to_falkordb_from_strings(self, manifest_str: str, catalog_str: Optional[str] = None
+                                                ) -> LoadProfile:
+        """Main method to load DBT data into FalkorDB from string content"""
+        with self._profiled('load') as profile:
+            logger.info("Starting async DBT to FalkorDB load process from strings")
+            fingerprint = await self.fingerprint_content_async(manifest_str, catalog_str)
+            if await self.is_unchanged(fingerprint):
+                return profile
+
+            manifest, catalog_data = await self.parse_strings(manifest_str, catalog_str)
+            await self.load_parsed_manifest(manifest, catalog_data)
+            await self.record_load(fingerprint)
+
+            logger.info("DBT to FalkorDB load process completed successfully")
+        return profile
@@ -0,0 +1,101 @@
+import logging
+from typing import Dict, Any, List, Optional
+from neo4j import AsyncGraphDatabase
+
+from .async_base import AsyncBaseDBTLoader, DEFAULT_MAX_IN_FLIGHT
+from .base import DEFAULT_BATCH_SIZE
+from .neo4j_loader import NEO4J_CONSTRAINTS
+from .profiling import LoadProfile
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDBTNeo4jLoader(AsyncBaseDBTLoader):
+    """Load DBT manifest and catalog data into Neo4j with the asyncio driver"""
+
+    backend_name = 'Neo4j'
+
+    def __init__(self, neo4j_uri: str, username: str, password: str,
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 dbt_labels_only: bool = False, column_lineage: bool = False, parse_processes: Optional[int] = None,
+                 force: bool = False):
+        """Initialize the async Neo4j driver"""
+        super().__init__(batch_size, max_in_flight, dbt_labels_only, column_lineage, parse_processes, force)
+        self.driver = AsyncGraphDatabase.driver(neo4j_uri, auth=(username, password))
+
+    async def close(self):
+        """Close Neo4j connection"""
+        if self.driver:
+            await self.driver.close()
+
+    @staticmethod
+    async def _run_delete(tx, query: str) -> int:
+        result = await tx.run(query)
+        record = await result.single()
+        return record['deleted']
+
+    async def _delete_batch_async(self, query: str) -> int:
+        """Run one bounded delete in its own transaction, keeping transaction memory small"""
+        async with self.driver.session() as session:
+            return await session.execute_write(self._run_delete, query)
+
+    @staticmethod
+    async def _run_read(tx, query: str) -> List[List[Any]]:
+        result = await tx.run(query)
+        return [list(record.values()) async for record in result]
+
+    async def _read_rows_async(self, query: str) -> List[List[Any]]:
+        """Run a read query in a managed read transaction"""
+        async with self.driver.session() as session:
+            return await session.execute_read(self._run_read, query)
+
+    async def create_constraints(self):
+        """Create constraints and indexes for better performance"""
+        async with self.driver.session() as session:
+            for constraint in NEO4J_CONSTRAINTS:
+                try:
+                    result = await session.run(constraint)
+                    await result.consume()
+                except Exception as e:
+                    logger.warning(f"Constraint creation failed (may already exist): {e}")
+
+        logger.info("Constraints created")
+
+    @staticmethod
+    async def _run_batch(tx, query: str, rows: List[Dict[str, Any]]):
+        """Run one UNWIND batch inside a managed transaction"""
+        result = await tx.run(query, rows=rows)
+        await result.consume()
+
+    async def _write_batch_async(self, query: str, batch: List[Dict[str, Any]], description: str = '') -> int:
+        """Write one UNWIND batch in its own managed write transaction"""
+        # The driver calls the transaction function again for every retry
+        attempts = 0
+
+        async def run(tx):
+            nonlocal attempts
+            attempts += 1
+            await self._run_batch(tx, query, batch)
+
+        # Concurrent batches each take their own session from the driver's pool
+        async with self.driver.session() as session:
+            await session.execute_write(run)
+        if attempts > 1:
+            self.profile.record(retries=attempts - 1)
+        return len(batch)
+
+    async def load_dbt_to_neo4j_from_strings(self, manifest_str: str, catalog_str: Optional[str] = None
+                                             ) -> LoadProfile:
+        """Main method to load DBT data into Neo4j from JSON strings"""
+        with self._profiled('load') as profile:
+            logger.info("Starting async DBT to Neo4j load process from strings")
+            fingerprint = await self.fingerprint_content_async(manifest_str, catalog_str)
+            if await self.is_unchanged(fingerprint):
+                return profile
+
+            manifest, catalog_data = await self.parse_strings(manifest_str, catalog_str)
+            await self.load_parsed_manifest(manifest, catalog_data)
+            await self.record_load(fingerprint)
+
+            logger.info("DBT to Neo4j load process completed successfully")
+        return profile
@@ -0,0 +1,1426 @@
+"""Backend-independent part of the DBT graph loaders."""
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Callable, Tuple, Union
+
+from ..fingerprint import ManifestFingerprint
+from ..manifest import Manifest, ManifestNode, read_json
+from ..streaming import iter_sections
+from .common import (
+    Edge, EdgeGroupKey, RefResolver, group_edges, edge_query, edge_delete_query,
+    dependency_edges, macro_edges, test_edges, has_column_edges, clear_queries, column_id, property_update_query,
+    DBT_LABELS, CLEAR_BATCH_SIZE, COLUMN_LABEL, RELATION_LABELS, LOAD_METADATA_QUERY, LOAD_METADATA_WRITE,
+    LOAD_METADATA_DELETE, LOAD_PROGRESS_QUERY, LOAD_PROGRESS_WRITE, LOAD_PROGRESS_DELETE,
+)
+from .catalog_refresh import (
+    CatalogRefresh, CatalogState, COLUMN_STATE_QUERY, RELATION_STATE_PROPERTIES, STALE_COLUMN_DELETE,
+    plan_refresh, relation_state_query,
+)
+from .column_lineage import ColumnLineage, extract_column_lineage
+from .delta import GraphDelta, ProjectedNodes, compute_delta, manifest_edges
+from .lineage import Lineage, lineage_depth_query
+from .pipeline import DEFAULT_QUEUE_SIZE, ProcessStage, WriterPool
+from .profiling import LoadProfile
+
+logger = logging.getLogger(__name__)
+
+# Number of rows sent per UNWIND query / write transaction
+DEFAULT_BATCH_SIZE = 1000
+
+# Times a batch is sent again after a lost connection or a timeout, waiting
+# DEFAULT_RETRY_BACKOFF seconds before the first retry and twice as long before each next one
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_BACKOFF = 0.5
+
+# Batches of a resumable load between two progress checkpoints
+DEFAULT_CHECKPOINT_INTERVAL = 10
+
+EdgeGroups = Dict[EdgeGroupKey, List[Dict[str, str]]]
+
+
+def _edge_source(row: Dict[str, str]) -> str:
+    return row['src']
+
+
+class _BatchBuffer:
+    """Accumulate rows per key until batch_size of them can be written together"""
+    
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self.rows = defaultdict(list)
+        self.counts = defaultdict(int)
+    
+    def add(self, key, row: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Add a row; returns the rows of key once batch_size are collected"""
+        rows = self.rows[key]
+        rows.append(row)
+        self.counts[key] += 1
+        if len(rows) >= self.batch_size:
+            self.rows[key] = []
+            return rows
+        return None
+    
+    def drain(self) -> Iterator[Tuple[Any, List[Dict[str, Any]]]]:
+        """Every key's rows that are still collected"""
+        rows, self.rows = self.rows, defaultdict(list)
+        for key, batch in rows.items():
+            if batch:
+                yield key, batch
+
+
+class LoaderCore:
+    """Projection, relationship derivation and load planning shared by the sync and async loaders.
+    
+    Nothing here talks to a database: BaseDBTLoader adds blocking writes and the
+    load orchestration around them, AsyncBaseDBTLoader their asyncio counterparts.
+    """
+    
+    backend_name = 'graph'
+    
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, dbt_labels_only: bool = False,
+                 column_lineage: bool = False, parse_processes: Optional[int] = None, force: bool = False):
+        self.batch_size = batch_size
+        # Clear only dbt nodes, leaving other data in a shared database alone
+        self.dbt_labels_only = dbt_labels_only
+        # Parse compiled model SQL into Column nodes and DERIVED_FROM relationships,
+        # in parse_processes worker processes (default: one per core)
+        self.column_lineage = column_lineage
+        self.parse_processes = parse_processes
+        self.clear_batch_size = CLEAR_BATCH_SIZE
+        # Load even when the graph already holds the same manifest content
+        self.force = force
+        self.max_retries = DEFAULT_MAX_RETRIES
+        self.retry_backoff = DEFAULT_RETRY_BACKOFF
+        # Set by clear_database so writes can use CREATE instead of MERGE
+        self._fresh_load = False
+        # unique_id -> label of every node in the manifest being loaded
+        self.node_labels: Dict[str, str] = {}
+        # ref()/source() resolver for the manifest being loaded
+        self.resolver: Optional[RefResolver] = None
+        # Phase timings and counters of the last load or incremental update
+        self.profile = LoadProfile(backend=self.backend_name)
+        self._profiling = False
+    
+    @contextmanager
+    def _profiled(self, operation: str):
+        """Start a new profile for operation, unless an enclosing call already did"""
+        if self._profiling:
+            yield self.profile
+            return
+        self.profile = LoadProfile(operation, self.backend_name)
+        self._profiling = True
+        try:
+            with self.profile.run():
+                yield self.profile
+        finally:
+            self._profiling = False
+    
+    # ------------------------------------------------------------------ #
+    # Skipping unchanged loads                                             #
+    # ------------------------------------------------------------------ #
+    
+    def _fingerprint_options(self) -> Dict[str, Any]:
+        """Load options that change what a load writes, hashed along with the content"""
+        return {'column_lineage': self.column_lineage}
+    
+    def fingerprint_files(self, manifest_path: str, catalog_path: Optional[str] = None) -> ManifestFingerprint:
+        with self.profile.phase('check'):
+            return ManifestFingerprint.from_files(manifest_path, catalog_path, **self._fingerprint_options())
+    
+    def fingerprint_content(self, manifest: Union[str, bytes],
+                            catalog: Optional[Union[str, bytes]] = None) -> ManifestFingerprint:
+        with self.profile.phase('check'):
+            return ManifestFingerprint.from_content(manifest, catalog, **self._fingerprint_options())
+    
+    def _unchanged(self, metadata: Optional[Dict[str, Any]], fingerprint: ManifestFingerprint) -> bool:
+        if self.force or not metadata or metadata.get('manifest_hash') != fingerprint.manifest_hash:
+            return False
+        logger.info(f"Manifest unchanged since the load at {metadata.get('loaded_at')} "
+                    f"(generated at {metadata.get('generated_at')}), skipping")
+        self.profile.skipped = True
+        return True
+    
+    def _metadata_rows(self, fingerprint: ManifestFingerprint) -> List[Dict[str, Any]]:
+        if any(stats.failed for stats in self.profile.phases.values()):
+            # The graph may be missing rows, so the next run must load again
+            logger.warning("Some batches failed; not recording the manifest hash")
+            return []
+        return [self._prepare_row(fingerprint.properties())]
+    
+    # ------------------------------------------------------------------ #
+    # Projection and planning                                              #
+    # ------------------------------------------------------------------ #
+    
+    def _prepare_row(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Hook for backends that need property values converted before writing"""
+        return properties
+    
+    def _tags(self, tags: List[str]) -> Any:
+        """Value stored in the tags property"""
+        return tags
+    
+    def _model_properties(self, model_id: str, model: ManifestNode,
+                          catalog_nodes: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Project a manifest model onto its node properties"""
+        config = model.config
+        # Extract basic properties
+        properties = {
+            'unique_id': model_id,
+            'name': model.name,
+            'resource_type': model.resource_type,
+            'package_name': model.package_name,
+            'path': model.path,
+            'original_file_path': model.original_file_path,
+            'database': model.database,
+            'schema': model.schema,
+            'alias': model.alias,
+            'materialized': config.get('materialized', ''),
+            'description': model.description,
+            'checksum': model.checksum,
+            'relation_name': model.relation_name,
+            'language': model.language,
+        }
+        
+        # Add config details
+        properties.update({
+            'enabled': config.get('enabled', True),
+            'tags': self._tags(config.get('tags', [])),
+            'meta': json.dumps(config.get('meta', {})),
+            'access': config.get('access', ''),
+        })
+        
+        # Add catalog information if available
+        if catalog_nodes and model_id in catalog_nodes:
+            catalog_info = catalog_nodes[model_id]
+            properties.update({
+                'table_type': catalog_info.get('metadata', {}).get('type', ''),
+                'table_comment': catalog_info.get('metadata', {}).get('comment', ''),
+                'owner': catalog_info.get('metadata', {}).get('owner', ''),
+            })
+        
+        return properties
+    
+    def _source_properties(self, source_id: str, source: ManifestNode) -> Dict[str, Any]:
+        """Project a manifest source onto its node properties"""
+        # Create full name as source_name.identifier
+        source_name = source.source_name
+        identifier = source.identifier if source.identifier is not None else source.name
+        full_name = f"{source_name}.{identifier}" if source_name and identifier else identifier
+        
+        properties = {
+            'unique_id': source_id,
+            'name': full_name,
+            'identifier': identifier,
+            'resource_type': source.resource_type,
+            'package_name': source.package_name,
+            'source_name': source_name,
+            'database': source.database,
+            'schema': source.schema,
+            'description': source.description,
+            'loader': source.loader,
+            'relation_name': source.relation_name,
+        }
+        
+        # Add freshness info; the columns themselves are Column nodes
+        freshness = source.freshness
+        if freshness:
+            properties['freshness_warn_after'] = json.dumps(freshness.get('warn_after', {}))
+            properties['freshness_error_after'] = json.dumps(freshness.get('error_after', {}))
+        
+        columns = source.columns
+        if columns:
+            properties['column_count'] = len(columns)
+        
+        return properties
+    
+    def _seed_properties(self, seed_id: str, seed: ManifestNode) -> Dict[str, Any]:
+        """Project a manifest seed onto its node properties"""
+        properties = {
+            'unique_id': seed_id,
+            'name': seed.name,
+            'resource_type': seed.resource_type,
+            'package_name': seed.package_name,
+            'path': seed.path,
+            'database': seed.database,
+            'schema': seed.schema,
+            'alias': seed.alias,
+            'relation_name': seed.relation_name,
+        }
+        
+        # Add config details
+        config = seed.config
+        properties.update({
+            'enabled': config.get('enabled', True),
+            'tags': self._tags(config.get('tags', [])),
+            'materialized': config.get('materialized', 'seed'),
+            'delimiter': config.get('delimiter', ','),
+        })
+        
+        return properties
+    
+    def _snapshot_properties(self, snapshot_id: str, snapshot: ManifestNode) -> Dict[str, Any]:
+        """Project a manifest snapshot onto its node properties"""
+        properties = {
+            'unique_id': snapshot_id,
+            'name': snapshot.name,
+            'resource_type': snapshot.resource_type,
+            'package_name': snapshot.package_name,
+            'path': snapshot.path,
+            'database': snapshot.database,
+            'schema': snapshot.schema,
+            'alias': snapshot.alias,
+            'relation_name': snapshot.relation_name,
+        }
+        
+        # Add snapshot-specific config
+        config = snapshot.config
+        properties.update({
+            'enabled': config.get('enabled', True),
+            'tags': self._tags(config.get('tags', [])),
+            'materialized': config.get('materialized', 'snapshot'),
+            'strategy': config.get('strategy', ''),
+            'unique_key': config.get('unique_key', ''),
+            'updated_at': config.get('updated_at', ''),
+        })
+        
+        return properties
+    
+    def _test_properties(self, test_id: str, test: ManifestNode) -> Dict[str, Any]:
+        """Project a manifest test onto its node properties"""
+        properties = {
+            'unique_id': test_id,
+            'name': test.name,
+            'resource_type': test.resource_type,
+            'package_name': test.package_name,
+            'path': test.path,
+            'column_name': test.column_name,
+            'language': test.language,
+        }
+        
+        # Add config and test metadata
+        config = test.config
+        properties.update({
+            'enabled': config.get('enabled', True),
+            'tags': self._tags(config.get('tags', [])),
+            'severity': config.get('severity', 'ERROR'),
+        })
+        
+        test_metadata = test.test_metadata
+        if test_metadata:
+            properties.update({
+                'test_name': test_metadata.get('name', ''),
+                'test_kwargs': json.dumps(test_metadata.get('kwargs', {})),
+            })
+        
+        return properties
+    
+    def _macro_properties(self, macro_id: str, macro: ManifestNode) -> Dict[str, Any]:
+        """Project a manifest macro onto its node properties"""
+        return {
+            'unique_id': macro_id,
+            'name': macro.name,
+            'resource_type': macro.resource_type,
+            'package_name': macro.package_name,
+            'path': macro.path,
+            'description': macro.description,
+            'arguments': json.dumps(macro.arguments),
+        }
+    
+    def _operation_properties(self, op_id: str, op: ManifestNode) -> Dict[str, Any]:
+        """Project a manifest operation onto its node properties"""
+        return {
+            'unique_id': op_id,
+            'name': op.name,
+            'resource_type': op.resource_type,
+            'package_name': op.package_name,
+            'path': op.path,
+            'database': op.database,
+            'schema': op.schema,
+            'language': op.language,
+        }
+    
+    def _column_properties(self, parent_id: str, node: ManifestNode,
+                           catalog_info: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """Project the manifest and catalog columns of a node onto Column node properties.
+        
+        Documented and catalog columns are matched by case-insensitive name; the
+        catalog's type takes precedence over a declared data_type.
+        """
+        columns = {}
+        for name, column in node.columns.items():
+            name = column.get('name') or name
+            columns[name.lower()] = {
+                'unique_id': column_id(parent_id, name),
+                'name': name,
+                'parent_id': parent_id,
+                'description': column.get('description', ''),
+                'data_type': column.get('data_type'),
+            }
+        
+        for name, column in ((catalog_info or {}).get('columns') or {}).items():
+            name = column.get('name') or name
+            properties = columns.setdefault(name.lower(), {
+                'unique_id': column_id(parent_id, name),
+                'name': name,
+                'parent_id': parent_id,
+            })
+            properties.update({
+                'data_type': column.get('type') or properties.get('data_type'),
+                'comment': column.get('comment'),
+                'index': column.get('index'),
+            })
+        
+        return list(columns.values())
+    
+    @staticmethod
+    def _catalog_info(catalog_data: Dict[str, Any], node: ManifestNode) -> Dict[str, Any]:
+        """Catalog entry of a node; sources are catalogued in their own section"""
+        section = 'sources' if node.resource_type == 'source' else 'nodes'
+        return catalog_data.get(section, {}).get(node.unique_id, {})
+    
+    def _project_columns(self, manifest: Manifest, catalog_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Column node properties of every model, source, seed and snapshot, keyed by unique_id"""
+        return {
+            column['unique_id']: column
+            for label in RELATION_LABELS
+            for uid, node in manifest.by_label[label].items()
+            for column in self._column_properties(uid, node, self._catalog_info(catalog_data, node))
+        }
+    
+    def _project(self, label: str, unique_id: str, data: ManifestNode,
+                 catalog_nodes: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Project any manifest record onto the node properties for its label"""
+        if label == 'Model':
+            return self._model_properties(unique_id, data, catalog_nodes)
+        return {
+            'Source': self._source_properties,
+            'Seed': self._seed_properties,
+            'Snapshot': self._snapshot_properties,
+            'Test': self._test_properties,
+            'Macro': self._macro_properties,
+            'Operation': self._operation_properties,
+        }[label](unique_id, data)
+    
+    def _project_all(self, manifest: Manifest, catalog_nodes: Dict[str, Any],
+                     lineage: Optional[Lineage] = None,
+                     columns: Optional[Dict[str, Dict[str, Any]]] = None) -> ProjectedNodes:
+        """Property maps exactly as a full load would write them, lineage_depth and columns included"""
+        lineage = lineage or Lineage(manifest.parent_map)
+        projected = {
+            uid: (node.label, self._prepare_row(lineage.with_depth(uid, self._project(node.label, uid, node,
+                                                                                       catalog_nodes))))
+            for uid, node in manifest.records().items()
+        }
+        for uid, column in (columns or {}).items():
+            projected[uid] = (COLUMN_LABEL, self._prepare_row(column))
+        return projected
+    
+    def _node_query(self, label: str, merge: bool = None) -> str:
+        """UNWIND query writing node property maps for one label.
+        
+        Right after clear_database the graph holds no dbt nodes, so plain CREATE
+        is used; otherwise nodes are merged on unique_id.
+        """
+        if merge is None:
+            merge = not self._fresh_load
+        if merge:
+            return f"""
+                UNWIND $rows AS row
+                MERGE (n:{label} {{unique_id: row.unique_id}})
+                SET n += row
+            """
+        return f"""
+            UNWIND $rows AS row
+            CREATE (n:{label})
+            SET n = row
+        """
+    
+    def _edge_verb(self, verb: Optional[str]) -> str:
+        if verb is not None:
+            return verb
+        return 'CREATE' if self._fresh_load else 'MERGE'
+    
+    def _plan_load(self, manifest: Manifest, catalog_data: Dict[str, Any]
+                   ) -> Tuple[Dict[str, List[Dict[str, Any]]], EdgeGroups, EdgeGroups]:
+        """Project every node and group every relationship of a manifest.
+        
+        Returns the prepared node rows per label, the edge groups written during
+        the load and the source edge groups, which are merged afterwards.
+        Column rows and HAS_COLUMN groups are part of the plan; with column
+        lineage, the compiled SQL is parsed here as well, adding its
+        DERIVED_FROM groups.
+        """
+        catalog_nodes = catalog_data.get('nodes', {})
+        columns = self._project_columns(manifest, catalog_data)
+        self.node_labels = {**manifest.labels(), **dict.fromkeys(columns, COLUMN_LABEL)}
+        self.resolver = RefResolver(manifest)
+        lineage = Lineage(manifest.parent_map)
+        node_rows = {
+            label: [self._prepare_row(lineage.with_depth(uid, self._project(label, uid, node, catalog_nodes)))
+                    for uid, node in nodes.items()]
+            for label, nodes in manifest.by_label.items()
+        }
+        
+        edges: Iterable[Edge] = chain(
+            dependency_edges(manifest.parent_map),
+            self.resolver.ref_edges(manifest.nodes),
+            macro_edges(manifest.nodes),
+            test_edges(manifest.by_label['Test']),
+            lineage.ancestor_edges(self.node_labels),
+            has_column_edges(columns.values()),
+        )
+        edge_groups, skipped = group_edges(edges, self.node_labels)
+        # Sources usually appear in parent_map as well, so these edges are merged
+        source_groups, source_skipped = group_edges(self.resolver.source_edges(manifest.nodes), self.node_labels)
+        if skipped + source_skipped:
+            logger.warning(f"Skipped {skipped + source_skipped} relationships whose endpoints are not loaded as nodes")
+        
+        if self.column_lineage:
+            column_lineage = extract_column_lineage(manifest, catalog_data, processes=self.parse_processes)
+            for uid, row in column_lineage.columns.items():
+                columns.setdefault(uid, row)
+            edge_groups.update(group_edges(column_lineage.edges, column_lineage.labels())[0])
+        if columns:
+            node_rows[COLUMN_LABEL] = [self._prepare_row(row) for row in columns.values()]
+        return node_rows, edge_groups, source_groups
+    
+    def _plan_catalog_refresh(self, state: CatalogState, manifest: Manifest,
+                              catalog_data: Dict[str, Any]) -> CatalogRefresh:
+        """Project the catalog-derived properties exactly as a full load would, and diff them against state"""
+        catalog_nodes = catalog_data.get('nodes', {})
+        relations = {}
+        for label in RELATION_LABELS:
+            for uid, node in manifest.by_label[label].items():
+                properties = self._prepare_row(self._project(label, uid, node, catalog_nodes))
+                relations[uid] = (label, {key: properties[key]
+                                          for key in RELATION_STATE_PROPERTIES if key in properties})
+        columns = {uid: self._prepare_row(column)
+                   for uid, column in self._project_columns(manifest, catalog_data).items()}
+        return plan_refresh(state, relations, columns)
+
+
+class BaseDBTLoader(LoaderCore):
+    """Blocking load orchestration shared by all backends.
+    
+    Subclasses own the connection and implement create_constraints, _write_batch
+    (send one batch of rows through an UNWIND query) and _delete_batch.
+    """
+    
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1, dbt_labels_only: bool = False,
+                 column_lineage: bool = False, parse_processes: Optional[int] = None, force: bool = False,
+                 pipeline: bool = False, pipeline_process: bool = False, resume: bool = False):
+        super().__init__(batch_size, dbt_labels_only=dbt_labels_only, column_lineage=column_lineage,
+                         parse_processes=parse_processes, force=force)
+        # Number of threads writing batches concurrently
+        self.workers = workers
+        # Streamed loads queue batches to the writers while decoding goes on, optionally in a child process
+        self.pipeline = pipeline
+        self.pipeline_process = pipeline_process
+        # Batches waiting per writer before decoding blocks
+        self.queue_size = DEFAULT_QUEUE_SIZE
+        # Streamed loads merge every batch and journal their progress in the graph, and continue
+        # an interrupted load of the same content from its last checkpoint
+        self.resume = resume
+        self.checkpoint_interval = DEFAULT_CHECKPOINT_INTERVAL
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # thread name -> [rows written, seconds spent writing]
+        self.worker_stats: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        self._stats_lock = threading.Lock()
+    
+    # ------------------------------------------------------------------ #
+    # Skipping unchanged loads                                             #
+    # ------------------------------------------------------------------ #
+    
+    def _read_rows(self, query: str) -> List[List[Any]]:
+        """Run a read-only query; returns its rows as lists of column values"""
+        raise NotImplementedError
+    
+    def get_load_metadata(self) -> Optional[Dict[str, Any]]:
+        """Properties of the LoadMetadata node of the graph, or None when there is none"""
+        rows = self._read_rows(LOAD_METADATA_QUERY)
+        return rows[0][0] if rows else None
+    
+    def is_unchanged(self, fingerprint: ManifestFingerprint) -> bool:
+        """Whether the graph already holds a load of this content, so loading it again can be skipped"""
+        with self.profile.phase('check'):
+            return self._unchanged(self.get_load_metadata(), fingerprint)
+    
+    def record_load(self, fingerprint: ManifestFingerprint):
+        """Store the content hash of a completed load, so an identical next load is skipped"""
+        rows = self._metadata_rows(fingerprint)
+        if rows:
+            with self.profile.phase('metadata'):
+                self._timed_write(LOAD_METADATA_WRITE, rows, "load metadata")
+    
+    def clear_load_metadata(self):
+        """Forget the content hash, e.g. before the graph is changed by an incremental update"""
+        with self.profile.phase('metadata'):
+            self._timed_write(LOAD_METADATA_DELETE, [{}], "load metadata deletion")
+    
+    def clear_database(self, dbt_labels_only: bool = None):
+        """Clear all nodes and relationships, or only the dbt ones, in bounded transactions"""
+        if dbt_labels_only is None:
+            dbt_labels_only = self.dbt_labels_only
+        start = time.perf_counter()
+        if dbt_labels_only:
+            self._clear_in_batches(DBT_LABELS)
+        else:
+            self._clear_all()
+        logger.info(f"Database cleared in {time.perf_counter() - start:.1f}s")
+        self._fresh_load = True
+    
+    def _clear_all(self):
+        """Remove everything; backends with a server-side drop override this"""
+        self._clear_in_batches(None)
+    
+    def _clear_in_batches(self, labels: Optional[List[str]]):
+        for description, query in clear_queries(labels, self.clear_batch_size):
+            total = 0
+            while True:
+                deleted = self._delete_batch(query)
+                self.profile.record(rows=deleted, queries=1)
+                total += deleted
+                if deleted:
+                    logger.info(f"Deleted {total} {description}")
+                if deleted < self.clear_batch_size:
+                    break
+    
+    def _delete_batch(self, query: str) -> int:
+        """Run one bounded delete query in its own transaction; returns the number deleted"""
+        raise NotImplementedError
+    
+    def create_constraints(self):
+        raise NotImplementedError
+    
+    def _write_batch(self, query: str, batch: List[Any], description: str) -> int:
+        """Write one batch; returns the number of rows written"""
+        raise NotImplementedError
+    
+    def close_workers(self):
+        """Stop the writer threads, if any were started"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def _timed_write(self, query: str, batch: List[Any], description: str) -> int:
+        start = time.perf_counter()
+        written = self._write_batch(query, batch, description)
+        elapsed = time.perf_counter() - start
+        self.profile.record(rows=written, queries=1)
+        with self._stats_lock:
+            stats = self.worker_stats[threading.current_thread().name]
+            stats[0] += written
+            stats[1] += elapsed
+        return written
+    
+    def _write_chunks(self, query: str, rows: List[Any], description: str) -> int:
+        return sum(self._timed_write(query, rows[start:start + self.batch_size], description)
+                   for start in range(0, len(rows), self.batch_size))
+    
+    def _write_batches(self, query: str, rows: List[Any], description: str = '',
+                       partition_key: Callable[[Any], str] = None) -> int:
+        """Send rows through an UNWIND query in batch_size chunks.
+        
+        With several workers the chunks are written concurrently. When a
+        partition_key is given, rows are split into one bucket per worker by
+        hash of that key and each bucket is written by a single worker, so
+        concurrent transactions never lock the same key (e.g. the same source
+        node of a relationship).
+        """
+        if self.workers <= 1 or len(rows) <= self.batch_size:
+            return self._write_chunks(query, rows, description)
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='graph-writer')
+        if partition_key is None:
+            chunks = [rows[start:start + self.batch_size] for start in range(0, len(rows), self.batch_size)]
+            return sum(self._executor.map(lambda chunk: self._timed_write(query, chunk, description), chunks))
+        
+        buckets = [[] for _ in range(self.workers)]
+        for row in rows:
+            buckets[hash(partition_key(row)) % self.workers].append(row)
+        return sum(self._executor.map(lambda bucket: self._write_chunks(query, bucket, description), buckets))
+    
+    def log_worker_stats(self):
+        """Report rows written and throughput per writer thread"""
+        for name, (rows, seconds) in sorted(self.worker_stats.items()):
+            rate = rows / seconds if seconds else 0.0
+            logger.info(f"Writer {name}: {int(rows)} rows in {seconds:.2f}s ({rate:.0f} rows/s)")
+    
+    def _write_nodes(self, label: str, rows: List[Dict[str, Any]], merge: bool = None) -> int:
+        """Write node property maps for one label"""
+        return self._write_batches(self._node_query(label, merge), [self._prepare_row(row) for row in rows],
+                                   f"{label} node")
+    
+    def _write_edge_group(self, key: Tuple[str, str, str], rows: List[Dict[str, str]],
+                          verb: Optional[str] = None) -> int:
+        src_label, dst_label, rel_type = key
+        return self._write_batches(edge_query(src_label, dst_label, rel_type, self._edge_verb(verb)), rows,
+                                   f"{src_label}-[:{rel_type}]->{dst_label}", partition_key=_edge_source)
+    
+    def _write_edges(self, edges: Iterable[Edge], labels: Dict[str, str] = None, verb: str = None) -> int:
+        """Write edges grouped by (source label, target label, relationship type).
+        
+        Endpoint labels come from the manifest (``self.node_labels`` unless given),
+        so every MATCH is served by the label's unique_id index. During a fresh
+        load edges are created, otherwise merged.
+        """
+        groups, skipped = group_edges(edges, self.node_labels if labels is None else labels)
+        if skipped:
+            logger.warning(f"Skipped {skipped} relationships whose endpoints are not loaded as nodes")
+        
+        written = 0
+        for key, rows in groups.items():
+            written += self._write_edge_group(key, rows, verb)
+        return written
+    
+    def create_models(self, models: Dict[str, ManifestNode], catalog_nodes: Dict[str, Any] = None) -> int:
+        """Create model nodes"""
+        rows = [self._model_properties(model_id, model_data, catalog_nodes)
+                for model_id, model_data in models.items()]
+        created = self._write_nodes('Model', rows)
+        
+        logger.info(f"Created {created} model nodes")
+        return created
+    
+    def create_sources(self, sources: Dict[str, ManifestNode]) -> int:
+        """Create source nodes with proper naming: source_name.identifier"""
+        rows = [self._source_properties(source_id, source_data)
+                for source_id, source_data in sources.items()]
+        created = self._write_nodes('Source', rows)
+        
+        logger.info(f"Created {created} source nodes")
+        return created
+    
+    def create_seeds(self, seeds: Dict[str, ManifestNode]) -> int:
+        """Create seed nodes"""
+        rows = [self._seed_properties(seed_id, seed_data)
+                for seed_id, seed_data in seeds.items()]
+        created = self._write_nodes('Seed', rows)
+        
+        logger.info(f"Created {created} seed nodes")
+        return created
+    
+    def create_snapshots(self, snapshots: Dict[str, ManifestNode]) -> int:
+        """Create snapshot nodes"""
+        rows = [self._snapshot_properties(snapshot_id, snapshot_data)
+                for snapshot_id, snapshot_data in snapshots.items()]
+        created = self._write_nodes('Snapshot', rows)
+        
+        logger.info(f"Created {created} snapshot nodes")
+        return created
+    
+    def create_tests(self, tests: Dict[str, ManifestNode]) -> int:
+        """Create test nodes"""
+        rows = [self._test_properties(test_id, test_data)
+                for test_id, test_data in tests.items()]
+        created = self._write_nodes('Test', rows)
+        
+        logger.info(f"Created {created} test nodes")
+        return created
+    
+    def create_macros(self, macros: Dict[str, ManifestNode]) -> int:
+        """Create macro nodes"""
+        rows = [self._macro_properties(macro_id, macro_data)
+                for macro_id, macro_data in macros.items()]
+        created = self._write_nodes('Macro', rows)
+        
+        logger.info(f"Created {created} macro nodes")
+        return created
+    
+    def create_operations(self, operations: Dict[str, ManifestNode]) -> int:
+        """Create operation nodes"""
+        rows = [self._operation_properties(op_id, op_data)
+                for op_id, op_data in operations.items()]
+        created = self._write_nodes('Operation', rows)
+        
+        logger.info(f"Created {created} operation nodes")
+        return created
+    
+    def create_columns(self, manifest: Manifest, catalog_data: Dict[str, Any]) -> int:
+        """Create Column nodes from manifest and catalog columns, linked to their parents with HAS_COLUMN"""
+        columns = self._project_columns(manifest, catalog_data)
+        self.node_labels.update(dict.fromkeys(columns, COLUMN_LABEL))
+        created = self._write_nodes(COLUMN_LABEL, list(columns.values()))
+        has_column_count = self._write_edges(has_column_edges(columns.values()))
+        
+        logger.info(f"Created {created} column nodes and {has_column_count} HAS_COLUMN relationships")
+        return created
+    
+    def create_dependencies(self, parent_map: Dict[str, List[str]], child_map: Dict[str, List[str]],
+                            labels: Dict[str, str] = None) -> int:
+        """Create dependency relationships using DEPENDS_ON for all types"""
+        dependency_count = self._write_edges(dependency_edges(parent_map), labels)
+        
+        logger.info(f"Created {dependency_count} dependency relationships")
+        return dependency_count
+    
+    def _resolver_for(self, nodes: Dict[str, ManifestNode]) -> RefResolver:
+        """Resolver built for the current load, or an ad-hoc one over the given nodes"""
+        if self.resolver is not None:
+            return self.resolver
+        resolver = RefResolver()
+        for node in nodes.values():
+            resolver.add_node(node)
+        return resolver
+    
+    def create_ref_relationships(self, nodes: Dict[str, ManifestNode]) -> int:
+        """Create REFERENCES relationships from refs resolved to unique_ids"""
+        ref_count = self._write_edges(self._resolver_for(nodes).ref_edges(nodes))
+        
+        logger.info(f"Created {ref_count} REFERENCES relationships")
+        return ref_count
+    
+    def create_source_relationships(self, nodes: Dict[str, ManifestNode]) -> int:
+        """Create DEPENDS_ON relationships to sources resolved to unique_ids.
+        
+        Sources usually appear in parent_map as well, so these edges are always
+        merged to avoid duplicating the ones written by create_dependencies.
+        """
+        source_dep_count = self._write_edges(self._resolver_for(nodes).source_edges(nodes), verb='MERGE')
+        
+        logger.info(f"Created {source_dep_count} DEPENDS_ON relationships to sources")
+        return source_dep_count
+    
+    def create_macro_relationships(self, nodes: Dict[str, ManifestNode], labels: Dict[str, str] = None) -> int:
+        """Create USES_MACRO relationships"""
+        macro_count = self._write_edges(macro_edges(nodes), labels)
+        
+        logger.info(f"Created {macro_count} USES_MACRO relationships")
+        return macro_count
+    
+    def create_test_relationships(self, tests: Dict[str, ManifestNode], labels: Dict[str, str] = None) -> int:
+        """Create TESTS relationships"""
+        test_count = self._write_edges(test_edges(tests), labels)
+        
+        logger.info(f"Created {test_count} TESTS relationships")
+        return test_count
+    
+    def create_lineage(self, parent_map: Dict[str, List[str]]) -> int:
+        """Write the transitive closure of the dependency DAG.
+        
+        Sets lineage_depth on every node of the DAG and links each model, seed,
+        snapshot or source ancestor to each such descendant with an ANCESTOR_OF
+        relationship.
+        """
+        lineage = Lineage(parent_map)
+        for label, rows in lineage.depth_rows(self.node_labels).items():
+            self._write_batches(lineage_depth_query(label), rows, f"{label} lineage depth")
+        lineage_count = self._write_edges(lineage.ancestor_edges(self.node_labels))
+        
+        logger.info(f"Created {lineage_count} ANCESTOR_OF relationships")
+        return lineage_count
+    
+    def create_column_lineage(self, manifest: Manifest, catalog_data: Dict[str, Any],
+                              model_ids: Optional[Iterable[str]] = None) -> ColumnLineage:
+        """Parse compiled model SQL and write Column nodes and DERIVED_FROM relationships.
+        
+        The manifest must have been parsed with ``keep_code=True``. Only
+        model_ids are parsed when given, and their relationships are merged.
+        Columns already written from the manifest and catalog are left as they
+        are; only columns found in SQL alone are added.
+        """
+        lineage = extract_column_lineage(manifest, catalog_data, model_ids, self.parse_processes)
+        rows = [self._prepare_row(row) for uid, row in lineage.columns.items()
+                if self.node_labels.get(uid) != COLUMN_LABEL]
+        if model_ids is None:
+            query = self._node_query(COLUMN_LABEL)
+        else:
+            query = f"""
+                UNWIND $rows AS row
+                MERGE (n:{COLUMN_LABEL} {{unique_id: row.unique_id}})
+                ON CREATE SET n += row
+            """
+        created = self._write_batches(query, rows, f"{COLUMN_LABEL} node")
+        self.node_labels.update(lineage.labels())
+        derived_count = self._write_edges(lineage.edges, verb=None if model_ids is None else 'MERGE')
+        
+        logger.info(f"Created {created} SQL-only column nodes and {derived_count} DERIVED_FROM relationships")
+        return lineage
+    
+    def _load_manifest(self, manifest: Manifest, catalog_data: Dict[str, Any]):
+        """Clear the graph and write every node and relationship of a parsed manifest"""
+        with self._profiled('load') as profile:
+            self.worker_stats.clear()
+            # Clear database and create constraints
+            with profile.phase('clear'):
+                self.clear_database()
+            with profile.phase('constraints'):
+                self.create_constraints()
+            self.node_labels = manifest.labels()
+            self.resolver = RefResolver(manifest)
+            by_label = manifest.by_label
+            
+            try:
+                # Create nodes
+                with profile.phase('nodes'):
+                    self.create_models(by_label['Model'], catalog_data.get('nodes', {}))
+                    self.create_sources(by_label['Source'])
+                    self.create_seeds(by_label['Seed'])
+                    self.create_snapshots(by_label['Snapshot'])
+                    self.create_tests(by_label['Test'])
+                    self.create_macros(by_label['Macro'])
+                    self.create_operations(by_label['Operation'])
+                    self.create_columns(manifest, catalog_data)
+                
+                # Create relationships
+                with profile.phase('relationships'):
+                    self.create_dependencies(manifest.parent_map, {})
+                    self.create_ref_relationships(manifest.nodes)
+                    self.create_source_relationships(manifest.nodes)
+                    self.create_macro_relationships(manifest.nodes)
+                    self.create_test_relationships(by_label['Test'])
+                with profile.phase('lineage'):
+                    self.create_lineage(manifest.parent_map)
+                if self.column_lineage:
+                    with profile.phase('column_lineage'):
+                        self.create_column_lineage(manifest, catalog_data)
+            finally:
+                # Later writes must not assume an empty graph
+                self._fresh_load = False
+            logger.info(self.resolver.summary())
+            self.log_worker_stats()
+    
+    def load_parsed_manifest(self, manifest: Manifest, catalog_data: Optional[Dict[str, Any]] = None) -> LoadProfile:
+        """Replace the graph with an already parsed manifest (see ``dbt_graph_loader.manifest``)"""
+        self._load_manifest(manifest, catalog_data or {})
+        return self.profile
+    
+    def _node_write(self, label: str, rows: List[Dict[str, Any]]) -> Tuple:
+        return 'write', self._node_query(label), rows, f"{label} node", False
+    
+    def _edge_write(self, key: Tuple[str, str, str], rows: List[Dict[str, str]], verb: Optional[str] = None) -> Tuple:
+        src_label, dst_label, rel_type = key
+        return ('write', edge_query(src_label, dst_label, rel_type, self._edge_verb(verb)), rows,
+                f"{src_label}-[:{rel_type}]->{dst_label}", True)
+    
+    def _streamed_writes(self, manifest_path: str, catalog_path: Optional[str] = None) -> Iterator[Tuple]:
+        """Decode and project a manifest file into the writes of a fresh load, in order.
+        
+        Yields ``('phase', name)`` when the load moves on to another phase,
+        ``('sync',)`` when every earlier write must be done before the next one
+        (relationships need their endpoints), ``('write', query, rows,
+        description, partitioned)`` for every batch, where partitioned rows are
+        relationships to partition by source node, and finally ``('done',
+        summary)`` with the state and counts of the load.
+        
+        Node properties are only held one batch at a time, but relationship
+        inputs are retained for the whole manifest until every node exists:
+        the edge inputs of every node (ids, refs, sources, dependencies), the
+        parent_map, node_labels, the HAS_COLUMN rows and the catalog's table
+        metadata and columns, plus the tables and compiled model SQL when
+        column lineage is enabled. That state grows linearly with the number
+        of nodes and columns.
+        """
+        self.node_labels = {}
+        self.resolver = RefResolver()
+        # Only table metadata and columns of the catalog are projected onto nodes
+        catalog_data = {'nodes': {}, 'sources': {}}
+        catalog_nodes = catalog_data['nodes']
+        if catalog_path and Path(catalog_path).exists():
+            yield 'phase', 'catalog'
+            for section, node_id, catalog_info in iter_sections(catalog_path, ['nodes', 'sources']):
+                catalog_data[section][node_id] = {'metadata': catalog_info.get('metadata', {}),
+                                                  'columns': catalog_info.get('columns', {})}
+        
+        # Hand over enough rows at once to keep every writer busy
+        node_buffer = _BatchBuffer(self.batch_size * self.workers)
+        edge_buffer = _BatchBuffer(self.batch_size * self.workers)
+        source_buffer = _BatchBuffer(self.batch_size * self.workers)
+        ancestor_buffer = _BatchBuffer(self.batch_size * self.workers)
+        # Relationship inputs of every node, kept until all endpoints are written
+        edge_inputs: Dict[str, ManifestNode] = {}
+        pending_dependencies: Dict[str, List[str]] = {}
+        # The whole parent_map, for the lineage closure
+        dependencies: Dict[str, List[str]] = {}
+        has_columns: List[Edge] = []
+        # Tables and compiled model SQL, for column lineage
+        relations = Manifest()
+        node_sections = {'nodes', 'sources', 'macros'}
+        seen_sections = set()
+        nodes_written = False
+        skipped = 0
+        
+        def edge_writes(edges: Iterable[Edge], buffer: _BatchBuffer = edge_buffer, verb: Optional[str] = None):
+            nonlocal skipped
+            for src, dst, rel_type in edges:
+                src_label, dst_label = self.node_labels.get(src), self.node_labels.get(dst)
+                if src_label is None or dst_label is None:
+                    skipped += 1
+                    continue
+                key = (src_label, dst_label, rel_type)
+                rows = buffer.add(key, {'src': src, 'dst': dst})
+                if rows:
+                    yield self._edge_write(key, rows, verb)
+        
+        def node_writes(label: str, row: Dict[str, Any]):
+            rows = node_buffer.add(label, self._prepare_row(row))
+            if rows:
+                yield self._node_write(label, rows)
+        
+        def drained(buffer: _BatchBuffer, verb: Optional[str] = None):
+            for key, rows in buffer.drain():
+                yield self._edge_write(key, rows, verb)
+        
+        # Decoding the manifest is interleaved with the node writes
+        yield 'phase', 'nodes'
+        for section, unique_id, data in iter_sections(
+                manifest_path, ['metadata', 'nodes', 'sources', 'macros', 'parent_map']):
+            seen_sections.add(section)
+            if section == 'metadata':
+                relations.metadata[unique_id] = data
+                continue
+            if section == 'parent_map':
+                dependencies[unique_id] = data
+                if node_sections <= seen_sections:
+                    # Every node is known: dependencies can be streamed straight out
+                    if not nodes_written:
+                        for label, rows in node_buffer.drain():
+                            yield self._node_write(label, rows)
+                        yield ('sync',)
+                        nodes_written = True
+                    yield from edge_writes(dependency_edges({unique_id: data}))
+                else:
+                    pending_dependencies[unique_id] = data
+                continue
+            
+            node = ManifestNode(unique_id, data)
+            if node.label is None:
+                continue
+            self.node_labels[node.unique_id] = node.label
+            yield from node_writes(node.label, self._project(node.label, node.unique_id, node, catalog_nodes))
+            if node.label in RELATION_LABELS:
+                columns = self._column_properties(node.unique_id, node, self._catalog_info(catalog_data, node))
+                for column in columns:
+                    self.node_labels[column['unique_id']] = COLUMN_LABEL
+                    yield from node_writes(COLUMN_LABEL, column)
+                has_columns.extend(has_column_edges(columns))
+                if self.column_lineage:
+                    relations.add(section, unique_id, data, keep_code=True)
+            if section == 'sources':
+                self.resolver.add_source(node)
+            elif section == 'nodes':
+                self.resolver.add_node(node)
+                edge_inputs[node.unique_id] = node.strip()
+        for label, rows in node_buffer.drain():
+            yield self._node_write(label, rows)
+        
+        yield 'phase', 'relationships'
+        yield from edge_writes(dependency_edges(pending_dependencies))
+        yield from edge_writes(has_columns)
+        yield from edge_writes(self.resolver.ref_edges(edge_inputs))
+        yield from edge_writes(macro_edges(edge_inputs))
+        yield from edge_writes(test_edges(edge_inputs))
+        yield from drained(edge_buffer)
+        # Source edges usually duplicate parent_map entries, so they are merged once those are written
+        yield ('sync',)
+        yield from edge_writes(self.resolver.source_edges(edge_inputs), source_buffer, 'MERGE')
+        yield from drained(source_buffer, 'MERGE')
+        
+        yield 'phase', 'lineage'
+        lineage = Lineage(dependencies)
+        for label, rows in lineage.depth_rows(self.node_labels).items():
+            for start in range(0, len(rows), self.batch_size):
+                yield ('write', lineage_depth_query(label), rows[start:start + self.batch_size],
+                       f"{label} lineage depth", False)
+        yield from edge_writes(lineage.ancestor_edges(self.node_labels), ancestor_buffer)
+        yield from drained(ancestor_buffer)
+        
+        yield 'done', {
+            'node_labels': self.node_labels,
+            'resolver': self.resolver,
+            'relations': relations if self.column_lineage else None,
+            'catalog_data': catalog_data if self.column_lineage else None,
+            'nodes': dict(node_buffer.counts),
+            'edges': dict(edge_buffer.counts),
+            'source_edges': sum(source_buffer.counts.values()),
+            'ancestor_edges': sum(ancestor_buffer.counts.values()),
+            'skipped': skipped,
+        }
+    
+    def _load_manifest_streaming(self, manifest_path: str, catalog_path: Optional[str] = None,
+                                 fingerprint: Optional[ManifestFingerprint] = None):
+        """Clear the graph and load a manifest file without materialising it.
+        
+        Manifest entries are projected and handed to the writers as they are
+        decoded (see _streamed_writes), so node properties are held one batch
+        at a time; the compact relationship inputs still grow with the number
+        of nodes. With pipeline set, batches are queued to writer threads
+        instead of being written in turn, so decoding and
+        projection continue while earlier batches are in flight; with
+        pipeline_process also set, decoding and projection run in a child
+        process that starts while the graph is being cleared.
+        
+        With resume set and the fingerprint of the files given, every batch is
+        merged, so writing it again changes nothing, and progress is journaled
+        in the graph every checkpoint_interval write items and at every phase.
+        When the graph holds the journal of an interrupted load of the same
+        content and batch sizes, the graph is not cleared and every write item
+        up to its last checkpoint is skipped.
+        """
+        with self._profiled('load') as profile:
+            self.worker_stats.clear()
+            resumable = self.resume and fingerprint is not None
+            progress = None
+            if resumable:
+                with profile.phase('check'):
+                    progress = self._resume_point(fingerprint)
+            stage = None
+            if self.pipeline and self.pipeline_process:
+                options = dict(batch_size=self.batch_size, workers=self.workers, column_lineage=self.column_lineage)
+                stage = ProcessStage(_projected_writes,
+                                     (type(self), options, not resumable, manifest_path, catalog_path),
+                                     self.queue_size)
+            pool = None
+            phases = ExitStack()
+            # Write items committed by the interrupted load, journaled, and seen so far
+            resumed_from = checkpointed = progress['batch'] if progress else 0
+            batch = 0
+            phase = 'constraints'
+            try:
+                if progress is None:
+                    with profile.phase('clear'):
+                        self.clear_database()
+                    with profile.phase('constraints'):
+                        self.create_constraints()
+                if resumable:
+                    # Batches committed after the last checkpoint are written again on resume
+                    self._fresh_load = False
+                    if progress is None:
+                        self._record_progress(fingerprint, phase, 0)
+                if self.pipeline:
+                    pool = WriterPool(self._timed_write, self.workers, self.batch_size, self.queue_size)
+                
+                summary = None
+                for item in stage if stage is not None else self._streamed_writes(manifest_path, catalog_path):
+                    if item[0] == 'write':
+                        batch += 1
+                        if batch <= resumed_from:
+                            continue
+                        _, query, rows, description, partitioned = item
+                        partition_key = _edge_source if partitioned else None
+                        if pool is None:
+                            self._write_batches(query, rows, description, partition_key)
+                        else:
+                            pool.submit(query, rows, description, partition_key)
+                        if resumable and batch - checkpointed >= self.checkpoint_interval:
+                            if pool is not None:
+                                pool.join()
+                            self._record_progress(fingerprint, phase, batch)
+                            checkpointed = batch
+                        continue
+                    if pool is not None:
+                        pool.join()
+                    if resumable and batch > checkpointed:
+                        self._record_progress(fingerprint, phase, batch)
+                        checkpointed = batch
+                    if item[0] == 'phase':
+                        phase = item[1]
+                        phases.close()
+                        phases.enter_context(profile.phase(phase))
+                    elif item[0] == 'done':
+                        summary = item[1]
+                phases.close()
+                self.node_labels = summary['node_labels']
+                self.resolver = summary['resolver']
+                if self.column_lineage:
+                    with profile.phase('column_lineage'):
+                        self.create_column_lineage(summary['relations'], summary['catalog_data'])
+                if resumable:
+                    self.clear_load_progress()
+            finally:
+                phases.close()
+                if pool is not None:
+                    pool.close()
+                if stage is not None:
+                    stage.close()
+                # Later writes must not assume an empty graph
+                self._fresh_load = False
+            
+            if resumed_from:
+                logger.info(f"Skipped {resumed_from} write batches committed before the load was interrupted")
+            if summary['skipped']:
+                logger.warning(f"Skipped {summary['skipped']} relationships whose endpoints are not loaded as nodes")
+            for label, count in sorted(summary['nodes'].items()):
+                logger.info(f"Created {count} {label} nodes")
+            for (src_label, dst_label, rel_type), count in sorted(summary['edges'].items()):
+                logger.info(f"Created {count} {src_label}-[:{rel_type}]->{dst_label} relationships")
+            logger.info(f"Created {summary['source_edges']} DEPENDS_ON relationships to sources")
+            logger.info(f"Created {summary['ancestor_edges']} ANCESTOR_OF relationships")
+            logger.info(self.resolver.summary())
+            self.log_worker_stats()
+    
+    # ------------------------------------------------------------------ #
+    # Resumable loads                                                      #
+    # ------------------------------------------------------------------ #
+    
+    def get_load_progress(self) -> Optional[Dict[str, Any]]:
+        """Properties of the LoadProgress node of an unfinished resumable load, or None when there is none"""
+        rows = self._read_rows(LOAD_PROGRESS_QUERY)
+        return rows[0][0] if rows else None
+    
+    def _resume_point(self, fingerprint: ManifestFingerprint) -> Optional[Dict[str, Any]]:
+        """Journal of an interrupted load that wrote the same batches as this one would, if the graph has one"""
+        progress = self.get_load_progress()
+        if not progress:
+            logger.info("No interrupted load to resume, loading from scratch")
+            return None
+        if (progress.get('manifest_hash') != fingerprint.manifest_hash or progress.get('batch_size') != self.batch_size
+                or progress.get('workers') != self.workers):
+            logger.info(f"The load interrupted at {progress.get('updated_at')} was of other content or batch sizes, "
+                        f"loading from scratch")
+            return None
+        logger.info(f"Resuming the load interrupted after batch {progress['batch']} "
+                    f"(phase {progress['phase']}, checkpointed at {progress['updated_at']})")
+        return progress
+    
+    def _record_progress(self, fingerprint: ManifestFingerprint, phase: str, batch: int):
+        """Journal that the first batch write items of the load of fingerprint are committed"""
+        row = {'manifest_hash': fingerprint.manifest_hash, 'batch_size': self.batch_size, 'workers': self.workers,
+               'phase': phase, 'batch': batch, 'updated_at': datetime.now(timezone.utc).isoformat()}
+        self._write_batch(LOAD_PROGRESS_WRITE, [self._prepare_row(row)], "load progress")
+    
+    def clear_load_progress(self):
+        """Forget the journal of a resumable load, so the next load starts from scratch"""
+        self._write_batch(LOAD_PROGRESS_DELETE, [{}], "load progress deletion")
+    
+    # ------------------------------------------------------------------ #
+    # Incremental update helpers                                           #
+    # ------------------------------------------------------------------ #
+    
+    def _ids_by_label(self, labels: Dict[str, str]) -> Dict[str, List[str]]:
+        """Group unique_ids by label so lookups go through the label's unique_id index"""
+        grouped = defaultdict(list)
+        for uid in sorted(labels):
+            grouped[labels[uid]].append(uid)
+        return grouped
+    
+    def _delete_nodes(self, labels: Dict[str, str]) -> int:
+        deleted = 0
+        for label, uids in self._ids_by_label(labels).items():
+            deleted += self._write_batches(
+                f"UNWIND $rows AS uid MATCH (n:{label} {{unique_id: uid}}) DETACH DELETE n",
+                uids, f"{label} node deletion",
+            )
+        logger.info(f"Deleted {deleted} removed nodes")
+        return deleted
+    
+    def _delete_edges(self, edges: Iterable[Edge]) -> int:
+        groups, _ = group_edges(edges, self.node_labels)
+        deleted = 0
+        for (src_label, dst_label, rel_type), rows in groups.items():
+            deleted += self._write_batches(edge_delete_query(src_label, dst_label, rel_type), rows,
+                                           f"{src_label}-[:{rel_type}]->{dst_label} deletion",
+                                           partition_key=_edge_source)
+        logger.info(f"Deleted {deleted} stale relationships")
+        return deleted
+    
+    def _update_properties(self, label: str, rows: List[Dict[str, Any]]) -> int:
+        """Set only the changed properties; a null value removes the property"""
+        updated = self._write_batches(property_update_query(label), rows, f"{label} property update")
+        logger.info(f"Updated {updated} {label} nodes")
+        return updated
+    
+    def _update_column_lineage(self, old_manifest: Manifest, new_manifest: Manifest, catalog_data: Dict[str, Any],
+                               removed_nodes: Dict[str, str], columns: Dict[str, Dict[str, Any]]):
+        """Re-parse only the models whose checksum changed (or that are new).
+        
+        Their outgoing DERIVED_FROM relationships are rebuilt, and SQL-only
+        columns they no longer produce are dropped unless another column still
+        derives from them. Columns of removed nodes are deleted.
+        """
+        removed_parents = sorted(uid for uid, label in removed_nodes.items() if label != COLUMN_LABEL)
+        if removed_parents:
+            self._write_batches(f"UNWIND $rows AS uid MATCH (c:{COLUMN_LABEL} {{parent_id: uid}}) DETACH DELETE c",
+                                removed_parents, "removed node column deletion")
+        
+        old_models = old_manifest.by_label['Model']
+        changed = sorted(uid for uid, model in new_manifest.by_label['Model'].items()
+                         if uid not in old_models or old_models[uid].checksum != model.checksum)
+        if not changed:
+            return
+        logger.info(f"Re-parsing {len(changed)} changed models for column lineage")
+        self._write_batches(
+            f"UNWIND $rows AS uid MATCH (c:{COLUMN_LABEL} {{parent_id: uid}})-[r:DERIVED_FROM]->() DELETE r",
+            changed, "DERIVED_FROM deletion")
+        lineage = self.create_column_lineage(new_manifest, catalog_data, changed)
+        # Documented and catalog columns are kept in step by the delta
+        known = defaultdict(list)
+        for uid, column in columns.items():
+            known[column['parent_id']].append(uid)
+        rows = [{'parent_id': uid, 'columns': model_columns + known[uid]}
+                for uid, model_columns in lineage.model_columns().items()]
+        self._write_batches(f"""
+            UNWIND $rows AS row
+            MATCH (c:{COLUMN_LABEL} {{parent_id: row.parent_id}})
+            WHERE NOT c.unique_id IN row.columns
+            OPTIONAL MATCH (c)<-[d:DERIVED_FROM]-()
+            WITH c, count(d) AS dependents
+            WHERE dependents = 0
+            DETACH DELETE c
+        """, rows, "stale column deletion")
+    
+    def incremental_update(self, old_manifest: Manifest, new_manifest: Manifest,
+                           catalog_data: Optional[Dict[str, Any]] = None) -> GraphDelta:
+        """Apply only the differences between two parsed manifests to the graph.
+        
+        Both manifests are projected exactly as a full load would write them and
+        compared property by property and relationship by relationship, so only
+        the minimal set of deletes, SETs and relationship writes is sent.
+        The catalog, when given, is applied to both sides. With column lineage,
+        only models whose checksum changed are re-parsed.
+        """
+        with self._profiled('incremental update') as profile:
+            logger.info(f"Starting incremental {self.backend_name} update")
+            self.worker_stats.clear()
+            
+            with profile.phase('diff'):
+                catalog_data = catalog_data or {}
+                catalog_nodes = catalog_data.get('nodes', {})
+                self.resolver = RefResolver(new_manifest)
+                # Lineage closures and columns are diffed like any other property and relationship
+                old_lineage, new_lineage = Lineage(old_manifest.parent_map), Lineage(new_manifest.parent_map)
+                old_columns = self._project_columns(old_manifest, catalog_data)
+                new_columns = self._project_columns(new_manifest, catalog_data)
+                self.node_labels = {**new_manifest.labels(), **dict.fromkeys(new_columns, COLUMN_LABEL)}
+                delta = compute_delta(
+                    self._project_all(old_manifest, catalog_nodes, old_lineage, old_columns),
+                    self._project_all(new_manifest, catalog_nodes, new_lineage, new_columns),
+                    manifest_edges(old_manifest, RefResolver(old_manifest), old_lineage, old_columns.values()),
+                    manifest_edges(new_manifest, self.resolver, new_lineage, new_columns.values()),
+                )
+            logger.info(delta.summary())
+            
+            if not delta:
+                logger.info("Nothing to update")
+                return delta
+            
+            self.clear_load_metadata()
+            with profile.phase('deletes'):
+                if delta.removed_nodes:
+                    self._delete_nodes(delta.removed_nodes)
+                if delta.removed_edges:
+                    self._delete_edges(delta.removed_edges)
+            with profile.phase('nodes'):
+                for label, rows in delta.added_nodes.items():
+                    created = self._write_nodes(label, rows, merge=True)
+                    logger.info(f"Upserted {created} {label} nodes")
+                for label, rows in delta.updated_nodes.items():
+                    self._update_properties(label, rows)
+            if delta.added_edges:
+                with profile.phase('relationships'):
+                    count = self._write_edges(delta.added_edges, verb='MERGE')
+                logger.info(f"Merged {count} relationships")
+            if self.column_lineage:
+                with profile.phase('column_lineage'):
+                    self._update_column_lineage(old_manifest, new_manifest, catalog_data, delta.removed_nodes,
+                                                new_columns)
+            logger.info(self.resolver.summary())
+            self.log_worker_stats()
+            
+            logger.info("Incremental update completed")
+            return delta
+    
+    def incremental_update_from_files(self, old_manifest_path: str, new_manifest_path: str, catalog_path: str = None):
+        """Incrementally update the graph based on the diff between two manifest files."""
+        with self._profiled('incremental update') as profile:
+            with profile.phase('parse'):
+                catalog_data = {}
+                if catalog_path and Path(catalog_path).exists():
+                    catalog_data = read_json(catalog_path)
+                old_manifest = Manifest.from_file(old_manifest_path, self.column_lineage)
+                new_manifest = Manifest.from_file(new_manifest_path, self.column_lineage)
+            delta = self.incremental_update(old_manifest, new_manifest, catalog_data)
+            self.record_load(self.fingerprint_files(new_manifest_path, catalog_path))
+            return delta
+    
+    # ------------------------------------------------------------------ #
+    # Catalog-only refresh                                                 #
+    # ------------------------------------------------------------------ #
+    
+    def read_catalog_state(self) -> CatalogState:
+        """Table metadata of the relations and the Column nodes currently in the graph"""
+        relation_rows = {label: self._read_rows(relation_state_query(label)) for label in RELATION_LABELS}
+        return CatalogState.from_rows(relation_rows, self._read_rows(COLUMN_STATE_QUERY))
+    
+    def refresh_catalog(self, manifest: Manifest, catalog_data: Dict[str, Any]) -> CatalogRefresh:
+        """Apply a new catalog to a graph already loaded from manifest, touching nothing else.
+        
+        Only the catalog-derived properties that differ from the graph are
+        written: the table_type, table_comment and owner of models, and the
+        types and comments of columns. Columns the catalog added are created and
+        catalog columns it dropped are deleted, unless column lineage links
+        them, in which case they are kept as SQL-only columns.
+        """
+        with self._profiled('catalog refresh') as profile:
+            logger.info(f"Starting {self.backend_name} catalog refresh")
+            self.worker_stats.clear()
+            with profile.phase('read'):
+                state = self.read_catalog_state()
+            with profile.phase('diff'):
+                refresh = self._plan_catalog_refresh(state, manifest, catalog_data)
+                self.node_labels = refresh.labels
+            logger.info(refresh.summary())
+            if not refresh:
+                logger.info("Nothing to update")
+                return refresh
+            
+            # The graph no longer matches the manifest and catalog of the last full load
+            self.clear_load_metadata()
+            delta = refresh.delta
+            with profile.phase('deletes'):
+                if delta.removed_nodes:
+                    self._write_batches(STALE_COLUMN_DELETE, sorted(delta.removed_nodes),
+                                        "stale catalog column deletion")
+                if delta.removed_edges:
+                    self._delete_edges(delta.removed_edges)
+            with profile.phase('nodes'):
+                for label, rows in delta.added_nodes.items():
+                    created = self._write_nodes(label, rows, merge=True)
+                    logger.info(f"Upserted {created} {label} nodes")
+                for label, rows in delta.updated_nodes.items():
+                    self._update_properties(label, rows)
+            if delta.added_edges:
+                with profile.phase('relationships'):
+                    count = self._write_edges(delta.added_edges, verb='MERGE')
+                logger.info(f"Merged {count} relationships")
+            self.log_worker_stats()
+            
+            logger.info("Catalog refresh completed")
+            return refresh
+    
+    def refresh_catalog_from_files(self, manifest_path: str, catalog_path: str) -> CatalogRefresh:
+        """Apply catalog.json to a graph already loaded from manifest.json (see refresh_catalog).
+        
+        The graph then holds what a full load of both files writes, so their
+        hash is recorded and an identical next load is skipped.
+        """
+        with self._profiled('catalog refresh') as profile:
+            with profile.phase('parse'):
+                catalog_data = read_json(catalog_path)
+                manifest = Manifest.from_file(manifest_path)
+            refresh = self.refresh_catalog(manifest, catalog_data)
+            self.record_load(self.fingerprint_files(manifest_path, catalog_path))
+            return refresh
+
+
+def _projected_writes(loader_class: type, options: Dict[str, Any], fresh: bool, manifest_path: str,
+                      catalog_path: Optional[str]) -> Iterator[Tuple]:
+    """_streamed_writes of an unconnected loader_class, for a pipeline stage run in a child process.
+    
+    fresh is set when the loader consuming the writes clears the graph first and
+    does not need them merged.
+    """
+    projector = loader_class.__new__(loader_class)
+    BaseDBTLoader.__init__(projector, **options)
+    projector._fresh_load = fresh
+    return projector._streamed_writes(manifest_path, catalog_path)
@@ -0,0 +1,230 @@
+"""Offline bulk-import files for initial loads.
+
+Online loads are bounded by transaction throughput however they are batched.
+For a first load of a large project it is much faster to write the graph as CSV
+files and hand them to the database's offline importer (``neo4j-admin database
+import`` or FalkorDB's ``falkordb-bulk-insert``). Node properties come from the
+same projections as the ``create_*`` methods, and relationships are the same
+set a full load writes.
+"""
+
+import json
+import logging
+from collections import defaultdict
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..manifest import Manifest
+from .base import BaseDBTLoader
+from .column_lineage import extract_column_lineage
+from .common import RefResolver, COLUMN_LABEL
+from .delta import manifest_edges
+from .lineage import Lineage
+from .falkordb_loader import DBTFalkorDBLoader
+
+logger = logging.getLogger(__name__)
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+class BulkExporter(BaseDBTLoader):
+    """Write a manifest as one CSV file per node label and per relationship type.
+
+    Subclasses set the header type names of the target importer and how array
+    values are encoded.
+    """
+
+    backend_name = 'bulk export'
+    # Header type per Python value type; anything else is written as a string
+    TYPE_NAMES: Dict[type, str] = {}
+    STRING_TYPE = 'string'
+
+    def __init__(self, output_dir: str, column_lineage: bool = False):
+        super().__init__(column_lineage=column_lineage)
+        self.output_dir = Path(output_dir)
+        # label -> (column, header type) of each exported node file, in file order
+        self.node_columns: Dict[str, List[Tuple[str, str]]] = {}
+        # Data rows of every file written
+        self.file_rows: Dict[Path, int] = {}
+
+    def _column_type(self, values: List[Any]) -> str:
+        types = {type(value) for value in values if value is not None}
+        if len(types) == 1:
+            return self.TYPE_NAMES.get(types.pop(), self.STRING_TYPE)
+        return self.STRING_TYPE
+
+    def _field(self, value: Any, column_type: str) -> str:
+        """One CSV field; a missing value is an empty unquoted field, so no property is set"""
+        if value is None:
+            return ''
+        if column_type == self.STRING_TYPE:
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value)
+            elif isinstance(value, bool):
+                value = 'true' if value else 'false'
+            return _quote(str(value))
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        return str(value)
+
+    def _node_header(self, label: str, columns: List[str], types: List[str]) -> List[str]:
+        raise NotImplementedError
+
+    def _edge_header(self) -> List[str]:
+        raise NotImplementedError
+
+    def _node_extra(self, label: str) -> List[str]:
+        """Fields appended to every node row"""
+        return []
+
+    def _write_csv(self, path: Path, header: List[str], rows):
+        count = 0
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(','.join(header) + '\n')
+            for row in rows:
+                f.write(','.join(row) + '\n')
+                count += 1
+        self.file_rows[path] = count
+
+    def _write_node_file(self, label: str, rows: List[Dict[str, Any]]) -> Path:
+        # unique_id first: both importers use the first column as the node ID
+        columns = ['unique_id']
+        seen = set(columns)
+        for row in rows:
+            for key in row:
+                if key not in seen:
+                    seen.add(key)
+                    columns.append(key)
+        types = [self._column_type([row.get(column) for row in rows]) for column in columns]
+        self.node_columns[label] = list(zip(columns, types))
+        extra = self._node_extra(label)
+
+        path = self.output_dir / f"{label}.csv"
+        self._write_csv(path, self._node_header(label, columns, types), (
+            [self._field(row.get(column), column_type) for column, column_type in zip(columns, types)] + extra
+            for row in rows
+        ))
+        logger.info(f"Exported {len(rows)} {label} nodes to {path}")
+        return path
+
+    def _edge_file_key(self, src: str, dst: str, rel_type: str) -> Any:
+        """Relationships sharing a key are written to the same file"""
+        return rel_type
+
+    def _write_edge_file(self, rel_type: str, pairs: List[Tuple[str, str]]) -> Path:
+        path = self.output_dir / f"{rel_type}.csv"
+        self._write_csv(path, self._edge_header(), ([_quote(src), _quote(dst)] for src, dst in pairs))
+        logger.info(f"Exported {len(pairs)} {rel_type} relationships to {path}")
+        return path
+
+    def export(self, manifest: Manifest, catalog_data: Optional[Dict[str, Any]] = None
+               ) -> Tuple[Dict[str, Path], Dict[str, Path]]:
+        """Write every node and relationship of a manifest; returns the node and relationship files"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        catalog_nodes = (catalog_data or {}).get('nodes', {})
+        self.node_labels = manifest.labels()
+        self.resolver = RefResolver(manifest)
+        lineage = Lineage(manifest.parent_map)
+
+        node_files = {}
+        for label, nodes in manifest.by_label.items():
+            if nodes:
+                rows = [self._prepare_row(lineage.with_depth(uid, self._project(label, uid, node, catalog_nodes)))
+                        for uid, node in nodes.items()]
+                node_files[label] = self._write_node_file(label, rows)
+
+        columns = self._project_columns(manifest, catalog_data or {})
+        edges = manifest_edges(manifest, self.resolver, lineage, columns.values())
+        if self.column_lineage:
+            column_lineage = extract_column_lineage(manifest, catalog_data, processes=self.parse_processes)
+            # Columns only seen in the SQL keep the bare properties lineage gives them
+            for uid, row in column_lineage.columns.items():
+                columns.setdefault(uid, row)
+            edges = chain(edges, column_lineage.edges)
+        if columns:
+            self.node_labels.update(dict.fromkeys(columns, COLUMN_LABEL))
+            node_files[COLUMN_LABEL] = self._write_node_file(
+                COLUMN_LABEL, [self._prepare_row(row) for row in columns.values()])
+
+        # Relationships are deduplicated as a set, like the MERGEs of a full load
+        by_key = defaultdict(list)
+        skipped = 0
+        for src, dst, rel_type in sorted(edges):
+            if src in self.node_labels and dst in self.node_labels:
+                by_key[self._edge_file_key(src, dst, rel_type)].append((src, dst))
+            else:
+                skipped += 1
+        if skipped:
+            logger.warning(f"Skipped {skipped} relationships whose endpoints are not loaded as nodes")
+        edge_files = {key: self._write_edge_file(key, pairs) for key, pairs in by_key.items()}
+
+        logger.info(self.resolver.summary())
+        return node_files, edge_files
+
+    def import_command(self, graph_name: str, node_files: Dict[str, Path], edge_files: Dict[str, Path]) -> str:
+        """Shell command that imports the exported files"""
+        raise NotImplementedError
+
+
+class Neo4jBulkExporter(BulkExporter):
+    """CSV files in the header format of ``neo4j-admin database import``"""
+
+    TYPE_NAMES = {bool: 'boolean', int: 'long', float: 'double', list: 'string[]'}
+    # neo4j-admin's default --array-delimiter
+    ARRAY_DELIMITER = ';'
+
+    def _field(self, value: Any, column_type: str) -> str:
+        if column_type == 'string[]' and value is not None:
+            return _quote(self.ARRAY_DELIMITER.join(str(item) for item in value))
+        return super()._field(value, column_type)
+
+    def _node_header(self, label: str, columns: List[str], types: List[str]) -> List[str]:
+        header = ['unique_id:ID'] + [f"{column}:{column_type}" for column, column_type in zip(columns[1:], types[1:])]
+        return header + [':LABEL']
+
+    def _node_extra(self, label: str) -> List[str]:
+        return [label]
+
+    def _edge_header(self) -> List[str]:
+        return [':START_ID', ':END_ID']
+
+    def import_command(self, graph_name: str, node_files: Dict[str, Path], edge_files: Dict[str, Path]) -> str:
+        args = [f"--nodes={path}" for path in node_files.values()]
+        args += [f"--relationships={rel_type}={path}" for rel_type, path in edge_files.items()]
+        return ' '.join(['neo4j-admin database import full', *args,
+                         '--multiline-fields=true', '--overwrite-destination', graph_name])
+
+
+class FalkorDBBulkExporter(BulkExporter):
+    """CSV files for ``falkordb-bulk-insert --enforce-schema``.
+
+    Values are converted exactly as by the online FalkorDB loader.
+    """
+
+    TYPE_NAMES = {bool: 'BOOLEAN', int: 'INT', float: 'DOUBLE'}
+    STRING_TYPE = 'STRING'
+
+    _param_value = DBTFalkorDBLoader._param_value
+    _clean_properties = DBTFalkorDBLoader._clean_properties
+    _prepare_row = DBTFalkorDBLoader._prepare_row
+    _tags = DBTFalkorDBLoader._tags
+
+    def _node_header(self, label: str, columns: List[str], types: List[str]) -> List[str]:
+        return ['unique_id:ID'] + [f"{column}:{column_type}" for column, column_type in zip(columns[1:], types[1:])]
+
+    def _edge_header(self) -> List[str]:
+        return [':START_ID', ':END_ID']
+
+    def import_command(self, graph_name: str, node_files: Dict[str, Path], edge_files: Dict[str, Path]) -> str:
+        # Labels and relationship types are taken from the file names
+        args = [f"-n {path}" for path in node_files.values()] + [f"-r {path}" for path in edge_files.values()]
+        return ' '.join(['falkordb-bulk-insert', graph_name, '--enforce-schema', *args])
+
+
+BULK_EXPORTERS = {
+    'neo4j': Neo4jBulkExporter,
+    'falkordb': FalkorDBBulkExporter,
+}
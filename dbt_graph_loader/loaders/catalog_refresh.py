@@ -0,0 +1,139 @@
+"""Catalog-only refresh of an already loaded graph.
+
+catalog.json is regenerated by every ``dbt docs generate``, far more often than
+the manifest changes. A refresh reads back the catalog-derived state of the
+graph (the table metadata of models and the Column nodes), projects the new
+catalog exactly as a full load would, and diffs the two, so only the
+properties, columns and HAS_COLUMN relationships that changed are written and
+the rest of the graph is not touched.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+from .column_lineage import DERIVED_FROM
+from .common import COLUMN_LABEL, has_column_edges
+from .delta import GraphDelta, ProjectedNodes, compute_delta
+
+# Model properties taken from the table metadata of the catalog
+MODEL_CATALOG_PROPERTIES = ('table_type', 'table_comment', 'owner')
+RELATION_STATE_PROPERTIES = ('unique_id',) + MODEL_CATALOG_PROPERTIES
+COLUMN_STATE_PROPERTIES = ('unique_id', 'parent_id', 'name', 'description', 'data_type', 'comment', 'index')
+# Properties of a column found in model SQL alone, as column lineage writes it
+SQL_ONLY_COLUMN_PROPERTIES = ('unique_id', 'name', 'parent_id')
+
+# Column properties, followed by the number of DERIVED_FROM relationships of the column
+COLUMN_STATE_QUERY = (f"MATCH (c:{COLUMN_LABEL}) OPTIONAL MATCH (c)-[d:{DERIVED_FROM}]-() RETURN "
+                      + ', '.join(f"c.{name}" for name in COLUMN_STATE_PROPERTIES) + ", count(d)")
+
+# Catalog columns the warehouse no longer has and that no column lineage links
+STALE_COLUMN_DELETE = f"UNWIND $rows AS uid MATCH (c:{COLUMN_LABEL} {{unique_id: uid}}) DETACH DELETE c"
+
+
+def relation_state_query(label: str) -> str:
+    """Catalog-derived properties of every node of a relation label, one row per node"""
+    return f"MATCH (n:{label}) RETURN " + ', '.join(f"n.{name}" for name in RELATION_STATE_PROPERTIES)
+
+
+def _present(names: Tuple[str, ...], row: Iterable[Any]) -> Dict[str, Any]:
+    return {name: value for name, value in zip(names, row) if value is not None}
+
+
+class CatalogState:
+    """Catalog-derived properties of the relations and columns of a graph"""
+
+    def __init__(self, relations: ProjectedNodes = None, columns: Dict[str, Dict[str, Any]] = None,
+                 derived: Optional[Set[str]] = None):
+        # unique_id -> (label, unique_id and catalog-derived properties) of models, sources, seeds and snapshots
+        self.relations: ProjectedNodes = relations or {}
+        # unique_id -> Column node properties
+        self.columns: Dict[str, Dict[str, Any]] = columns or {}
+        # unique_ids of the columns column lineage links to other columns
+        self.derived: Set[str] = derived or set()
+
+    @classmethod
+    def from_rows(cls, relation_rows: Dict[str, List[List[Any]]], column_rows: List[List[Any]]) -> 'CatalogState':
+        """State read back from the graph by relation_state_query and COLUMN_STATE_QUERY"""
+        state = cls()
+        for label, rows in relation_rows.items():
+            for row in rows:
+                properties = _present(RELATION_STATE_PROPERTIES, row)
+                state.relations[properties['unique_id']] = (label, properties)
+        for row in column_rows:
+            properties = _present(COLUMN_STATE_PROPERTIES, row)
+            state.columns[properties['unique_id']] = properties
+            if row[len(COLUMN_STATE_PROPERTIES)]:
+                state.derived.add(properties['unique_id'])
+        return state
+
+    def catalog(self) -> Dict[str, Any]:
+        """The catalog as far as the graph stores it: table metadata and catalog columns in catalog order"""
+        catalog = {'nodes': {}, 'sources': {}}
+        for uid, (label, properties) in self.relations.items():
+            metadata = {key: properties[name] for key, name in zip(('type', 'comment', 'owner'),
+                                                                  MODEL_CATALOG_PROPERTIES) if name in properties}
+            if metadata:
+                catalog['nodes'][uid] = {'metadata': metadata, 'columns': {}}
+        columns = sorted((column for column in self.columns.values() if column.get('index') is not None),
+                         key=lambda column: column['index'])
+        for column in columns:
+            relation = self.relations.get(column.get('parent_id'))
+            if relation is None:
+                continue
+            section = 'sources' if relation[0] == 'Source' else 'nodes'
+            entry = catalog[section].setdefault(column['parent_id'], {'metadata': {}, 'columns': {}})
+            entry['columns'][column['name']] = {'name': column['name'], 'type': column.get('data_type'),
+                                                'comment': column.get('comment'), 'index': column['index']}
+        return catalog
+
+
+class CatalogRefresh:
+    """Changes a new catalog makes to a graph, and the catalog before and after as the graph stores it"""
+
+    def __init__(self, delta: GraphDelta, previous: CatalogState, current: CatalogState):
+        self.delta = delta
+        self.previous = previous
+        self.current = current
+
+    @property
+    def labels(self) -> Dict[str, str]:
+        """unique_id -> label of every relation and column involved"""
+        labels = {uid: label for uid, (label, _) in self.previous.relations.items()}
+        labels.update(dict.fromkeys(self.previous.columns, COLUMN_LABEL))
+        labels.update(dict.fromkeys(self.current.columns, COLUMN_LABEL))
+        return labels
+
+    def summary(self) -> str:
+        return f"Catalog {self.delta.summary()}"
+
+    def __bool__(self):
+        return bool(self.delta)
+
+
+def plan_refresh(state: CatalogState, relations: ProjectedNodes,
+                 columns: Dict[str, Dict[str, Any]]) -> CatalogRefresh:
+    """Diff the graph's catalog-derived state against the projection of a new catalog.
+
+    relations holds the catalog-derived properties of every relation of the
+    manifest and columns its projected Column nodes. Only relations that are
+    already in the graph are updated; relations the manifest no longer has are
+    left as they are. Columns of the graph that did not come from the catalog
+    (SQL-only columns of column lineage) are never removed, and a catalog
+    column the catalog dropped but column lineage still links becomes a
+    SQL-only column, without its catalog properties and HAS_COLUMN
+    relationship, as a full load would write it.
+    """
+    new_relations = {uid: relations.get(uid, relation) for uid, relation in state.relations.items()}
+    new_columns = {uid: column for uid, column in columns.items() if column['parent_id'] in state.relations}
+    old_columns = {uid: column for uid, column in state.columns.items()
+                   if uid in new_columns or (column.get('index') is not None and column.get('parent_id') in relations)}
+    sql_only = {uid: {name: column[name] for name in SQL_ONLY_COLUMN_PROPERTIES if name in column}
+                for uid, column in old_columns.items() if uid not in new_columns and uid in state.derived}
+
+    old_nodes = dict(state.relations)
+    old_nodes.update((uid, (COLUMN_LABEL, column)) for uid, column in old_columns.items())
+    new_nodes = dict(new_relations)
+    new_nodes.update((uid, (COLUMN_LABEL, column)) for uid, column in new_columns.items())
+    new_nodes.update((uid, (COLUMN_LABEL, column)) for uid, column in sql_only.items())
+    delta = compute_delta(old_nodes, new_nodes,
+                          set(has_column_edges(old_columns.values())), set(has_column_edges(new_columns.values())))
+    return CatalogRefresh(delta, state, CatalogState(new_relations, {**new_columns, **sql_only}, state.derived))
@@ -0,0 +1,292 @@
+"""Column-level lineage parsed from compiled model SQL.
+
+Each model's ``compiled_code`` is parsed with sqlglot, its columns are
+qualified against the catalog (or the documented manifest columns), and every
+output column is traced through CTEs, subqueries and set operations down to
+the table columns it reads. The result is written as ``Column`` nodes linked
+by ``(column)-[:DERIVED_FROM]->(upstream column)`` relationships.
+
+Parsing is CPU bound and independent per model, so it runs in a process pool:
+the schema is sent to every worker once, and each task is a single model's
+SQL. Tracing walks sqlglot's scope tree directly, sharing the traced sources
+of each CTE/subquery column between all the columns that read it, which is
+much faster than resolving every output column with ``sqlglot.lineage``.
+"""
+
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+from ..manifest import Manifest, ManifestNode
+from .common import Edge, COLUMN_LABEL, RELATION_LABELS, column_id
+
+try:
+    import sqlglot
+    from sqlglot import exp
+    from sqlglot.dialects.dialect import Dialect
+    from sqlglot.optimizer.qualify import qualify
+    from sqlglot.optimizer.scope import Scope, build_scope
+    from sqlglot.schema import MappingSchema
+except ImportError:  # pragma: no cover - optional load stage
+    sqlglot = None
+
+logger = logging.getLogger(__name__)
+
+DERIVED_FROM = 'DERIVED_FROM'
+
+# dbt adapter types whose sqlglot dialect has a different name
+ADAPTER_DIALECTS = {
+    'sqlserver': 'tsql',
+    'synapse': 'tsql',
+    'fabric': 'tsql',
+}
+
+# (catalog, schema, table, column) of a column read by a model
+TableColumn = Tuple[str, str, str, str]
+# output column -> table columns it is derived from
+ModelColumns = Dict[str, List[TableColumn]]
+
+# Set in every parse worker by _init_worker
+_schema = None
+_dialect = None
+
+
+def dialect_for(manifest: Manifest) -> Optional[str]:
+    """sqlglot dialect of the manifest's adapter; None (generic SQL) when sqlglot has no such dialect"""
+    adapter_type = manifest.metadata.get('adapter_type')
+    if not adapter_type:
+        return None
+    dialect = ADAPTER_DIALECTS.get(adapter_type, adapter_type)
+    try:
+        Dialect.get_or_raise(dialect)
+    except ValueError:
+        logger.warning(f"No SQL dialect for adapter {adapter_type}; parsing models as generic SQL")
+        return None
+    return dialect
+
+
+def _relation_name(node: ManifestNode) -> str:
+    if node.resource_type == 'source':
+        return node.identifier or node.name
+    return node.alias or node.name
+
+
+def _relation_key(database: Optional[str], schema: Optional[str], name: Optional[str]) -> Tuple[str, str, str]:
+    return (database or '').lower(), (schema or '').lower(), (name or '').lower()
+
+
+def build_schema(manifest: Manifest, catalog_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """{database: {schema: {table: {column: type}}}} of every relation with known columns.
+
+    Catalog columns are used where available; relations missing from the
+    catalog fall back to the columns documented in the manifest.
+    """
+    schema = {}
+    known = set()
+
+    def add(database: str, schema_name: str, table: str, columns: Iterable[str]):
+        # Column types do not affect lineage, so they are not parsed
+        schema.setdefault(database or '', {}).setdefault(schema_name or '', {})[table] = {
+            column: 'TEXT' for column in columns
+        }
+        known.add(_relation_key(database, schema_name, table))
+
+    for section in ('nodes', 'sources'):
+        for entry in (catalog_data or {}).get(section, {}).values():
+            metadata = entry.get('metadata', {})
+            columns = entry.get('columns') or {}
+            if metadata.get('name') and columns:
+                add(metadata.get('database'), metadata.get('schema'), metadata['name'],
+                    (column.get('name', name) for name, column in columns.items()))
+
+    for label in RELATION_LABELS:
+        for node in manifest.by_label[label].values():
+            table = _relation_name(node)
+            if node.columns and table and _relation_key(node.database, node.schema, table) not in known:
+                add(node.database, node.schema, table,
+                    (column.get('name', name) for name, column in node.columns.items()))
+    return schema
+
+
+class _Relations:
+    """Resolve the tables a model reads to the unique_ids of the nodes they were built from"""
+
+    def __init__(self, manifest: Manifest):
+        self.full: Dict[Tuple[str, str, str], str] = {}
+        # Tables referenced without their database or schema
+        self.by_schema = defaultdict(set)
+        self.by_name = defaultdict(set)
+        for label in RELATION_LABELS:
+            for uid, node in manifest.by_label[label].items():
+                key = _relation_key(node.database, node.schema, _relation_name(node))
+                self.full[key] = uid
+                self.by_schema[key[1:]].add(uid)
+                self.by_name[key[2]].add(uid)
+
+    def resolve(self, catalog: str, db: str, table: str) -> Optional[str]:
+        key = _relation_key(catalog, db, table)
+        if catalog:
+            return self.full.get(key)
+        candidates = self.by_schema.get(key[1:]) if db else self.by_name.get(key[2])
+        if candidates and len(candidates) == 1:
+            return next(iter(candidates))
+        return None
+
+
+def _branches(scope) -> list:
+    # sqlglot renamed union_scopes to set_operation_scopes
+    return getattr(scope, 'set_operation_scopes', None) or getattr(scope, 'union_scopes', None) or []
+
+
+def _branch_selects(scope) -> list:
+    """Output expressions of a scope; a set operation takes its column names from the first branch"""
+    while _branches(scope):
+        scope = _branches(scope)[0]
+    return scope.expression.selects
+
+
+def _sources_of(scope, position: int, memo: Dict[Tuple[int, int], Set[TableColumn]]) -> Set[TableColumn]:
+    """Table columns the output column at position of scope is derived from"""
+    key = (id(scope), position)
+    if key in memo:
+        return memo[key]
+    # Guards against recursive CTEs referring back to themselves
+    memo[key] = set()
+    result = set()
+    if _branches(scope):
+        for branch in _branches(scope):
+            result |= _sources_of(branch, position, memo)
+    else:
+        selects = scope.expression.selects
+        if position < len(selects):
+            for column in selects[position].find_all(exp.Column):
+                source = scope.sources.get(column.table)
+                if source is None and not column.table and len(scope.sources) == 1:
+                    source = next(iter(scope.sources.values()))
+                if isinstance(source, exp.Table):
+                    result.add((source.catalog, source.db, source.name, column.name))
+                elif isinstance(source, Scope):
+                    names = [select.alias_or_name for select in _branch_selects(source)]
+                    if column.name in names:
+                        result |= _sources_of(source, names.index(column.name), memo)
+    memo[key] = result
+    return result
+
+
+def _init_worker(schema: Dict[str, Any], dialect: Optional[str]):
+    global _schema, _dialect
+    _schema = MappingSchema(schema, dialect=dialect)
+    _dialect = dialect
+
+
+def _parse_model(task: Tuple[str, str]) -> Tuple[str, Optional[ModelColumns], Optional[str]]:
+    """Trace the output columns of one model; returns (unique_id, columns, error)"""
+    unique_id, sql = task
+    try:
+        # A catalog older than the models must not abort tracing the columns it does know
+        expression = qualify(sqlglot.parse_one(sql, read=_dialect), schema=_schema, dialect=_dialect,
+                             validate_qualify_columns=False, allow_partial_qualification=True)
+        root = build_scope(expression)
+        if root is None:
+            return unique_id, {}, None
+        memo = {}
+        return unique_id, {
+            select.alias_or_name: sorted(_sources_of(root, position, memo))
+            for position, select in enumerate(_branch_selects(root))
+        }, None
+    except Exception as e:
+        return unique_id, None, f"{type(e).__name__}: {e}"
+
+
+def parse_models(tasks: List[Tuple[str, str]], schema: Dict[str, Any], dialect: Optional[str],
+                 processes: Optional[int] = None) -> List[Tuple[str, Optional[ModelColumns], Optional[str]]]:
+    """Parse (unique_id, sql) tasks, spread over processes worker processes (default: one per core)"""
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1 or len(tasks) <= 1:
+        _init_worker(schema, dialect)
+        return [_parse_model(task) for task in tasks]
+    # A few chunks per worker keeps them evenly loaded without a round trip per model
+    chunksize = max(1, len(tasks) // (processes * 4))
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(schema, dialect)) as pool:
+        return list(pool.map(_parse_model, tasks, chunksize=chunksize))
+
+
+class ColumnLineage:
+    """Column nodes and DERIVED_FROM relationships of the parsed models"""
+
+    def __init__(self):
+        # unique_id -> node properties
+        self.columns: Dict[str, Dict[str, Any]] = {}
+        self.edges: Set[Edge] = set()
+        # unique_ids of the models parsed, and the error of each model that was not
+        self.parsed: List[str] = []
+        self.failed: Dict[str, str] = {}
+        # Upstream columns of tables that are not part of the manifest
+        self.unresolved = 0
+
+    def add_column(self, parent_id: str, name: str) -> str:
+        uid = column_id(parent_id, name)
+        if uid not in self.columns:
+            self.columns[uid] = {'unique_id': uid, 'name': name, 'parent_id': parent_id}
+        return uid
+
+    def labels(self) -> Dict[str, str]:
+        """unique_id -> label of every column, for grouping the relationships"""
+        return dict.fromkeys(self.columns, COLUMN_LABEL)
+
+    def model_columns(self) -> Dict[str, List[str]]:
+        """Output column unique_ids of every parsed model"""
+        columns = {uid: [] for uid in self.parsed}
+        for uid, properties in self.columns.items():
+            if properties['parent_id'] in columns:
+                columns[properties['parent_id']].append(uid)
+        return columns
+
+    def summary(self) -> str:
+        return (f"Column lineage: {len(self.parsed)} models parsed, {len(self.failed)} failed, "
+                f"{len(self.columns)} columns, {len(self.edges)} DERIVED_FROM relationships, "
+                f"{self.unresolved} upstream columns outside the project")
+
+
+def extract_column_lineage(manifest: Manifest, catalog_data: Optional[Dict[str, Any]] = None,
+                           model_ids: Optional[Iterable[str]] = None,
+                           processes: Optional[int] = None) -> ColumnLineage:
+    """Parse the compiled SQL of the manifest's models (or only model_ids) into column lineage.
+
+    The manifest must have been parsed with ``keep_code=True``.
+    """
+    if sqlglot is None:
+        raise ImportError("Column lineage needs the sqlglot package: pip install 'dbt-graph-loader[lineage]'")
+    models = manifest.by_label['Model']
+    if model_ids is not None:
+        models = {uid: models[uid] for uid in model_ids if uid in models}
+    tasks = [(uid, node.compiled_code) for uid, node in models.items()
+             if node.compiled_code and node.language == 'sql']
+    if models and not tasks:
+        logger.warning("No compiled SQL in the manifest; run dbt compile to get column lineage")
+
+    start = time.perf_counter()
+    results = parse_models(tasks, build_schema(manifest, catalog_data), dialect_for(manifest), processes)
+    relations = _Relations(manifest)
+    lineage = ColumnLineage()
+    for uid, outputs, error in results:
+        if outputs is None:
+            lineage.failed[uid] = error
+            logger.warning(f"Could not parse {uid}: {error}")
+            continue
+        lineage.parsed.append(uid)
+        for name, upstream in outputs.items():
+            if name == '*':
+                continue
+            column = lineage.add_column(uid, name)
+            for catalog, db, table, upstream_name in upstream:
+                parent_id = relations.resolve(catalog, db, table)
+                if parent_id is None or upstream_name == '*':
+                    lineage.unresolved += 1
+                    continue
+                lineage.edges.add((column, lineage.add_column(parent_id, upstream_name), DERIVED_FROM))
+    logger.info(f"{lineage.summary()} in {time.perf_counter() - start:.1f}s")
+    return lineage
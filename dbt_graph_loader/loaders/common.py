@@ -0,0 +1,238 @@
+"""Backend-independent helpers shared by the graph loaders."""
+
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple
+
+from ..manifest import REFABLE_RESOURCE_TYPES, RESOURCE_LABELS, Manifest, ManifestNode
+
+# (child unique_id, parent unique_id, relationship type)
+Edge = Tuple[str, str, str]
+EdgeGroupKey = Tuple[str, str, str]
+
+# Label of the columns of models, sources, seeds and snapshots
+COLUMN_LABEL = 'Column'
+
+# Labels of the nodes that are tables or views, and so have columns
+RELATION_LABELS = ('Model', 'Source', 'Seed', 'Snapshot')
+
+# Label of the single node recording the content hash of the last load
+LOAD_METADATA_LABEL = 'LoadMetadata'
+
+# Label of the single node journaling the progress of a resumable load
+LOAD_PROGRESS_LABEL = 'LoadProgress'
+
+# Labels written by a load; clearing only these leaves other data in a shared database alone
+DBT_LABELS = list(RESOURCE_LABELS.values()) + [COLUMN_LABEL, LOAD_METADATA_LABEL, LOAD_PROGRESS_LABEL]
+
+LOAD_METADATA_QUERY = f"MATCH (m:{LOAD_METADATA_LABEL}) RETURN properties(m) AS metadata LIMIT 1"
+# Sent through the batch writers with one row: the metadata, or an empty row to delete it
+LOAD_METADATA_WRITE = f"UNWIND $rows AS row MERGE (m:{LOAD_METADATA_LABEL}) SET m = row"
+LOAD_METADATA_DELETE = f"UNWIND $rows AS row MATCH (m:{LOAD_METADATA_LABEL}) DELETE m"
+
+LOAD_PROGRESS_QUERY = f"MATCH (p:{LOAD_PROGRESS_LABEL}) RETURN properties(p) AS progress LIMIT 1"
+LOAD_PROGRESS_WRITE = f"UNWIND $rows AS row MERGE (p:{LOAD_PROGRESS_LABEL}) SET p = row"
+LOAD_PROGRESS_DELETE = f"UNWIND $rows AS row MATCH (p:{LOAD_PROGRESS_LABEL}) DELETE p"
+
+# Relationships or nodes deleted per transaction when clearing the graph
+CLEAR_BATCH_SIZE = 10000
+
+
+def column_id(parent_id: str, name: str) -> str:
+    """unique_id of the column name of the model, source, seed or snapshot parent_id"""
+    return f"{parent_id}.{name.lower()}"
+
+
+def has_column_edges(columns: Iterable[Dict[str, Any]]) -> Iterator[Edge]:
+    """HAS_COLUMN edges from each column's parent to the column."""
+    for column in columns:
+        yield column['parent_id'], column['unique_id'], 'HAS_COLUMN'
+
+
+def dependency_edges(parent_map: Dict[str, List[str]]) -> Iterator[Edge]:
+    """DEPENDS_ON edges from the manifest parent_map."""
+    for child, parents in parent_map.items():
+        for parent in parents:
+            yield child, parent, 'DEPENDS_ON'
+
+
+def macro_edges(nodes: Dict[str, ManifestNode]) -> Iterator[Edge]:
+    """USES_MACRO edges from each node's depends_on.macros."""
+    for node_id, node in nodes.items():
+        for macro_id in node.depends_on_macros:
+            yield node_id, macro_id, 'USES_MACRO'
+
+
+def test_edges(tests: Dict[str, ManifestNode]) -> Iterator[Edge]:
+    """TESTS edges linking tests to the node they are attached to."""
+    for test_id, test in tests.items():
+        if test.attached_node:
+            yield test_id, test.attached_node, 'TESTS'
+
+
+def group_edges(edges: Iterable[Edge], labels: Dict[str, str]) -> Tuple[Dict[EdgeGroupKey, List[Dict[str, str]]], int]:
+    """Group edges by (source label, target label, relationship type).
+
+    Each group can then be written with a single label-qualified, index-backed
+    UNWIND query. Returns the groups and the number of edges skipped because
+    one of their endpoints is not loaded as a node.
+    """
+    groups = defaultdict(list)
+    skipped = 0
+    for src, dst, rel_type in edges:
+        src_label = labels.get(src)
+        dst_label = labels.get(dst)
+        if src_label is None or dst_label is None:
+            skipped += 1
+            continue
+        groups[(src_label, dst_label, rel_type)].append({'src': src, 'dst': dst})
+    return dict(groups), skipped
+
+
+def edge_query(src_label: str, dst_label: str, rel_type: str, verb: str = 'MERGE') -> str:
+    """UNWIND query writing one edge group; both endpoints are matched through their label index."""
+    return f"""
+        UNWIND $rows AS row
+        MATCH (src:{src_label} {{unique_id: row.src}})
+        MATCH (dst:{dst_label} {{unique_id: row.dst}})
+        {verb} (src)-[:{rel_type}]->(dst)
+    """
+
+
+def edge_delete_query(src_label: str, dst_label: str, rel_type: str) -> str:
+    """UNWIND query deleting one edge group between label-matched endpoints."""
+    return f"""
+        UNWIND $rows AS row
+        MATCH (src:{src_label} {{unique_id: row.src}})-[r:{rel_type}]->(dst:{dst_label} {{unique_id: row.dst}})
+        DELETE r
+    """
+
+
+def property_update_query(label: str) -> str:
+    """UNWIND query setting only the given properties of nodes; a null value removes the property."""
+    return f"""
+        UNWIND $rows AS row
+        MATCH (n:{label} {{unique_id: row.unique_id}})
+        SET n += row.props
+    """
+
+
+def clear_queries(labels: Optional[List[str]], limit: int) -> List[Tuple[str, str]]:
+    """(description, query) pairs that clear the graph, or only the given labels, in bounded transactions.
+
+    Each query deletes at most ``limit`` items and returns how many it deleted,
+    so it is repeated until it deletes fewer. Relationships are removed before
+    nodes so no single delete has to drop a node's whole fan-out.
+    """
+    if labels is None:
+        return [
+            ('relationships', f"MATCH ()-[r]->() WITH r LIMIT {limit} DELETE r RETURN count(r) AS deleted"),
+            ('nodes', f"MATCH (n) WITH n LIMIT {limit} DELETE n RETURN count(n) AS deleted"),
+        ]
+    queries = []
+    for label in labels:
+        queries.append((f"{label} relationships",
+                        f"MATCH (:{label})-[r]-() WITH DISTINCT r LIMIT {limit} DELETE r RETURN count(r) AS deleted"))
+        queries.append((f"{label} nodes",
+                        f"MATCH (n:{label}) WITH n LIMIT {limit} DELETE n RETURN count(n) AS deleted"))
+    return queries
+
+
+def _parse_ref(ref) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Return (name, package, version) for any manifest ref format."""
+    if isinstance(ref, dict):
+        version = ref.get('version')
+        return ref.get('name'), ref.get('package'), str(version) if version is not None else None
+    if isinstance(ref, (list, tuple)):
+        # Pre-1.5 manifests: [name] or [package, name]
+        if len(ref) == 1:
+            return ref[0], None, None
+        if len(ref) >= 2:
+            return ref[1], ref[0], None
+        return None, None, None
+    return ref, None, None
+
+
+class RefResolver:
+    """Resolve ref() and source() calls to unique_ids before any edge is written.
+
+    Name indexes are built once per manifest. Each call is narrowed by package,
+    version and finally by the node's own ``depends_on.nodes`` (which dbt has
+    already resolved), so same-named models in other packages are not linked.
+    Outcomes are counted per kind in ``stats`` as resolved / ambiguous / dangling.
+    """
+
+    def __init__(self, manifest: Optional[Manifest] = None):
+        # name -> [(unique_id, package_name, version)]
+        self.ref_index = defaultdict(list)
+        # (source_name, table name) -> [unique_id]
+        self.source_index = defaultdict(list)
+        self.stats = {'refs': Counter(), 'sources': Counter()}
+
+        if manifest is not None:
+            for node in manifest.nodes.values():
+                self.add_node(node)
+            for source in manifest.sources.values():
+                self.add_source(source)
+
+    def add_node(self, node: ManifestNode):
+        """Index a manifest node if ref() can point at it"""
+        if node.resource_type in REFABLE_RESOURCE_TYPES:
+            self.ref_index[node.name].append((node.unique_id, node.package_name, node.version))
+
+    def add_source(self, source: ManifestNode):
+        """Index a manifest source for source() lookups"""
+        self.source_index[(source.source_name, source.name)].append(source.unique_id)
+
+    def _pick(self, kind: str, candidates: List[str], depends_on: set) -> Optional[str]:
+        """Choose the single candidate for one call, recording the outcome."""
+        if len(candidates) > 1:
+            candidates = [c for c in candidates if c in depends_on] or candidates
+        if not candidates:
+            self.stats[kind]['dangling'] += 1
+            return None
+        if len(candidates) > 1:
+            self.stats[kind]['ambiguous'] += 1
+            return None
+        self.stats[kind]['resolved'] += 1
+        return candidates[0]
+
+    def ref_edges(self, nodes: Dict[str, ManifestNode]) -> Iterator[Edge]:
+        """REFERENCES edges for every ref() that resolves to exactly one node."""
+        for node_id, node in nodes.items():
+            depends_on = set(node.depends_on_nodes)
+            targets = set()
+            for ref in node.refs:
+                name, package, version = _parse_ref(ref)
+                if not name:
+                    continue
+                candidates = [
+                    uid for uid, pkg, ver in self.ref_index.get(name, [])
+                    if (package is None or pkg == package) and (version is None or ver == version)
+                ]
+                target = self._pick('refs', candidates, depends_on)
+                # A model may ref() the same node several times
+                if target and target not in targets:
+                    targets.add(target)
+                    yield node_id, target, 'REFERENCES'
+
+    def source_edges(self, nodes: Dict[str, ManifestNode]) -> Iterator[Edge]:
+        """DEPENDS_ON edges for every source() that resolves to exactly one source."""
+        for node_id, node in nodes.items():
+            depends_on = set(node.depends_on_nodes)
+            targets = set()
+            for source in node.sources:
+                if len(source) < 2:
+                    continue
+                candidates = list(self.source_index.get((source[0], source[1]), []))
+                target = self._pick('sources', candidates, depends_on)
+                if target and target not in targets:
+                    targets.add(target)
+                    yield node_id, target, 'DEPENDS_ON'
+
+    def summary(self) -> str:
+        """One-line report of the resolution outcomes so far."""
+        parts = []
+        for kind, counts in self.stats.items():
+            parts.append(f"{kind}: {counts['resolved']} resolved, "
+                         f"{counts['ambiguous']} ambiguous, {counts['dangling']} dangling")
+        return "Resolution stats - " + "; ".join(parts)
@@ -0,0 +1,87 @@
+"""Minimal graph changes between two manifests.
+
+Incremental updates compare what would actually be written to the graph, the
+projected property map of every node and the full set of relationships, rather
+than dbt checksums. Config-only changes (tags, materialization, descriptions)
+are therefore picked up, and unchanged properties and edges are never rewritten.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+from ..manifest import Manifest
+from .common import Edge, RefResolver, dependency_edges, macro_edges, test_edges, has_column_edges
+from .lineage import Lineage
+
+# unique_id -> (label, projected properties)
+ProjectedNodes = Dict[str, Tuple[str, Dict[str, Any]]]
+
+
+def manifest_edges(manifest: Manifest, resolver: RefResolver, lineage: Optional[Lineage] = None,
+                   columns: Iterable[Dict[str, Any]] = ()) -> Set[Edge]:
+    """Every relationship a full load of the manifest would write, lineage closure and HAS_COLUMN of columns included"""
+    edges = set(has_column_edges(columns))
+    edges.update(dependency_edges(manifest.parent_map))
+    edges.update(resolver.ref_edges(manifest.nodes))
+    edges.update(resolver.source_edges(manifest.nodes))
+    edges.update(macro_edges(manifest.nodes))
+    edges.update(test_edges(manifest.by_label['Test']))
+    edges.update((lineage or Lineage(manifest.parent_map)).ancestor_edges(manifest.labels()))
+    return edges
+
+
+class GraphDelta:
+    """Node and relationship operations that turn the old graph into the new one"""
+
+    def __init__(self):
+        # unique_id -> label of nodes to delete (with their relationships)
+        self.removed_nodes: Dict[str, str] = {}
+        # label -> full property maps of nodes to create
+        self.added_nodes: Dict[str, List[Dict[str, Any]]] = {}
+        # label -> [{'unique_id', 'props'}]; a None value removes the property
+        self.updated_nodes: Dict[str, List[Dict[str, Any]]] = {}
+        self.added_edges: Set[Edge] = set()
+        self.removed_edges: Set[Edge] = set()
+
+    @property
+    def changed_properties(self) -> int:
+        return sum(len(row['props']) for rows in self.updated_nodes.values() for row in rows)
+
+    def summary(self) -> str:
+        return (f"Delta: {len(self.removed_nodes)} nodes removed, "
+                f"{sum(map(len, self.added_nodes.values()))} added, "
+                f"{sum(map(len, self.updated_nodes.values()))} updated ({self.changed_properties} properties); "
+                f"{len(self.added_edges)} relationships added, {len(self.removed_edges)} removed")
+
+    def __bool__(self):
+        return bool(self.removed_nodes or self.added_nodes or self.updated_nodes
+                    or self.added_edges or self.removed_edges)
+
+
+def compute_delta(old_nodes: ProjectedNodes, new_nodes: ProjectedNodes,
+                  old_edges: Set[Edge], new_edges: Set[Edge]) -> GraphDelta:
+    """Diff projected nodes property by property and relationships as sets"""
+    delta = GraphDelta()
+
+    for uid, (label, old_props) in old_nodes.items():
+        if uid not in new_nodes:
+            delta.removed_nodes[uid] = label
+
+    for uid, (label, props) in new_nodes.items():
+        old = old_nodes.get(uid)
+        if old is None:
+            delta.added_nodes.setdefault(label, []).append(props)
+            continue
+        old_props = old[1]
+        changes = {key: value for key, value in props.items() if old_props.get(key) != value}
+        for key in old_props.keys() - props.keys():
+            changes[key] = None
+        if changes:
+            delta.updated_nodes.setdefault(label, []).append({'unique_id': uid, 'props': changes})
+
+    # Edges of deleted nodes go with them, and edges whose endpoints are not
+    # loaded as nodes are never written
+    for src, dst, rel_type in old_edges - new_edges:
+        if src in new_nodes and dst in new_nodes and src in old_nodes and dst in old_nodes:
+            delta.removed_edges.add((src, dst, rel_type))
+    delta.added_edges = {edge for edge in new_edges - old_edges if edge[0] in new_nodes and edge[1] in new_nodes}
+    return delta
@@ -1,50 +1,123 @@
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Callable
 from falkordb import FalkorDB
 from pathlib import Path
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+from ..manifest import Manifest, loads, read_json
+from .catalog_refresh import CatalogRefresh
+from .base import BaseDBTLoader, DEFAULT_BATCH_SIZE
+from .delta import GraphDelta
+from .profiling import LoadProfile
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class DBTFalkorDBLoader:
+# unique_id indexes backing node merges and the MATCH lookups of relationship writes
+FALKORDB_INDEXES = [
+    "CREATE INDEX FOR (m:Model) ON (m.unique_id)",
+    "CREATE INDEX FOR (s:Source) ON (s.unique_id)",
+    "CREATE INDEX FOR (t:Test) ON (t.unique_id)",
+    "CREATE INDEX FOR (mac:Macro) ON (mac.unique_id)",
+    "CREATE INDEX FOR (o:Operation) ON (o.unique_id)",
+    "CREATE INDEX FOR (seed:Seed) ON (seed.unique_id)",
+    "CREATE INDEX FOR (snap:Snapshot) ON (snap.unique_id)",
+    "CREATE INDEX FOR (c:Column) ON (c.unique_id)",
+    # Columns are looked up by the node they belong to when a model is re-parsed
+    "CREATE INDEX FOR (c:Column) ON (c.parent_id)",
+    # Columns are searched by name across models, exactly or by words of their description
+    "CREATE INDEX FOR (c:Column) ON (c.name)",
+    "CREATE FULLTEXT INDEX FOR (c:Column) ON (c.name, c.description)",
+]
+
+# Errors of a lost connection or a timed-out query, after which a batch is sent again
+TRANSIENT_ERRORS = (RedisConnectionError, RedisTimeoutError, ConnectionError, TimeoutError)
+
+# A blue/green load writes one of these slots of the graph, e.g. dbt_graph__blue
+BLUE_GREEN_SLOTS = ('blue', 'green')
+
+
+def active_graph_key(graph_name: str) -> str:
+    """Redis key naming the slot that readers of graph_name should query"""
+    return f"{graph_name}__active"
+
+
+def _decode(value) -> Optional[str]:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def resolve_graph_name(db: FalkorDB, graph_name: str) -> str:
+    """Graph that readers should query: the promoted blue/green slot, or graph_name itself"""
+    return _decode(db.connection.get(active_graph_key(graph_name))) or graph_name
+
+
+def staging_graph_name(graph_name: str, live_graph: str) -> str:
+    """The blue/green slot of graph_name that readers are not using"""
+    blue, green = (f"{graph_name}__{slot}" for slot in BLUE_GREEN_SLOTS)
+    return green if live_graph == blue else blue
+
+
+class DBTFalkorDBLoader(BaseDBTLoader):
     """Load DBT manifest and catalog data into FalkorDB as a knowledge graph"""
     
+    backend_name = 'FalkorDB'
+    
     def __init__(self, host: str = 'falkordb', port: int = 6379, graph_name: str = 'dbt_graph',
-                 username: str = None, password: str = None):
-        """Initialize FalkorDB connection"""
-        self.db = FalkorDB(host=host, port=port, username=username,
-                           password=password)
+                 username: str = None, password: str = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 workers: int = 1, dbt_labels_only: bool = False, column_lineage: bool = False,
+                 parse_processes: Optional[int] = None, force: bool = False, pipeline: bool = False,
+                 pipeline_process: bool = False, resume: bool = False, db: Optional[FalkorDB] = None):
+        """Initialize FalkorDB connection; a client passed in is shared with other loaders and left open by close()"""
+        super().__init__(batch_size, workers, dbt_labels_only, column_lineage, parse_processes, force, pipeline,
+                         pipeline_process, resume)
+        self._owns_db = db is None
+        self.db = db or FalkorDB(host=host, port=port, username=username,
+                                 password=password)
         self.graph_name = graph_name
-        self.graph = self.db.select_graph(graph_name)
+        # Set between begin_blue_green() and promote()
+        self.staging: Optional[str] = None
+        self._select_live_graph()
         
     def close(self):
         """Close FalkorDB connection"""
-        if self.db:
+        self.close_workers()
+        if self.db and self._owns_db:
             self.db.close()
     
-    def clear_database(self):
-        """Clear all nodes and relationships"""
-        try:
-            self.graph.query("MATCH (n) DELETE n")
-            logger.info("Database cleared")
-        except Exception as e:
-            logger.warning(f"Database clear failed (may be empty): {e}")
+    def _select_live_graph(self):
+        """Write to the graph readers currently use; a blue/green load may have promoted another slot"""
+        self.graph = self.db.select_graph(resolve_graph_name(self.db, self.graph_name))
+    
+    def _clear_all(self):
+        """Clear the live graph in bounded transactions, or drop a blue/green staging slot server-side.
+        
+        Deleting nodes keeps the indexes others built on the live graph, such as
+        the vector and fulltext search indexes of the app. GRAPH.DELETE on the
+        staging slot drops its indexes too; create_constraints recreates them.
+        """
+        if self.staging is None:
+            super()._clear_all()
+            return
+        if self.graph.name not in self.db.list_graphs():
+            logger.info(f"Graph {self.graph.name} does not exist yet")
+            return
+        self.graph.delete()
+    
+    def _delete_batch(self, query: str) -> int:
+        return self.graph.query(query).result_set[0][0]
+    
+    def _read_rows(self, query: str) -> List[List[Any]]:
+        """Run a read-only query on the graph written to; a graph that does not exist yet has no rows"""
+        if self.graph.name not in self.db.list_graphs():
+            return []
+        return self.graph.ro_query(query).result_set
     
     def create_constraints(self):
         """Create constraints and indexes for better performance"""
-        constraints = [
-            "CREATE INDEX FOR (m:Model) ON (m.unique_id)",
-            "CREATE INDEX FOR (s:Source) ON (s.unique_id)",
-            "CREATE INDEX FOR (t:Test) ON (t.unique_id)",
-            "CREATE INDEX FOR (mac:Macro) ON (mac.unique_id)",
-            "CREATE INDEX FOR (o:Operation) ON (o.unique_id)",
-            "CREATE INDEX FOR (seed:Seed) ON (seed.unique_id)",
-            "CREATE INDEX FOR (snap:Snapshot) ON (snap.unique_id)",
-        ]
-        
-        for constraint in constraints:
+        for constraint in FALKORDB_INDEXES:
             try:
                 self.graph.query(constraint)
             except Exception as e:
@@ -55,938 +128,200 @@ class DBTFalkorDBLoader:
     def load_manifest_data_from_strings(self, manifest_str: str, catalog_str: Optional[str] = None):
         """Load manifest and optional catalog data from strings"""
         # Parse manifest JSON string
-        manifest_data = json.loads(manifest_str)
+        manifest_data = loads(manifest_str)
         
         # Parse catalog JSON string if provided
         catalog_data = {}
         if catalog_str:
-            catalog_data = json.loads(catalog_str)
+            catalog_data = loads(catalog_str)
         
         return manifest_data, catalog_data
     
     def load_manifest_data(self, manifest_path: str, catalog_path: str = None):
         """Load manifest and optional catalog data from file paths"""
         # Load manifest
-        with open(manifest_path, 'r') as f:
-            manifest_data = json.load(f)
+        manifest_data = read_json(manifest_path)
         
         # Load catalog if provided
         catalog_data = {}
         if catalog_path and Path(catalog_path).exists():
-            with open(catalog_path, 'r') as f:
-                catalog_data = json.load(f)
+            catalog_data = read_json(catalog_path)
         
         return manifest_data, catalog_data
     
-    def _escape_string(self, value):
-        """Escape string values for FalkorDB queries"""
-        if value is None:
-            return None
-        if isinstance(value, str):
-            # Replace all problematic characters
-            escaped = (value
-                      .replace('\\', '\\\\')  # Escape backslashes first
-                      .replace("'", "\\'")    # Escape single quotes
-                      .replace('"', '\\"')    # Escape double quotes  
-                      .replace('\n', '\\n')   # Escape newlines
-                      .replace('\r', '\\r')   # Escape carriage returns
-                      .replace('\t', '\\t')   # Escape tabs
-                      .replace('\b', '\\b')   # Escape backspaces
-                      .replace('\f', '\\f'))  # Escape form feeds
-            return escaped
-        return value
-    
-    def _format_property_value(self, key, value):
-        """Format property value for query string"""
-        if value is None:
-            return None  # Will be filtered out
-        elif isinstance(value, str):
-            return f"{key}: '{self._escape_string(value)}'"
-        elif isinstance(value, bool):
-            return f"{key}: {str(value).lower()}"
-        elif isinstance(value, (int, float)):
-            return f"{key}: {value}"
-        elif isinstance(value, (list, dict)):
+    def _param_value(self, value):
+        """Convert a property value into a type FalkorDB can store"""
+        if isinstance(value, (str, bool, int, float)):
+            return value
+        if isinstance(value, (list, dict)):
             # Convert lists and dicts to JSON strings
-            json_str = json.dumps(value)
-            return f"{key}: '{self._escape_string(json_str)}'"
-        else:
-            # Convert other types to string and escape
-            return f"{key}: '{self._escape_string(str(value))}'"
-    
-    def create_models(self, models: Dict[str, Any], catalog_nodes: Dict[str, Any] = None):
-        """Create model nodes"""
-        for model_id, model_data in models.items():
-            # Extract basic properties
-            properties = {
-                'unique_id': self._escape_string(model_id),
-                'name': self._escape_string(model_data.get('name', '')),
-                'resource_type': self._escape_string(model_data.get('resource_type', '')),
-                'package_name': self._escape_string(model_data.get('package_name', '')),
-                'path': self._escape_string(model_data.get('path', '')),
-                'original_file_path': self._escape_string(model_data.get('original_file_path', '')),
-                'database': self._escape_string(model_data.get('database', '')),
-                'schema': self._escape_string(model_data.get('schema', '')),
-                'alias': self._escape_string(model_data.get('alias', '')),
-                'materialized': self._escape_string(model_data.get('config', {}).get('materialized', '')),
-                'description': self._escape_string(model_data.get('description', '')),
-                'checksum': self._escape_string(model_data.get('checksum', {}).get('checksum', '')),
-                'relation_name': self._escape_string(model_data.get('relation_name', '')),
-                'language': self._escape_string(model_data.get('language', 'sql')),
-            }
-            
-            # Add config details
-            config = model_data.get('config', {})
-            properties.update({
-                'enabled': config.get('enabled', True),
-                'tags': str(config.get('tags', [])),
-                'meta': json.dumps(config.get('meta', {})),
-                'access': self._escape_string(config.get('access', '')),
-            })
-            
-            # Add catalog information if available
-            if catalog_nodes and model_id in catalog_nodes:
-                catalog_info = catalog_nodes[model_id]
-                properties.update({
-                    'table_type': self._escape_string(catalog_info.get('metadata', {}).get('type', '')),
-                    'table_comment': self._escape_string(catalog_info.get('metadata', {}).get('comment', '')),
-                    'owner': self._escape_string(catalog_info.get('metadata', {}).get('owner', '')),
-                })
-            
-            # Build the query
-            prop_strings = []
-            for k, v in properties.items():
-                formatted = self._format_property_value(k, v)
-                if formatted is not None:
-                    prop_strings.append(formatted)
-            
-            props_str = ", ".join(prop_strings)
-            query = f"CREATE (m:Model {{{props_str}}})"
-            
-            try:
-                self.graph.query(query)
-            except Exception as e:
-                logger.error(f"Error creating model {model_id}: {e}")
-        
-        logger.info(f"Created {len(models)} model nodes")
-    
-    def create_sources(self, sources: Dict[str, Any]):
-        """Create source nodes with proper naming: source_name.identifier"""
-        for source_id, source_data in sources.items():
-            # Create full name as source_name.identifier
-            source_name = source_data.get('source_name', '')
-            identifier = source_data.get('identifier', source_data.get('name', ''))
-            full_name = f"{source_name}.{identifier}" if source_name and identifier else identifier
-            
-            properties = {
-                'unique_id': self._escape_string(source_id),
-                'name': self._escape_string(full_name),
-                'identifier': self._escape_string(identifier),
-                'resource_type': self._escape_string(source_data.get('resource_type', '')),
-                'package_name': self._escape_string(source_data.get('package_name', '')),
-                'source_name': self._escape_string(source_name),
-                'database': self._escape_string(source_data.get('database', '')),
-                'schema': self._escape_string(source_data.get('schema', '')),
-                'description': self._escape_string(source_data.get('description', '')),
-                'loader': self._escape_string(source_data.get('loader', '')),
-                'relation_name': self._escape_string(source_data.get('relation_name', '')),
-            }
-            
-            # Add freshness and columns info
-            freshness = source_data.get('freshness', {})
-            if freshness:
-                properties['freshness_warn_after'] = json.dumps(freshness.get('warn_after', {}))
-                properties['freshness_error_after'] = json.dumps(freshness.get('error_after', {}))
-            
-            columns = source_data.get('columns', {})
-            if columns:
-                properties['column_count'] = len(columns)
-                properties['columns'] = json.dumps(columns)
-            
-            # Build the query
-            prop_strings = []
-            for k, v in properties.items():
-                formatted = self._format_property_value(k, v)
-                if formatted is not None:
-                    prop_strings.append(formatted)
-            
-            props_str = ", ".join(prop_strings)
-            query = f"CREATE (s:Source {{{props_str}}})"
-            
-            try:
-                self.graph.query(query)
-            except Exception as e:
-                logger.error(f"Error creating source {source_id}: {e}")
-        
-        logger.info(f"Created {len(sources)} source nodes")
+            return json.dumps(value)
+        return str(value)
     
-    def create_seeds(self, seeds: Dict[str, Any]):
-        """Create seed nodes"""
-        for seed_id, seed_data in seeds.items():
-            properties = {
-                'unique_id': self._escape_string(seed_id),
-                'name': self._escape_string(seed_data.get('name', '')),
-                'resource_type': self._escape_string(seed_data.get('resource_type', '')),
-                'package_name': self._escape_string(seed_data.get('package_name', '')),
-                'path': self._escape_string(seed_data.get('path', '')),
-                'database': self._escape_string(seed_data.get('database', '')),
-                'schema': self._escape_string(seed_data.get('schema', '')),
-                'alias': self._escape_string(seed_data.get('alias', '')),
-                'relation_name': self._escape_string(seed_data.get('relation_name', '')),
-            }
-            
-            # Add config details
-            config = seed_data.get('config', {})
-            properties.update({
-                'enabled': config.get('enabled', True),
-                'tags': str(config.get('tags', [])),
-                'materialized': self._escape_string(config.get('materialized', 'seed')),
-                'delimiter': self._escape_string(config.get('delimiter', ',')),
-            })
-            
-            # Build the query
-            prop_strings = []
-            for k, v in properties.items():
-                formatted = self._format_property_value(k, v)
-                if formatted is not None:
-                    prop_strings.append(formatted)
-            
-            props_str = ", ".join(prop_strings)
-            query = f"CREATE (seed:Seed {{{props_str}}})"
-            
-            try:
-                self.graph.query(query)
-            except Exception as e:
-                logger.error(f"Error creating seed {seed_id}: {e}")
-        
-        logger.info(f"Created {len(seeds)} seed nodes")
+    def _clean_properties(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop unset properties and convert the rest into storable values"""
+        return {k: self._param_value(v) for k, v in properties.items() if v is not None}
     
-    def create_snapshots(self, snapshots: Dict[str, Any]):
-        """Create snapshot nodes"""
-        for snapshot_id, snapshot_data in snapshots.items():
-            properties = {
-                'unique_id': self._escape_string(snapshot_id),
-                'name': self._escape_string(snapshot_data.get('name', '')),
-                'resource_type': self._escape_string(snapshot_data.get('resource_type', '')),
-                'package_name': self._escape_string(snapshot_data.get('package_name', '')),
-                'path': self._escape_string(snapshot_data.get('path', '')),
-                'database': self._escape_string(snapshot_data.get('database', '')),
-                'schema': self._escape_string(snapshot_data.get('schema', '')),
-                'alias': self._escape_string(snapshot_data.get('alias', '')),
-                'relation_name': self._escape_string(snapshot_data.get('relation_name', '')),
-            }
-            
-            # Add snapshot-specific config
-            config = snapshot_data.get('config', {})
-            properties.update({
-                'enabled': config.get('enabled', True),
-                'tags': str(config.get('tags', [])),
-                'materialized': self._escape_string(config.get('materialized', 'snapshot')),
-                'strategy': self._escape_string(config.get('strategy', '')),
-                'unique_key': self._escape_string(config.get('unique_key', '')),
-                'updated_at': self._escape_string(config.get('updated_at', '')),
-            })
-            
-            # Build the query
-            prop_strings = []
-            for k, v in properties.items():
-                formatted = self._format_property_value(k, v)
-                if formatted is not None:
-                    prop_strings.append(formatted)
-            
-            props_str = ", ".join(prop_strings)
-            query = f"CREATE (snap:Snapshot {{{props_str}}})"
-            
-            try:
-                self.graph.query(query)
-            except Exception as e:
-                logger.error(f"Error creating snapshot {snapshot_id}: {e}")
-        
-        logger.info(f"Created {len(snapshots)} snapshot nodes")
+    def _prepare_row(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """FalkorDB parameters cannot hold nested values"""
+        return self._clean_properties(properties)
     
-    def create_tests(self, tests: Dict[str, Any]):
-        """Create test nodes"""
-        for test_id, test_data in tests.items():
-            properties = {
-                'unique_id': self._escape_string(test_id),
-                'name': self._escape_string(test_data.get('name', '')),
-                'resource_type': self._escape_string(test_data.get('resource_type', '')),
-                'package_name': self._escape_string(test_data.get('package_name', '')),
-                'path': self._escape_string(test_data.get('path', '')),
-                'column_name': self._escape_string(test_data.get('column_name', '')),
-                'language': self._escape_string(test_data.get('language', 'sql')),
-            }
-            
-            # Add config and test metadata
-            config = test_data.get('config', {})
-            properties.update({
-                'enabled': config.get('enabled', True),
-                'tags': str(config.get('tags', [])),
-                'severity': self._escape_string(config.get('severity', 'ERROR')),
-            })
-            
-            test_metadata = test_data.get('test_metadata', {})
-            if test_metadata:
-                properties.update({
-                    'test_name': self._escape_string(test_metadata.get('name', '')),
-                    'test_kwargs': json.dumps(test_metadata.get('kwargs', {})),
-                })
-            
-            # Build the query
-            prop_strings = []
-            for k, v in properties.items():
-                formatted = self._format_property_value(k, v)
-                if formatted is not None:
-                    prop_strings.append(formatted)
-            
-            props_str = ", ".join(prop_strings)
-            query = f"CREATE (t:Test {{{props_str}}})"
-            
-            try:
-                self.graph.query(query)
-            except Exception as e:
-                logger.error(f"Error creating test {test_id}: {e}")
-        
-        logger.info(f"Created {len(tests)} test nodes")
-    
-    def create_macros(self, macros: Dict[str, Any]):
-        """Create macro nodes"""
-        for macro_id, macro_data in macros.items():
-            properties = {
-                'unique_id': self._escape_string(macro_id),
-                'name': self._escape_string(macro_data.get('name', '')),
-                'resource_type': self._escape_string(macro_data.get('resource_type', '')),
-                'package_name': self._escape_string(macro_data.get('package_name', '')),
-                'path': self._escape_string(macro_data.get('path', '')),
-                'description': self._escape_string(macro_data.get('description', '')),
-                'arguments': json.dumps(macro_data.get('arguments', [])),
-            }
-            
-            # Build the query
-            prop_strings = []
-            for k, v in properties.items():
-                formatted = self._format_property_value(k, v)
-                if formatted is not None:
-                    prop_strings.append(formatted)
-            
-            props_str = ", ".join(prop_strings)
-            query = f"CREATE (mac:Macro {{{props_str}}})"
-            
-            try:
-                self.graph.query(query)
-            except Exception as e:
-                logger.error(f"Error creating macro {macro_id}: {e}")
-        
-        logger.info(f"Created {len(macros)} macro nodes")
+    def _tags(self, tags: List[str]) -> Any:
+        """Tags are stored as their string representation"""
+        return str(tags)
     
-    def create_operations(self, operations: Dict[str, Any]):
-        """Create operation nodes"""
-        for op_id, op_data in operations.items():
-            properties = {
-                'unique_id': self._escape_string(op_id),
-                'name': self._escape_string(op_data.get('name', '')),
-                'resource_type': self._escape_string(op_data.get('resource_type', '')),
-                'package_name': self._escape_string(op_data.get('package_name', '')),
-                'path': self._escape_string(op_data.get('path', '')),
-                'database': self._escape_string(op_data.get('database', '')),
-                'schema': self._escape_string(op_data.get('schema', '')),
-                'language': self._escape_string(op_data.get('language', 'sql')),
-            }
-            
-            # Build the query
-            prop_strings = []
-            for k, v in properties.items():
-                formatted = self._format_property_value(k, v)
-                if formatted is not None:
-                    prop_strings.append(formatted)
-            
-            props_str = ", ".join(prop_strings)
-            query = f"CREATE (o:Operation {{{props_str}}})"
-            
+    def _write_batch(self, query: str, batch: List[Dict[str, Any]], description: str) -> int:
+        """Send one batch through a parameterized UNWIND query.
+        
+        Returns the number of rows written. A batch that fails on a lost
+        connection or a timeout is sent again up to max_retries times with
+        exponential backoff, and the error is raised once they are used up. A
+        batch the server rejects fails the load, like in the async loader.
+        """
+        for attempt in range(self.max_retries + 1):
             try:
-                self.graph.query(query)
+                self.graph.query(query, {'rows': batch})
+                return len(batch)
+            except TRANSIENT_ERRORS as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Giving up on {description} batch of {len(batch)} rows after {attempt} retries: {e}")
+                    self.profile.record(failed=1)
+                    raise
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"Retrying {description} batch of {len(batch)} rows in {delay:.1f}s: {e}")
+                self.profile.record(retries=1)
+                time.sleep(delay)
             except Exception as e:
-                logger.error(f"Error creating operation {op_id}: {e}")
-        
-        logger.info(f"Created {len(operations)} operation nodes")
+                logger.error(f"Error writing {description} batch of {len(batch)} rows: {e}")
+                self.profile.record(failed=1)
+                raise
     
-    def create_dependencies(self, parent_map: Dict[str, List[str]], child_map: Dict[str, List[str]]):
-        """Create dependency relationships using DEPENDS_ON for all types"""
-        dependency_count = 0
-        for child, parents in parent_map.items():
-            for parent in parents:
-                query = f"""
-                    MATCH (parent) WHERE parent.unique_id = '{self._escape_string(parent)}'
-                    MATCH (child) WHERE child.unique_id = '{self._escape_string(child)}'
-                    CREATE (child)-[:DEPENDS_ON]->(parent)
-                """
-                try:
-                    self.graph.query(query)
-                    dependency_count += 1
-                except Exception as e:
-                    logger.error(f"Error creating dependency {child} -> {parent}: {e}")
-        
-        logger.info(f"Created {dependency_count} dependency relationships")
+    def load_dbt_to_falkordb_from_strings(self, manifest_str: str, catalog_str: Optional[str] = None) -> LoadProfile:
+        """Main method to load DBT data into FalkorDB from string content"""
+        with self._profiled('load') as profile:
+            logger.info("Starting DBT to FalkorDB load process from strings")
+            self._select_live_graph()
+            fingerprint = self.fingerprint_content(manifest_str, catalog_str)
+            if self.is_unchanged(fingerprint):
+                return profile
+            
+            # Load data from strings
+            with profile.phase('parse'):
+                manifest_data, catalog_data = self.load_manifest_data_from_strings(manifest_str, catalog_str)
+                manifest = Manifest.from_dict(manifest_data, self.column_lineage, consume=True)
+            self._load_manifest(manifest, catalog_data)
+            self.record_load(fingerprint)
+            
+            logger.info("DBT to FalkorDB load process completed successfully")
+        return profile
     
-    def create_ref_relationships(self, nodes: Dict[str, Any]):
-        """Create REFERENCES relationships between models"""
-        ref_count = 0
-        for node_id, node_data in nodes.items():
-            refs = node_data.get('refs', [])
-            for ref in refs:
-                ref_name = ref.get('name') if isinstance(ref, dict) else ref
-                if ref_name:
-                    query = f"""
-                        MATCH (referencing) WHERE referencing.unique_id = '{self._escape_string(node_id)}'
-                        MATCH (referenced:Model) WHERE referenced.name = '{self._escape_string(ref_name)}'
-                        CREATE (referencing)-[:REFERENCES]->(referenced)
-                    """
-                    try:
-                        self.graph.query(query)
-                        ref_count += 1
-                    except Exception as e:
-                        logger.error(f"Error creating reference {node_id} -> {ref_name}: {e}")
-        
-        logger.info(f"Created {ref_count} REFERENCES relationships")
+    def load_dbt_to_falkordb(self, manifest_path: str, catalog_path: str = None) -> LoadProfile:
+        """Main method to load DBT data into FalkorDB from file paths"""
+        with self._profiled('load') as profile:
+            logger.info("Starting DBT to FalkorDB load process")
+            self._select_live_graph()
+            fingerprint = self.fingerprint_files(manifest_path, catalog_path)
+            if self.is_unchanged(fingerprint):
+                return profile
+            
+            # Load data
+            with profile.phase('parse'):
+                manifest_data, catalog_data = self.load_manifest_data(manifest_path, catalog_path)
+                manifest = Manifest.from_dict(manifest_data, self.column_lineage, consume=True)
+            self._load_manifest(manifest, catalog_data)
+            self.record_load(fingerprint)
+            
+            logger.info("DBT to FalkorDB load process completed successfully")
+        return profile
     
-    def create_source_relationships(self, nodes: Dict[str, Any]):
-        """Create DEPENDS_ON relationships to sources"""
-        source_dep_count = 0
-        for node_id, node_data in nodes.items():
-            sources = node_data.get('sources', [])
-            for source in sources:
-                if len(source) >= 2:
-                    source_name, table_name = source[0], source[1]
-                    full_source_name = f"{source_name}.{table_name}"
-                    query = f"""
-                        MATCH (node) WHERE node.unique_id = '{self._escape_string(node_id)}'
-                        MATCH (source:Source) WHERE source.name = '{self._escape_string(full_source_name)}'
-                        CREATE (node)-[:DEPENDS_ON]->(source)
-                    """
-                    try:
-                        self.graph.query(query)
-                        source_dep_count += 1
-                    except Exception as e:
-                        logger.error(f"Error creating source dependency {node_id} -> {full_source_name}: {e}")
-        
-        logger.info(f"Created {source_dep_count} DEPENDS_ON relationships to sources")
+    def load_dbt_to_falkordb_streaming(self, manifest_path: str, catalog_path: str = None) -> LoadProfile:
+        """Load DBT data into FalkorDB from file paths without holding the whole manifest in memory"""
+        with self._profiled('load') as profile:
+            logger.info("Starting streaming DBT to FalkorDB load process")
+            self._select_live_graph()
+            fingerprint = self.fingerprint_files(manifest_path, catalog_path)
+            if self.is_unchanged(fingerprint):
+                return profile
+            
+            self._load_manifest_streaming(manifest_path, catalog_path, fingerprint)
+            self.record_load(fingerprint)
+            
+            logger.info("DBT to FalkorDB load process completed successfully")
+        return profile
     
-    def create_macro_relationships(self, nodes: Dict[str, Any]):
-        """Create USES_MACRO relationships"""
-        macro_count = 0
-        for node_id, node_data in nodes.items():
-            depends_on = node_data.get('depends_on', {})
-            macros = depends_on.get('macros', [])
-            for macro in macros:
-                query = f"""
-                    MATCH (node) WHERE node.unique_id = '{self._escape_string(node_id)}'
-                    MATCH (macro:Macro) WHERE macro.unique_id = '{self._escape_string(macro)}'
-                    CREATE (node)-[:USES_MACRO]->(macro)
-                """
-                try:
-                    self.graph.query(query)
-                    macro_count += 1
-                except Exception as e:
-                    logger.error(f"Error creating macro usage {node_id} -> {macro}: {e}")
-        
-        logger.info(f"Created {macro_count} USES_MACRO relationships")
+    def incremental_update(self, old_manifest: Manifest, new_manifest: Manifest,
+                           catalog_data: Optional[Dict[str, Any]] = None) -> GraphDelta:
+        """Apply the differences between two parsed manifests to the live graph (see BaseDBTLoader)"""
+        if self.staging is None:
+            self._select_live_graph()
+        return super().incremental_update(old_manifest, new_manifest, catalog_data)
     
-    def create_test_relationships(self, tests: Dict[str, Any]):
-        """Create TESTS relationships"""
-        test_count = 0
-        for test_id, test_data in tests.items():
-            # Link tests to the nodes they test via attached_node
-            attached_node = test_data.get('attached_node')
-            if attached_node:
-                query = f"""
-                    MATCH (test:Test) WHERE test.unique_id = '{self._escape_string(test_id)}'
-                    MATCH (node) WHERE node.unique_id = '{self._escape_string(attached_node)}'
-                    CREATE (test)-[:TESTS]->(node)
-                """
-                try:
-                    self.graph.query(query)
-                    test_count += 1
-                except Exception as e:
-                    logger.error(f"Error creating test relationship {test_id} -> {attached_node}: {e}")
-        
-        logger.info(f"Created {test_count} TESTS relationships")
+    def refresh_catalog(self, manifest: Manifest, catalog_data: Dict[str, Any]) -> CatalogRefresh:
+        """Apply a new catalog to the live graph, or to the staging slot after begin_blue_green()"""
+        if self.staging is None:
+            self._select_live_graph()
+        return super().refresh_catalog(manifest, catalog_data)
     
-    def load_dbt_to_falkordb_from_strings(self, manifest_str: str, catalog_str: Optional[str] = None):
-        """Main method to load DBT data into FalkorDB from string content"""
-        logger.info("Starting DBT to FalkorDB load process from strings")
-        
-        # Load data from strings
-        manifest_data, catalog_data = self.load_manifest_data_from_strings(manifest_str, catalog_str)
-        
-        # Clear database and create constraints
-        self.clear_database()
-        self.create_constraints()
-        
-        # Extract data sections
-        nodes = manifest_data.get('nodes', {})
-        sources = manifest_data.get('sources', {})
-        macros = manifest_data.get('macros', {})
-        parent_map = manifest_data.get('parent_map', {})
-        child_map = manifest_data.get('child_map', {})
-        
-        # Separate different node types
-        models = {k: v for k, v in nodes.items() if v.get('resource_type') == 'model'}
-        tests = {k: v for k, v in nodes.items() if v.get('resource_type') == 'test'}
-        operations = {k: v for k, v in nodes.items() if v.get('resource_type') == 'operation'}
-        seeds = {k: v for k, v in nodes.items() if v.get('resource_type') == 'seed'}
-        snapshots = {k: v for k, v in nodes.items() if v.get('resource_type') == 'snapshot'}
-        
-        # Create nodes
-        self.create_models(models, catalog_data.get('nodes', {}))
-        self.create_sources(sources)
-        self.create_seeds(seeds)
-        self.create_snapshots(snapshots)
-        self.create_tests(tests)
-        self.create_macros(macros)
-        self.create_operations(operations)
-        
-        # Create relationships
-        self.create_dependencies(parent_map, child_map)
-        self.create_ref_relationships(nodes)
-        self.create_source_relationships(nodes)
-        self.create_macro_relationships(nodes)
-        self.create_test_relationships(tests)
-        
-        logger.info("DBT to FalkorDB load process completed successfully")
+    def begin_blue_green(self) -> str:
+        """Point the loader at the staging slot and return its name.
+        
+        The load's clear_database drops whatever the slot still holds, indexes
+        included; the live graph is left untouched until promote() is called.
+        """
+        self.staging = staging_graph_name(self.graph_name, resolve_graph_name(self.db, self.graph_name))
+        self.graph = self.db.select_graph(self.staging)
+        logger.info(f"Loading into staging graph {self.staging}")
+        return self.staging
     
-    def load_dbt_to_falkordb(self, manifest_path: str, catalog_path: str = None):
-        """Main method to load DBT data into FalkorDB from file paths"""
-        logger.info("Starting DBT to FalkorDB load process")
-        
-        # Load data
-        manifest_data, catalog_data = self.load_manifest_data(manifest_path, catalog_path)
-        
-        # Clear database and create constraints
-        self.clear_database()
-        self.create_constraints()
-        
-        # Extract data sections
-        nodes = manifest_data.get('nodes', {})
-        sources = manifest_data.get('sources', {})
-        macros = manifest_data.get('macros', {})
-        parent_map = manifest_data.get('parent_map', {})
-        child_map = manifest_data.get('child_map', {})
-        
-        # Separate different node types
-        models = {k: v for k, v in nodes.items() if v.get('resource_type') == 'model'}
-        tests = {k: v for k, v in nodes.items() if v.get('resource_type') == 'test'}
-        operations = {k: v for k, v in nodes.items() if v.get('resource_type') == 'operation'}
-        seeds = {k: v for k, v in nodes.items() if v.get('resource_type') == 'seed'}
-        snapshots = {k: v for k, v in nodes.items() if v.get('resource_type') == 'snapshot'}
-        
-        # Create nodes
-        self.create_models(models, catalog_data.get('nodes', {}))
-        self.create_sources(sources)
-        self.create_seeds(seeds)
-        self.create_snapshots(snapshots)
-        self.create_tests(tests)
-        self.create_macros(macros)
-        self.create_operations(operations)
-        
-        # Create relationships
-        self.create_dependencies(parent_map, child_map)
-        self.create_ref_relationships(nodes)
-        self.create_source_relationships(nodes)
-        self.create_macro_relationships(nodes)
-        self.create_test_relationships(tests)
-        
-        logger.info("DBT to FalkorDB load process completed successfully")
+    def promote(self, graph: str):
+        """Atomically switch readers of graph_name to another graph.
+        
+        The previously live graph is kept, so queries still running against it
+        complete; it is only dropped when the next blue/green load reuses its slot.
+        """
+        previous = resolve_graph_name(self.db, self.graph_name)
+        self.db.connection.set(active_graph_key(self.graph_name), graph)
+        self.graph = self.db.select_graph(graph)
+        self.staging = None
+        logger.info(f"Promoted {graph} to live {self.graph_name} graph (previous: {previous})")
     
-    # ------------------------------------------------------------------ #
-    # Incremental update helpers                                           #
-    # ------------------------------------------------------------------ #
-
-    def _collect_all_nodes(self, manifest_data: dict) -> dict:
-        all_nodes = {}
-        all_nodes.update(manifest_data.get('nodes', {}))
-        all_nodes.update(manifest_data.get('sources', {}))
-        all_nodes.update(manifest_data.get('macros', {}))
-        return all_nodes
-
-    def _get_checksum(self, node_data: dict) -> str:
-        checksum = node_data.get('checksum')
-        if isinstance(checksum, dict):
-            return checksum.get('checksum', '')
-        return str(checksum) if checksum else ''
-
-    def _diff_manifests(self, old_manifest: dict, new_manifest: dict) -> tuple:
-        old_nodes = self._collect_all_nodes(old_manifest)
-        new_nodes = self._collect_all_nodes(new_manifest)
-        old_ids = set(old_nodes)
-        new_ids = set(new_nodes)
-        removed = old_ids - new_ids
-        added = new_ids - old_ids
-        changed = {
-            uid for uid in old_ids & new_ids
-            if self._get_checksum(old_nodes[uid]) != self._get_checksum(new_nodes[uid])
-        }
-        return added, changed, removed
-
-    def _delete_nodes(self, ids: set):
-        for uid in ids:
-            try:
-                self.graph.query(
-                    f"MATCH (n) WHERE n.unique_id = '{self._escape_string(uid)}' DETACH DELETE n"
-                )
-            except Exception as e:
-                logger.error(f"Error deleting node {uid}: {e}")
-        logger.info(f"Deleted {len(ids)} removed nodes")
-
-    def _delete_outgoing_relationships(self, ids: set):
-        for uid in ids:
-            try:
-                self.graph.query(
-                    f"MATCH (n)-[r]->() WHERE n.unique_id = '{self._escape_string(uid)}' DELETE r"
-                )
-            except Exception as e:
-                logger.error(f"Error deleting outgoing rels for {uid}: {e}")
-
-    def _upsert_node(self, label: str, var: str, uid: str, prop_strings: List[str]):
-        """MERGE a node by unique_id and SET all its properties."""
-        escaped_uid = self._escape_string(uid)
-        set_parts = []
-        for p in prop_strings:
-            sep_idx = p.index(': ')
-            key, val = p[:sep_idx], p[sep_idx + 2:]
-            set_parts.append(f"{var}.{key} = {val}")
-        query = f"MERGE ({var}:{label} {{unique_id: '{escaped_uid}'}}) SET {', '.join(set_parts)}"
-        self.graph.query(query)
-
-    def _upsert_models(self, models: Dict[str, Any], catalog_nodes: Dict[str, Any] = None):
-        catalog_nodes = catalog_nodes or {}
-        for model_id, model_data in models.items():
-            properties = {
-                'unique_id': self._escape_string(model_id),
-                'name': self._escape_string(model_data.get('name', '')),
-                'resource_type': self._escape_string(model_data.get('resource_type', '')),
-                'package_name': self._escape_string(model_data.get('package_name', '')),
-                'path': self._escape_string(model_data.get('path', '')),
-                'original_file_path': self._escape_string(model_data.get('original_file_path', '')),
-                'database': self._escape_string(model_data.get('database', '')),
-                'schema': self._escape_string(model_data.get('schema', '')),
-                'alias': self._escape_string(model_data.get('alias', '')),
-                'materialized': self._escape_string(model_data.get('config', {}).get('materialized', '')),
-                'description': self._escape_string(model_data.get('description', '')),
-                'checksum': self._escape_string(model_data.get('checksum', {}).get('checksum', '')),
-                'relation_name': self._escape_string(model_data.get('relation_name', '')),
-                'language': self._escape_string(model_data.get('language', 'sql')),
-            }
-            config = model_data.get('config', {})
-            properties.update({
-                'enabled': config.get('enabled', True),
-                'tags': str(config.get('tags', [])),
-                'meta': json.dumps(config.get('meta', {})),
-                'access': self._escape_string(config.get('access', '')),
-            })
-            if model_id in catalog_nodes:
-                catalog_info = catalog_nodes[model_id]
-                properties.update({
-                    'table_type': self._escape_string(catalog_info.get('metadata', {}).get('type', '')),
-                    'table_comment': self._escape_string(catalog_info.get('metadata', {}).get('comment', '')),
-                    'owner': self._escape_string(catalog_info.get('metadata', {}).get('owner', '')),
-                })
-            prop_strings = [f for f in (self._format_property_value(k, v) for k, v in properties.items()) if f is not None]
-            try:
-                self._upsert_node('Model', 'm', model_id, prop_strings)
-            except Exception as e:
-                logger.error(f"Error upserting model {model_id}: {e}")
-        logger.info(f"Upserted {len(models)} model nodes")
-
-    def _upsert_sources(self, sources: Dict[str, Any]):
-        for source_id, source_data in sources.items():
-            source_name = source_data.get('source_name', '')
-            identifier = source_data.get('identifier', source_data.get('name', ''))
-            full_name = f"{source_name}.{identifier}" if source_name and identifier else identifier
-            properties = {
-                'unique_id': self._escape_string(source_id),
-                'name': self._escape_string(full_name),
-                'identifier': self._escape_string(identifier),
-                'resource_type': self._escape_string(source_data.get('resource_type', '')),
-                'package_name': self._escape_string(source_data.get('package_name', '')),
-                'source_name': self._escape_string(source_name),
-                'database': self._escape_string(source_data.get('database', '')),
-                'schema': self._escape_string(source_data.get('schema', '')),
-                'description': self._escape_string(source_data.get('description', '')),
-                'loader': self._escape_string(source_data.get('loader', '')),
-                'relation_name': self._escape_string(source_data.get('relation_name', '')),
-            }
-            freshness = source_data.get('freshness', {})
-            if freshness:
-                properties['freshness_warn_after'] = json.dumps(freshness.get('warn_after', {}))
-                properties['freshness_error_after'] = json.dumps(freshness.get('error_after', {}))
-            columns = source_data.get('columns', {})
-            if columns:
-                properties['column_count'] = len(columns)
-                properties['columns'] = json.dumps(columns)
-            prop_strings = [f for f in (self._format_property_value(k, v) for k, v in properties.items()) if f is not None]
-            try:
-                self._upsert_node('Source', 's', source_id, prop_strings)
-            except Exception as e:
-                logger.error(f"Error upserting source {source_id}: {e}")
-        logger.info(f"Upserted {len(sources)} source nodes")
-
-    def _upsert_seeds(self, seeds: Dict[str, Any]):
-        for seed_id, seed_data in seeds.items():
-            config = seed_data.get('config', {})
-            properties = {
-                'unique_id': self._escape_string(seed_id),
-                'name': self._escape_string(seed_data.get('name', '')),
-                'resource_type': self._escape_string(seed_data.get('resource_type', '')),
-                'package_name': self._escape_string(seed_data.get('package_name', '')),
-                'path': self._escape_string(seed_data.get('path', '')),
-                'database': self._escape_string(seed_data.get('database', '')),
-                'schema': self._escape_string(seed_data.get('schema', '')),
-                'alias': self._escape_string(seed_data.get('alias', '')),
-                'relation_name': self._escape_string(seed_data.get('relation_name', '')),
-                'enabled': config.get('enabled', True),
-                'tags': str(config.get('tags', [])),
-                'materialized': self._escape_string(config.get('materialized', 'seed')),
-                'delimiter': self._escape_string(config.get('delimiter', ',')),
-            }
-            prop_strings = [f for f in (self._format_property_value(k, v) for k, v in properties.items()) if f is not None]
-            try:
-                self._upsert_node('Seed', 'seed', seed_id, prop_strings)
-            except Exception as e:
-                logger.error(f"Error upserting seed {seed_id}: {e}")
-        logger.info(f"Upserted {len(seeds)} seed nodes")
-
-    def _upsert_snapshots(self, snapshots: Dict[str, Any]):
-        for snap_id, snap_data in snapshots.items():
-            config = snap_data.get('config', {})
-            properties = {
-                'unique_id': self._escape_string(snap_id),
-                'name': self._escape_string(snap_data.get('name', '')),
-                'resource_type': self._escape_string(snap_data.get('resource_type', '')),
-                'package_name': self._escape_string(snap_data.get('package_name', '')),
-                'path': self._escape_string(snap_data.get('path', '')),
-                'database': self._escape_string(snap_data.get('database', '')),
-                'schema': self._escape_string(snap_data.get('schema', '')),
-                'alias': self._escape_string(snap_data.get('alias', '')),
-                'relation_name': self._escape_string(snap_data.get('relation_name', '')),
-                'enabled': config.get('enabled', True),
-                'tags': str(config.get('tags', [])),
-                'materialized': self._escape_string(config.get('materialized', 'snapshot')),
-                'strategy': self._escape_string(config.get('strategy', '')),
-                'unique_key': self._escape_string(config.get('unique_key', '')),
-                'updated_at': self._escape_string(config.get('updated_at', '')),
-            }
-            prop_strings = [f for f in (self._format_property_value(k, v) for k, v in properties.items()) if f is not None]
-            try:
-                self._upsert_node('Snapshot', 'snap', snap_id, prop_strings)
-            except Exception as e:
-                logger.error(f"Error upserting snapshot {snap_id}: {e}")
-        logger.info(f"Upserted {len(snapshots)} snapshot nodes")
-
-    def _upsert_tests(self, tests: Dict[str, Any]):
-        for test_id, test_data in tests.items():
-            config = test_data.get('config', {})
-            properties = {
-                'unique_id': self._escape_string(test_id),
-                'name': self._escape_string(test_data.get('name', '')),
-                'resource_type': self._escape_string(test_data.get('resource_type', '')),
-                'package_name': self._escape_string(test_data.get('package_name', '')),
-                'path': self._escape_string(test_data.get('path', '')),
-                'column_name': self._escape_string(test_data.get('column_name', '')),
-                'language': self._escape_string(test_data.get('language', 'sql')),
-                'enabled': config.get('enabled', True),
-                'tags': str(config.get('tags', [])),
-                'severity': self._escape_string(config.get('severity', 'ERROR')),
-            }
-            test_metadata = test_data.get('test_metadata', {})
-            if test_metadata:
-                properties.update({
-                    'test_name': self._escape_string(test_metadata.get('name', '')),
-                    'test_kwargs': json.dumps(test_metadata.get('kwargs', {})),
-                })
-            prop_strings = [f for f in (self._format_property_value(k, v) for k, v in properties.items()) if f is not None]
+    def load_dbt_to_falkordb_blue_green(self, manifest_path: str, catalog_path: str = None, streaming: bool = False,
+                                        before_promote: Callable[[str], None] = None) -> LoadProfile:
+        """Load DBT data into a staging graph and swap it in once complete.
+        
+        Readers keep querying the previous graph during the load. before_promote
+        is called with the staging graph name, e.g. to build search indexes there.
+        """
+        with self._profiled('blue/green load') as profile:
+            logger.info("Starting blue/green DBT to FalkorDB load process")
+            # Checked against the live graph, before the loader moves to the staging slot
+            self._select_live_graph()
+            fingerprint = self.fingerprint_files(manifest_path, catalog_path)
+            if self.is_unchanged(fingerprint):
+                return profile
+            
+            staging = self.begin_blue_green()
             try:
-                self._upsert_node('Test', 't', test_id, prop_strings)
-            except Exception as e:
-                logger.error(f"Error upserting test {test_id}: {e}")
-        logger.info(f"Upserted {len(tests)} test nodes")
-
-    def _upsert_macros(self, macros: Dict[str, Any]):
-        for macro_id, macro_data in macros.items():
-            properties = {
-                'unique_id': self._escape_string(macro_id),
-                'name': self._escape_string(macro_data.get('name', '')),
-                'resource_type': self._escape_string(macro_data.get('resource_type', '')),
-                'package_name': self._escape_string(macro_data.get('package_name', '')),
-                'path': self._escape_string(macro_data.get('path', '')),
-                'description': self._escape_string(macro_data.get('description', '')),
-                'arguments': json.dumps(macro_data.get('arguments', [])),
-            }
-            prop_strings = [f for f in (self._format_property_value(k, v) for k, v in properties.items()) if f is not None]
-            try:
-                self._upsert_node('Macro', 'mac', macro_id, prop_strings)
-            except Exception as e:
-                logger.error(f"Error upserting macro {macro_id}: {e}")
-        logger.info(f"Upserted {len(macros)} macro nodes")
-
-    def _upsert_operations(self, operations: Dict[str, Any]):
-        for op_id, op_data in operations.items():
-            properties = {
-                'unique_id': self._escape_string(op_id),
-                'name': self._escape_string(op_data.get('name', '')),
-                'resource_type': self._escape_string(op_data.get('resource_type', '')),
-                'package_name': self._escape_string(op_data.get('package_name', '')),
-                'path': self._escape_string(op_data.get('path', '')),
-                'database': self._escape_string(op_data.get('database', '')),
-                'schema': self._escape_string(op_data.get('schema', '')),
-                'language': self._escape_string(op_data.get('language', 'sql')),
-            }
-            prop_strings = [f for f in (self._format_property_value(k, v) for k, v in properties.items()) if f is not None]
-            try:
-                self._upsert_node('Operation', 'o', op_id, prop_strings)
-            except Exception as e:
-                logger.error(f"Error upserting operation {op_id}: {e}")
-        logger.info(f"Upserted {len(operations)} operation nodes")
-
-    def _merge_dependencies(self, parent_map: Dict[str, List[str]], child_map: Dict[str, List[str]]):
-        count = 0
-        for child, parents in parent_map.items():
-            for parent in parents:
-                query = f"""
-                    MATCH (parent) WHERE parent.unique_id = '{self._escape_string(parent)}'
-                    MATCH (child) WHERE child.unique_id = '{self._escape_string(child)}'
-                    MERGE (child)-[:DEPENDS_ON]->(parent)
-                """
-                try:
-                    self.graph.query(query)
-                    count += 1
-                except Exception as e:
-                    logger.error(f"Error merging dependency {child} -> {parent}: {e}")
-        logger.info(f"Merged {count} dependency relationships")
-
-    def _merge_ref_relationships(self, nodes: Dict[str, Any]):
-        count = 0
-        for node_id, node_data in nodes.items():
-            for ref in node_data.get('refs', []):
-                ref_name = ref.get('name') if isinstance(ref, dict) else ref
-                if ref_name:
-                    query = f"""
-                        MATCH (referencing) WHERE referencing.unique_id = '{self._escape_string(node_id)}'
-                        MATCH (referenced:Model) WHERE referenced.name = '{self._escape_string(ref_name)}'
-                        MERGE (referencing)-[:REFERENCES]->(referenced)
-                    """
-                    try:
-                        self.graph.query(query)
-                        count += 1
-                    except Exception as e:
-                        logger.error(f"Error merging reference {node_id} -> {ref_name}: {e}")
-        logger.info(f"Merged {count} REFERENCES relationships")
-
-    def _merge_source_relationships(self, nodes: Dict[str, Any]):
-        count = 0
-        for node_id, node_data in nodes.items():
-            for source in node_data.get('sources', []):
-                if len(source) >= 2:
-                    full_source_name = f"{source[0]}.{source[1]}"
-                    query = f"""
-                        MATCH (node) WHERE node.unique_id = '{self._escape_string(node_id)}'
-                        MATCH (source:Source) WHERE source.name = '{self._escape_string(full_source_name)}'
-                        MERGE (node)-[:DEPENDS_ON]->(source)
-                    """
-                    try:
-                        self.graph.query(query)
-                        count += 1
-                    except Exception as e:
-                        logger.error(f"Error merging source dependency {node_id} -> {full_source_name}: {e}")
-        logger.info(f"Merged {count} DEPENDS_ON relationships to sources")
-
-    def _merge_macro_relationships(self, nodes: Dict[str, Any]):
-        count = 0
-        for node_id, node_data in nodes.items():
-            for macro in node_data.get('depends_on', {}).get('macros', []):
-                query = f"""
-                    MATCH (node) WHERE node.unique_id = '{self._escape_string(node_id)}'
-                    MATCH (macro:Macro) WHERE macro.unique_id = '{self._escape_string(macro)}'
-                    MERGE (node)-[:USES_MACRO]->(macro)
-                """
-                try:
-                    self.graph.query(query)
-                    count += 1
-                except Exception as e:
-                    logger.error(f"Error merging macro usage {node_id} -> {macro}: {e}")
-        logger.info(f"Merged {count} USES_MACRO relationships")
-
-    def _merge_test_relationships(self, tests: Dict[str, Any]):
-        count = 0
-        for test_id, test_data in tests.items():
-            attached_node = test_data.get('attached_node')
-            if attached_node:
-                query = f"""
-                    MATCH (test:Test) WHERE test.unique_id = '{self._escape_string(test_id)}'
-                    MATCH (node) WHERE node.unique_id = '{self._escape_string(attached_node)}'
-                    MERGE (test)-[:TESTS]->(node)
-                """
-                try:
-                    self.graph.query(query)
-                    count += 1
-                except Exception as e:
-                    logger.error(f"Error merging test relationship {test_id} -> {attached_node}: {e}")
-        logger.info(f"Merged {count} TESTS relationships")
-
-    def incremental_update_from_files(self, old_manifest_path: str, new_manifest_path: str, catalog_path: str = None):
-        """Incrementally update the graph based on the diff between two manifest files."""
-        logger.info("Starting incremental FalkorDB update")
-
-        old_manifest_data, _ = self.load_manifest_data(old_manifest_path)
-        new_manifest_data, catalog_data = self.load_manifest_data(new_manifest_path, catalog_path)
-
-        added, changed, removed = self._diff_manifests(old_manifest_data, new_manifest_data)
-        logger.info(f"Diff: {len(added)} added, {len(changed)} changed, {len(removed)} removed")
-
-        if removed:
-            self._delete_nodes(removed)
-
-        if changed:
-            self._delete_outgoing_relationships(changed)
-
-        to_upsert = added | changed
-        if not to_upsert:
-            logger.info("Nothing to update")
-            return
-
-        new_nodes = new_manifest_data.get('nodes', {})
-        new_sources = new_manifest_data.get('sources', {})
-        new_macros = new_manifest_data.get('macros', {})
-        parent_map = new_manifest_data.get('parent_map', {})
-        child_map = new_manifest_data.get('child_map', {})
-        catalog_nodes = catalog_data.get('nodes', {})
-
-        models = {k: v for k, v in new_nodes.items() if k in to_upsert and v.get('resource_type') == 'model'}
-        tests = {k: v for k, v in new_nodes.items() if k in to_upsert and v.get('resource_type') == 'test'}
-        seeds = {k: v for k, v in new_nodes.items() if k in to_upsert and v.get('resource_type') == 'seed'}
-        snapshots = {k: v for k, v in new_nodes.items() if k in to_upsert and v.get('resource_type') == 'snapshot'}
-        operations = {k: v for k, v in new_nodes.items() if k in to_upsert and v.get('resource_type') == 'operation'}
-        sources = {k: v for k, v in new_sources.items() if k in to_upsert}
-        macros = {k: v for k, v in new_macros.items() if k in to_upsert}
-
-        self._upsert_models(models, catalog_nodes)
-        self._upsert_sources(sources)
-        self._upsert_seeds(seeds)
-        self._upsert_snapshots(snapshots)
-        self._upsert_tests(tests)
-        self._upsert_macros(macros)
-        self._upsert_operations(operations)
-
-        filtered_parent_map = {k: v for k, v in parent_map.items() if k in to_upsert}
-        self._merge_dependencies(filtered_parent_map, child_map)
-
-        all_upserted_nodes = {**models, **tests, **seeds, **snapshots, **operations}
-        self._merge_ref_relationships(all_upserted_nodes)
-        self._merge_source_relationships(all_upserted_nodes)
-        self._merge_macro_relationships(all_upserted_nodes)
-        self._merge_test_relationships(tests)
-
-        logger.info("Incremental update completed")
-
+                if streaming:
+                    self._load_manifest_streaming(manifest_path, catalog_path, fingerprint)
+                else:
+                    with profile.phase('parse'):
+                        manifest_data, catalog_data = self.load_manifest_data(manifest_path, catalog_path)
+                        manifest = Manifest.from_dict(manifest_data, self.column_lineage, consume=True)
+                    self._load_manifest(manifest, catalog_data)
+                self.record_load(fingerprint)
+                if before_promote is not None:
+                    with profile.phase('before_promote'):
+                        before_promote(staging)
+                with profile.phase('promote'):
+                    self.promote(staging)
+            finally:
+                # A failed load leaves the staging slot to the next blue/green load
+                self.staging = None
+            
+            logger.info("DBT to FalkorDB load process completed successfully")
+        return profile
+    
     def get_graph_stats(self):
         """Get statistics about the created graph"""
         try:
@@ -0,0 +1,253 @@
+"""Embedded, serverless backend on the Kuzu graph engine.
+
+The graph lives in an on-disk database file, so loading and querying need
+no running server. Kuzu tables are typed, so a load exports the manifest as CSV
+files (the same projections and relationship set as the other backends),
+creates one node table per label and one relationship table per type from
+them, and bulk-loads every file with ``COPY ... FROM``.
+"""
+
+import logging
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..manifest import Manifest, loads, read_json
+from .bulk_export import BulkExporter, _quote
+from .falkordb_loader import DBTFalkorDBLoader
+from .profiling import LoadProfile
+
+try:
+    import kuzu
+except ImportError:  # pragma: no cover - optional backend
+    kuzu = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KUZU_DB_PATH = 'dbt_graph.kuzu'
+
+
+def connect(db_path: str, read_only: bool = False):
+    """Open a Kuzu database; returns the database and a connection to it"""
+    if kuzu is None:
+        raise ImportError("The Kuzu backend needs the kuzu package: pip install 'dbt-graph-loader[kuzu]'")
+    if not read_only:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    database = kuzu.Database(db_path, read_only=read_only)
+    return database, kuzu.Connection(database)
+
+
+def query_rows(conn, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Run a Cypher query and return its rows as dicts keyed by column name"""
+    result = conn.execute(query, parameters or {})
+    columns = result.get_column_names()
+    rows = []
+    while result.has_next():
+        rows.append(dict(zip(columns, result.get_next())))
+    return rows
+
+
+def _path_literal(path: Path) -> str:
+    return "'" + path.as_posix().replace("'", "\\'") + "'"
+
+
+class DBTKuzuLoader(BulkExporter):
+    """Load DBT manifest and catalog data into an embedded Kuzu database.
+
+    Every load is a full reload: the dbt tables are dropped and rebuilt with
+    bulk ``COPY`` statements, which is also how Kuzu ingests fastest.
+    """
+
+    backend_name = 'Kuzu'
+    TYPE_NAMES = {bool: 'BOOLEAN', int: 'INT64', float: 'DOUBLE'}
+    STRING_TYPE = 'STRING'
+
+    # Values are stored as scalars, exactly as by the FalkorDB loader
+    _param_value = DBTFalkorDBLoader._param_value
+    _clean_properties = DBTFalkorDBLoader._clean_properties
+    _prepare_row = DBTFalkorDBLoader._prepare_row
+    _tags = DBTFalkorDBLoader._tags
+
+    def __init__(self, db_path: str = DEFAULT_KUZU_DB_PATH, staging_dir: str = None,
+                 dbt_labels_only: bool = False, column_lineage: bool = False):
+        """Open (or create) the database at db_path.
+
+        The CSV files are written to staging_dir and kept, or to a temporary
+        directory removed after the load.
+        """
+        super().__init__(staging_dir or '', column_lineage)
+        self.dbt_labels_only = dbt_labels_only
+        self.db_path = db_path
+        self.staging_dir = staging_dir
+        self.db, self.conn = connect(db_path)
+
+    def close(self):
+        """Close the connection and release the database"""
+        self.conn.close()
+        self.db.close()
+
+    def create_constraints(self):
+        """Node tables are keyed by unique_id, which Kuzu indexes itself"""
+
+    def _node_header(self, label: str, columns: List[str], types: List[str]) -> List[str]:
+        return columns
+
+    def _edge_header(self) -> List[str]:
+        return ['from', 'to']
+
+    def _edge_file_key(self, src: str, dst: str, rel_type: str) -> Tuple[str, str, str]:
+        # COPY into a relationship table takes one FROM/TO label pair per file
+        return rel_type, self.node_labels[src], self.node_labels[dst]
+
+    def _write_edge_file(self, key: Tuple[str, str, str], pairs: List[Tuple[str, str]]) -> Path:
+        rel_type, src_label, dst_label = key
+        path = self.output_dir / f"{rel_type}_{src_label}_{dst_label}.csv"
+        self._write_csv(path, self._edge_header(), ([_quote(src), _quote(dst)] for src, dst in pairs))
+        logger.info(f"Exported {len(pairs)} {rel_type} relationships ({src_label} -> {dst_label}) to {path}")
+        return path
+
+    def _tables(self) -> List[Tuple[str, str]]:
+        """(name, type) of every table in the database"""
+        return [(row['name'], row['type']) for row in query_rows(self.conn, "CALL show_tables() RETURN name, type")]
+
+    def _connected_tables(self, rel_table: str) -> set:
+        rows = self.conn.execute(f"CALL show_connection('{rel_table}') RETURN *")
+        tables = set()
+        while rows.has_next():
+            src, dst = rows.get_next()[:2]
+            tables.update((src, dst))
+        return tables
+
+    def _drop_tables(self, labels: Optional[List[str]]):
+        """Drop the node tables of labels (all when None) and every relationship table touching them.
+
+        Relationship tables go first, since Kuzu will not drop a node table they reference.
+        """
+        tables = self._tables()
+        node_tables = [name for name, table_type in tables
+                       if table_type == 'NODE' and (labels is None or name in labels)]
+        rel_tables = [name for name, table_type in tables
+                      if table_type != 'NODE'
+                      and (labels is None or self._connected_tables(name) & set(node_tables))]
+        for name in rel_tables + node_tables:
+            self.conn.execute(f"DROP TABLE `{name}`")
+        logger.info(f"Dropped {len(node_tables)} node and {len(rel_tables)} relationship tables")
+
+    def _clear_all(self):
+        self._drop_tables(None)
+
+    def _clear_in_batches(self, labels: Optional[List[str]]):
+        # Dropping a table is already a single bounded operation
+        self._drop_tables(labels)
+
+    def _create_schema(self, edge_files: Dict[Tuple[str, str, str], Path]):
+        for label, columns in self.node_columns.items():
+            properties = ', '.join(f"`{column}` {column_type}" for column, column_type in columns)
+            self.conn.execute(f"CREATE NODE TABLE `{label}`({properties}, PRIMARY KEY (unique_id))")
+
+        for rel_type, ends in self._rel_table_ends(edge_files).items():
+            pairs = ', '.join(f"FROM `{src_label}` TO `{dst_label}`" for src_label, dst_label in ends)
+            self.conn.execute(f"CREATE REL TABLE `{rel_type}`({pairs})")
+
+    @staticmethod
+    def _rel_table_ends(edge_files: Dict[Tuple[str, str, str], Path]) -> Dict[str, List[Tuple[str, str]]]:
+        ends = defaultdict(list)
+        for rel_type, src_label, dst_label in edge_files:
+            ends[rel_type].append((src_label, dst_label))
+        return ends
+
+    def _copy(self, table: str, path: Path, options: str):
+        start = time.perf_counter()
+        self.conn.execute(f"COPY `{table}` FROM {_path_literal(path)} ({options})")
+        self.profile.record(rows=self.file_rows.get(path, 0), queries=1)
+        logger.info(f"Copied {path.name} into {table} in {time.perf_counter() - start:.2f}s")
+
+    def _bulk_load(self, manifest: Manifest, catalog_data: Dict[str, Any]):
+        profile = self.profile
+        with profile.phase('export'):
+            node_files, edge_files = self.export(manifest, catalog_data)
+        with profile.phase('clear'):
+            self.clear_database()
+        with profile.phase('schema'):
+            self._create_schema(edge_files)
+
+        with profile.phase('nodes'):
+            for label, path in node_files.items():
+                # Descriptions and compiled SQL contain quoted newlines, which only the serial reader handles
+                self._copy(label, path, "HEADER=true, PARALLEL=false")
+        ends = self._rel_table_ends(edge_files)
+        with profile.phase('relationships'):
+            for (rel_type, src_label, dst_label), path in edge_files.items():
+                options = "HEADER=true"
+                if len(ends[rel_type]) > 1:
+                    options += f", from='{src_label}', to='{dst_label}'"
+                self._copy(rel_type, path, options)
+
+    def load_parsed_manifest(self, manifest: Manifest, catalog_data: Optional[Dict[str, Any]] = None) -> LoadProfile:
+        """Rebuild the graph from an already-parsed manifest"""
+        catalog_data = catalog_data or {}
+        with self._profiled('load') as profile:
+            if self.staging_dir is not None:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                self._bulk_load(manifest, catalog_data)
+                return profile
+            with tempfile.TemporaryDirectory(prefix='dbt_kuzu_') as staging:
+                self.output_dir = Path(staging)
+                self._bulk_load(manifest, catalog_data)
+        return profile
+
+    def load_dbt_to_kuzu_from_strings(self, manifest_str: str, catalog_str: Optional[str] = None) -> LoadProfile:
+        """Main method to load DBT data into Kuzu from string content"""
+        with self._profiled('load') as profile:
+            logger.info("Starting DBT to Kuzu load process from strings")
+            with profile.phase('parse'):
+                catalog_data = loads(catalog_str) if catalog_str else {}
+                manifest = Manifest.from_dict(loads(manifest_str), self.column_lineage, consume=True)
+            self.load_parsed_manifest(manifest, catalog_data)
+            logger.info("DBT to Kuzu load process completed successfully")
+        return profile
+
+    def load_dbt_to_kuzu(self, manifest_path: str, catalog_path: str = None) -> LoadProfile:
+        """Main method to load DBT data into Kuzu from file paths"""
+        with self._profiled('load') as profile:
+            logger.info("Starting DBT to Kuzu load process")
+            with profile.phase('parse'):
+                catalog_data = {}
+                if catalog_path and Path(catalog_path).exists():
+                    catalog_data = read_json(catalog_path)
+                manifest = Manifest.from_file(manifest_path, self.column_lineage)
+            self.load_parsed_manifest(manifest, catalog_data)
+            logger.info("DBT to Kuzu load process completed successfully")
+        return profile
+
+    def incremental_update(self, old_manifest: Manifest, new_manifest: Manifest,
+                           catalog_data: Optional[Dict[str, Any]] = None):
+        raise NotImplementedError("Kuzu graphs are rebuilt by a full bulk load; incremental updates are not supported")
+
+    def get_graph_stats(self):
+        """Get statistics about the created graph"""
+        try:
+            node_rows = query_rows(self.conn, """
+                MATCH (n)
+                RETURN label(n) AS node_type, count(*) AS count
+                ORDER BY count DESC
+            """)
+            rel_rows = query_rows(self.conn, """
+                MATCH ()-[r]->()
+                RETURN label(r) AS relationship_type, count(*) AS count
+                ORDER BY count DESC
+            """)
+
+            print("\n=== Graph Statistics ===")
+            print("\nNode counts:")
+            for row in node_rows:
+                print(f"  {row['node_type']}: {row['count']}")
+
+            print("\nRelationship counts:")
+            for row in rel_rows:
+                print(f"  {row['relationship_type']}: {row['count']}")
+
+        except Exception as e:
+            logger.error(f"Error getting graph statistics: {e}")
@@ -0,0 +1,131 @@
+"""Transitive lineage closure computed at load time.
+
+"Everything upstream/downstream of X" otherwise needs a variable-length
+DEPENDS_ON traversal, which gets slow on wide DAGs. A load therefore also
+writes the closure of the dependency DAG as
+``(ancestor)-[:ANCESTOR_OF]->(descendant)`` relationships, and gives every node
+its ``lineage_depth`` (the longest DEPENDS_ON path down to a root), so full
+lineage is a single hop from an index-backed ``unique_id`` lookup.
+
+The closure only links models, seeds, snapshots and sources: a test would add
+an edge for every ancestor of the model it checks, and tests usually outnumber
+models. Tests still get their ``lineage_depth``.
+
+Ancestor sets are int bitsets built in topological order: a node's set is the
+union of its parents' sets and the parents' own bits. Only nodes something
+depends on get a bit, so leaves such as tests do not widen the bitsets.
+"""
+
+import logging
+from collections import defaultdict, deque
+from typing import Dict, Any, Iterator, List
+
+from .common import Edge, RELATION_LABELS
+
+logger = logging.getLogger(__name__)
+
+ANCESTOR_OF = 'ANCESTOR_OF'
+
+# Labels of the nodes linked by ANCESTOR_OF relationships
+CLOSURE_LABELS = frozenset(RELATION_LABELS)
+
+
+def _bit_positions(bits: int) -> Iterator[int]:
+    # Scanning the binary string is done in C; only set bits cost a Python step
+    digits = bin(bits)[:1:-1]
+    position = digits.find('1')
+    while position >= 0:
+        yield position
+        position = digits.find('1', position + 1)
+
+
+def lineage_depth_query(label: str) -> str:
+    """UNWIND query setting lineage_depth on nodes of one label"""
+    return f"""
+        UNWIND $rows AS row
+        MATCH (n:{label} {{unique_id: row.unique_id}})
+        SET n.lineage_depth = row.lineage_depth
+    """
+
+
+class Lineage:
+    """Ancestor sets and depths of the DAG described by a manifest parent_map"""
+
+    def __init__(self, parent_map: Dict[str, List[str]]):
+        self.parents: Dict[str, List[str]] = {}
+        children = defaultdict(list)
+        for child, parents in parent_map.items():
+            unique_parents = [parent for parent in dict.fromkeys(parents) if parent != child]
+            self.parents[child] = unique_parents
+            for parent in unique_parents:
+                children[parent].append(child)
+                self.parents.setdefault(parent, [])
+
+        # unique_id -> longest path to a root
+        self.depths: Dict[str, int] = {}
+        # Bitsets of nodes with children; a leaf's set is derived from its parents
+        self._ancestors: Dict[str, int] = {}
+        self._bit: Dict[str, int] = {}
+        self._ids: List[str] = []
+
+        remaining = {uid: len(parents) for uid, parents in self.parents.items()}
+        ready = deque(uid for uid, count in remaining.items() if not count)
+        while ready:
+            uid = ready.popleft()
+            parents = self.parents[uid]
+            self.depths[uid] = max((self.depths[parent] + 1 for parent in parents), default=0)
+            if uid in children:
+                self._ancestors[uid] = self._union(parents)
+                self._bit[uid] = len(self._ids)
+                self._ids.append(uid)
+                for child in children[uid]:
+                    remaining[child] -= 1
+                    if not remaining[child]:
+                        ready.append(child)
+
+        if len(self.depths) < len(self.parents):
+            logger.warning(f"{len(self.parents) - len(self.depths)} nodes are in or downstream of a dependency "
+                           f"cycle and have no lineage closure")
+
+    def _union(self, parents: List[str]) -> int:
+        bits = 0
+        for parent in parents:
+            bits |= self._ancestors[parent] | (1 << self._bit[parent])
+        return bits
+
+    def ancestors(self, unique_id: str) -> List[str]:
+        """Every node unique_id transitively depends on"""
+        if unique_id not in self.depths:
+            return []
+        bits = self._ancestors.get(unique_id)
+        if bits is None:
+            bits = self._union(self.parents[unique_id])
+        return [self._ids[position] for position in _bit_positions(bits)]
+
+    def ancestor_edges(self, labels: Dict[str, str]) -> Iterator[Edge]:
+        """One ANCESTOR_OF edge from every ancestor to each of its descendants labelled with a CLOSURE_LABELS label"""
+        count = 0
+        for uid in self.depths:
+            if labels.get(uid) not in CLOSURE_LABELS:
+                continue
+            for ancestor in self.ancestors(uid):
+                if labels.get(ancestor) in CLOSURE_LABELS:
+                    count += 1
+                    yield ancestor, uid, ANCESTOR_OF
+        logger.info(f"Lineage closure has {count} ANCESTOR_OF relationships")
+
+    def depth_rows(self, labels: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+        """lineage_depth rows of the loaded nodes, grouped by label"""
+        rows = defaultdict(list)
+        for uid, depth in self.depths.items():
+            label = labels.get(uid)
+            if label is not None:
+                rows[label].append({'unique_id': uid, 'lineage_depth': depth})
+        return dict(rows)
+
+    def with_depth(self, unique_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """A node's property map including its lineage_depth, when it is part of the DAG"""
+        depth = self.depths.get(unique_id)
+        if depth is None:
+            return properties
+        return {**properties, 'lineage_depth': depth}
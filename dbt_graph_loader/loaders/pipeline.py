@@ -0,0 +1,158 @@
+"""Bounded hand-off between the stages of a pipelined load.
+
+A pipelined load decodes and projects the manifest while earlier batches are
+still being written, instead of one after the other. ``WriterPool`` drains
+batches from one bounded queue per writer thread, and ``ProcessStage`` can move
+the decoding and projection into a child process, so that CPU-bound JSON and
+property work does not compete with the writers for the GIL. Every queue
+blocks the stage feeding it when full, so memory stays bounded by the queue
+sizes whatever the manifest size.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Batches that may wait in the queue of each writer
+DEFAULT_QUEUE_SIZE = 4
+
+# Ends a writer thread, or the items of a ProcessStage
+_STOP = None
+
+
+class WriterPool:
+    """Writer threads, each draining its own bounded queue of batches"""
+
+    def __init__(self, write: Callable[[str, List[Any], str], int], workers: int, batch_size: int,
+                 queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.write = write
+        self.batch_size = batch_size
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in range(workers)]
+        # (query, description) -> rows of partitioned writes not yet queued, per writer
+        self.partitions: Dict[Tuple[str, str], List[List[Any]]] = {}
+        self.error: Optional[BaseException] = None
+        # Seconds the producer waited on full queues, and the writers on empty ones
+        self.blocked_seconds = 0.0
+        self.idle_seconds = [0.0] * workers
+        self._lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._drain, args=(index,), name=f'graph-writer_{index}', daemon=True)
+                        for index in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def _drain(self, index: int):
+        jobs = self.queues[index]
+        while True:
+            start = time.perf_counter()
+            job = jobs.get()
+            self.idle_seconds[index] += time.perf_counter() - start
+            try:
+                if job is _STOP:
+                    return
+                # After a failure the remaining batches are dropped; join() raises the error
+                if self.error is None:
+                    self.write(*job)
+            except BaseException as e:
+                with self._lock:
+                    if self.error is None:
+                        self.error = e
+            finally:
+                jobs.task_done()
+
+    def _put(self, index: int, job: Tuple[str, List[Any], str]):
+        if self.error is not None:
+            raise self.error
+        start = time.perf_counter()
+        self.queues[index].put(job)
+        self.blocked_seconds += time.perf_counter() - start
+
+    def submit(self, query: str, rows: List[Any], description: str, partition_key: Callable[[Any], str] = None):
+        """Queue rows in batch_size batches, blocking while the writers are behind.
+
+        Without a partition_key, each batch goes to the writer with the
+        shortest queue. With one, every row goes to the writer picked by hash of
+        its key, so concurrent transactions never lock the same key; those rows
+        are held until a full batch is collected or join() is called.
+        """
+        if partition_key is None or len(self.queues) == 1:
+            for start in range(0, len(rows), self.batch_size):
+                index = min(range(len(self.queues)), key=lambda i: self.queues[i].qsize())
+                self._put(index, (query, rows[start:start + self.batch_size], description))
+            return
+        buckets = self.partitions.setdefault((query, description), [[] for _ in self.queues])
+        for row in rows:
+            index = hash(partition_key(row)) % len(self.queues)
+            buckets[index].append(row)
+            if len(buckets[index]) >= self.batch_size:
+                self._put(index, (query, buckets[index], description))
+                buckets[index] = []
+
+    def join(self):
+        """Queue the rows partitions still hold and wait until every batch is written"""
+        for (query, description), buckets in self.partitions.items():
+            for index, rows in enumerate(buckets):
+                if rows:
+                    self._put(index, (query, rows, description))
+        self.partitions.clear()
+        for jobs in self.queues:
+            jobs.join()
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        """Stop the writer threads once their queues are drained"""
+        for jobs in self.queues:
+            jobs.put(_STOP)
+        for thread in self.threads:
+            thread.join()
+        logger.info(f"Pipeline: producer blocked {self.blocked_seconds:.2f}s on full writer queues, writers idle "
+                    f"{sum(self.idle_seconds):.2f}s in total waiting for batches")
+
+
+def _produce(stage: Callable[..., Iterator[Any]], args: Tuple, items: multiprocessing.Queue):
+    try:
+        for item in stage(*args):
+            items.put(item)
+    except BaseException as e:
+        items.put(('error', ''.join(traceback.format_exception_only(type(e), e)).strip()))
+    items.put(_STOP)
+
+
+class ProcessStage:
+    """The items of stage(*args), produced in a child process through a bounded queue.
+
+    The child starts right away. stage and args must be picklable, e.g. a
+    module-level function; an exception in the child is raised as a
+    RuntimeError by the iteration.
+    """
+
+    def __init__(self, stage: Callable[..., Iterator[Any]], args: Tuple, queue_size: int):
+        self.items = multiprocessing.Queue(maxsize=queue_size)
+        self.process = multiprocessing.Process(target=_produce, args=(stage, args, self.items),
+                                               name='dbt-pipeline-stage', daemon=True)
+        self.process.start()
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                item = self.items.get(timeout=1.0)
+            except queue.Empty:
+                if not self.process.is_alive() and self.items.empty():
+                    raise RuntimeError(f"Pipeline stage exited with code {self.process.exitcode}")
+                continue
+            if item is _STOP:
+                return
+            if item[0] == 'error':
+                raise RuntimeError(f"Pipeline stage failed: {item[1]}")
+            yield item
+
+    def close(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
@@ -0,0 +1,228 @@
+"""Per-phase timing and throughput of a load.
+
+A loader opens one phase per step of a load (parsing, clearing, node writes,
+relationship writes, ...). Every batch sent while a phase is open is counted
+against it, so a report shows where the wall time of a load went, how many rows
+and queries each phase sent, how many transactions were retried or failed,
+and the memory high-water mark of the process at the end of each phase.
+
+Writer threads record into the phase opened by the thread orchestrating the
+load, so phases must not overlap.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+# Phase that writes made outside any open phase are counted against
+UNPHASED = 'other'
+
+
+def peak_rss() -> Optional[int]:
+    """Memory high-water mark of the process in bytes, when the platform reports it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def current_rss() -> Optional[int]:
+    """Resident memory of the process in bytes right now; None where /proc is not available"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _mib(size: Optional[int]) -> str:
+    return '-' if size is None else f"{size / 1024 / 1024:.1f} MiB"
+
+
+def _label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class PhaseStats:
+    """Counters of one phase; a phase entered several times accumulates"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.rows = 0
+        self.queries = 0
+        self.retries = 0
+        self.failed = 0
+        # Process high-water mark at the end of the phase, and how much the phase raised it
+        self.peak_rss: Optional[int] = None
+        self.rss_growth = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'phase': self.name,
+            'seconds': round(self.seconds, 6),
+            'rows': self.rows,
+            'rows_per_second': round(self.rows_per_second, 1),
+            'queries': self.queries,
+            'retries': self.retries,
+            'failed_batches': self.failed,
+            'peak_rss_bytes': self.peak_rss,
+            'rss_growth_bytes': self.rss_growth,
+        }
+
+
+class LoadProfile:
+    """Report of one load or incremental update, phase by phase"""
+
+    # (metric, PhaseStats attribute, help text) exported as Prometheus gauges
+    METRICS = [
+        ('phase_seconds', 'seconds', 'Wall time spent in the phase'),
+        ('phase_rows', 'rows', 'Rows written or deleted in the phase'),
+        ('phase_rows_per_second', 'rows_per_second', 'Rows per second of wall time in the phase'),
+        ('phase_queries', 'queries', 'Queries sent in the phase'),
+        ('phase_retries', 'retries', 'Transactions retried in the phase'),
+        ('phase_failed_batches', 'failed', 'Batches that failed and were skipped in the phase'),
+        ('phase_peak_rss_bytes', 'peak_rss', 'Process memory high-water mark at the end of the phase'),
+    ]
+
+    def __init__(self, operation: str = 'load', backend: str = 'graph'):
+        self.operation = operation
+        self.backend = backend
+        self.phases: Dict[str, PhaseStats] = {}
+        self.total_seconds = 0.0
+        self.peak_rss: Optional[int] = None
+        # Set when the content was already loaded and the operation did nothing
+        self.skipped = False
+        self._current: Optional[PhaseStats] = None
+        self._lock = threading.Lock()
+
+    def _stats(self, name: str) -> PhaseStats:
+        if name not in self.phases:
+            self.phases[name] = PhaseStats(name)
+        return self.phases[name]
+
+    @contextmanager
+    def run(self):
+        """Time the whole operation"""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.total_seconds += time.perf_counter() - start
+            self.peak_rss = peak_rss()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Count the wall time and every batch recorded until the block exits against phase name"""
+        with self._lock:
+            stats = self._stats(name)
+        previous = self._current
+        self._current = stats
+        rss_before = peak_rss()
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.peak_rss = peak_rss()
+            if rss_before is not None:
+                stats.rss_growth += stats.peak_rss - rss_before
+            self._current = previous
+
+    def record(self, rows: int = 0, queries: int = 0, retries: int = 0, failed: int = 0):
+        """Add to the counters of the open phase; safe to call from writer threads"""
+        with self._lock:
+            stats = self._current or self._stats(UNPHASED)
+            stats.rows += rows
+            stats.queries += queries
+            stats.retries += retries
+            stats.failed += failed
+
+    @property
+    def current_phase(self) -> Optional[str]:
+        """Name of the phase open right now, if any"""
+        current = self._current
+        return current.name if current else None
+
+    @property
+    def rows(self) -> int:
+        """Rows recorded so far across all phases"""
+        with self._lock:
+            return sum(stats.rows for stats in self.phases.values())
+
+    def ranked(self) -> List[PhaseStats]:
+        """Phases by wall time, slowest first"""
+        return sorted(self.phases.values(), key=lambda stats: stats.seconds, reverse=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'operation': self.operation,
+            'backend': self.backend,
+            'total_seconds': round(self.total_seconds, 6),
+            'peak_rss_bytes': self.peak_rss,
+            'skipped': self.skipped,
+            'phases': [stats.to_dict() for stats in self.phases.values()],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """The report in the Prometheus text exposition format, e.g. for the node_exporter textfile collector"""
+        base = f'operation="{_label_value(self.operation)}",backend="{_label_value(self.backend)}"'
+        lines = [
+            '# HELP dbt_graph_loader_seconds Wall time of the whole operation',
+            '# TYPE dbt_graph_loader_seconds gauge',
+            f'dbt_graph_loader_seconds{{{base}}} {self.total_seconds:.6f}',
+            '# HELP dbt_graph_loader_skipped 1 when the content was unchanged and the operation was skipped',
+            '# TYPE dbt_graph_loader_skipped gauge',
+            f'dbt_graph_loader_skipped{{{base}}} {int(self.skipped)}',
+        ]
+        for metric, attribute, help_text in self.METRICS:
+            lines.append(f'# HELP dbt_graph_loader_{metric} {help_text}')
+            lines.append(f'# TYPE dbt_graph_loader_{metric} gauge')
+            for stats in self.phases.values():
+                value = getattr(stats, attribute)
+                if value is None:
+                    continue
+                if isinstance(value, float):
+                    value = f"{value:.6f}"
+                lines.append(f'dbt_graph_loader_{metric}{{{base},phase="{_label_value(stats.name)}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Write the report as Prometheus text (.prom or .txt) or JSON (anything else)"""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def format_table(self) -> str:
+        """Ranked breakdown of the phases, for printing"""
+        lines = [
+            f"{self.backend} {self.operation}: {self.total_seconds:.2f}s total, peak RSS {_mib(self.peak_rss)}"
+            + (" (unchanged, skipped)" if self.skipped else ''),
+            f"{'phase':<16} {'seconds':>9} {'share':>7} {'rows':>10} {'rows/s':>10} {'queries':>8} "
+            f"{'retries':>8} {'failed':>7} {'peak RSS':>12}",
+        ]
+        for stats in self.ranked():
+            share = stats.seconds / self.total_seconds if self.total_seconds else 0.0
+            lines.append(
+                f"{stats.name:<16} {stats.seconds:>9.2f} {share:>7.1%} {stats.rows:>10} "
+                f"{stats.rows_per_second:>10.0f} {stats.queries:>8} {stats.retries:>8} {stats.failed:>7} "
+                f"{_mib(stats.peak_rss):>12}"
+            )
+        return '\n'.join(lines)
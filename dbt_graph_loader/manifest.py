@@ -0,0 +1,193 @@
+"""Compact, typed in-memory representation of a dbt manifest.
+
+A parsed ``manifest.json`` keeps every field of every node, including
+``raw_code``/``compiled_code``, docs blocks and the full config. The records
+below keep only what the graph loaders and the RAG indexer read, store it in
+``__slots__`` instead of per-node dicts, and intern the strings that repeat
+across thousands of nodes (resource types, package names, schemas and
+unique_ids in dependency lists). Nodes are partitioned by graph label once,
+while they are converted.
+"""
+
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Resource types that ref() can point at
+REFABLE_RESOURCE_TYPES = {'model', 'seed', 'snapshot'}
+
+# Graph label used for each manifest resource type that is loaded as a node
+RESOURCE_LABELS = {
+    'model': 'Model',
+    'source': 'Source',
+    'seed': 'Seed',
+    'snapshot': 'Snapshot',
+    'test': 'Test',
+    'macro': 'Macro',
+    'operation': 'Operation',
+}
+
+# Config keys projected onto graph nodes; the rest of the config is dropped
+CONFIG_KEYS = (
+    'materialized', 'enabled', 'tags', 'meta', 'access', 'delimiter',
+    'strategy', 'unique_key', 'updated_at', 'severity',
+)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON with orjson when it is installed, falling back to the stdlib"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: str) -> Any:
+    """Decode a JSON file with the fastest available decoder"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_ids(ids: Optional[Iterable[str]]) -> List[str]:
+    return [sys.intern(uid) for uid in ids or ()]
+
+
+class ManifestNode:
+    """One model, source, seed, snapshot, test, macro or operation of a manifest"""
+
+    __slots__ = (
+        'unique_id', 'resource_type', 'label', 'name', 'package_name', 'path', 'original_file_path',
+        'database', 'schema', 'alias', 'identifier', 'source_name', 'description', 'relation_name',
+        'language', 'version', 'checksum', 'config', 'columns', 'freshness', 'loader', 'column_name',
+        'test_metadata', 'arguments', 'refs', 'sources', 'depends_on_nodes', 'depends_on_macros',
+        'attached_node', 'raw_code', 'compiled_code',
+    )
+
+    def __init__(self, unique_id: str, data: Dict[str, Any], keep_code: bool = False):
+        resource_type = _intern(data.get('resource_type', ''))
+        self.unique_id = sys.intern(unique_id)
+        self.resource_type = resource_type
+        self.label = RESOURCE_LABELS.get(resource_type)
+        self.name = data.get('name', '')
+        self.package_name = _intern(data.get('package_name', ''))
+        self.path = data.get('path', '')
+        self.original_file_path = data.get('original_file_path', '')
+        self.database = _intern(data.get('database', ''))
+        self.schema = _intern(data.get('schema', ''))
+        self.alias = data.get('alias', '')
+        self.identifier = data.get('identifier')
+        self.source_name = _intern(data.get('source_name', ''))
+        self.description = data.get('description', '')
+        self.relation_name = data.get('relation_name', '')
+        self.language = _intern(data.get('language', 'sql'))
+        version = data.get('version')
+        self.version = str(version) if version is not None else None
+        checksum = data.get('checksum')
+        if isinstance(checksum, dict):
+            checksum = checksum.get('checksum', '')
+        self.checksum = str(checksum) if checksum else ''
+        config = data.get('config') or {}
+        self.config = {key: _intern(config[key]) for key in CONFIG_KEYS if key in config}
+        self.columns = data.get('columns') or {}
+        self.freshness = data.get('freshness') or {}
+        self.loader = data.get('loader', '')
+        self.column_name = data.get('column_name', '')
+        self.test_metadata = data.get('test_metadata') or {}
+        self.arguments = data.get('arguments') or []
+        self.refs = data.get('refs') or []
+        self.sources = data.get('sources') or []
+        depends_on = data.get('depends_on') or {}
+        self.depends_on_nodes = _intern_ids(depends_on.get('nodes'))
+        self.depends_on_macros = _intern_ids(depends_on.get('macros'))
+        attached_node = data.get('attached_node')
+        self.attached_node = sys.intern(attached_node) if attached_node else None
+        self.raw_code = data.get('raw_code') if keep_code else None
+        self.compiled_code = data.get('compiled_code') if keep_code else None
+
+    def strip(self) -> 'ManifestNode':
+        """Drop everything but the fields relationships are derived from, in place"""
+        self.description = self.relation_name = ''
+        self.config, self.columns, self.freshness, self.test_metadata = {}, {}, {}, {}
+        self.arguments = []
+        self.raw_code = self.compiled_code = None
+        return self
+
+    def __repr__(self):
+        return f"ManifestNode({self.unique_id!r})"
+
+
+class Manifest:
+    """The loadable part of a manifest: node records, their labels and the parent_map.
+
+    ``nodes``, ``sources`` and ``macros`` mirror the manifest sections (only
+    resource types that become graph nodes are kept); ``by_label`` holds the
+    same records partitioned by graph label.
+    """
+
+    __slots__ = ('nodes', 'sources', 'macros', 'by_label', 'parent_map', 'metadata')
+
+    def __init__(self):
+        self.nodes: Dict[str, ManifestNode] = {}
+        self.sources: Dict[str, ManifestNode] = {}
+        self.macros: Dict[str, ManifestNode] = {}
+        self.by_label: Dict[str, Dict[str, ManifestNode]] = {label: {} for label in RESOURCE_LABELS.values()}
+        self.parent_map: Dict[str, List[str]] = {}
+        self.metadata: Dict[str, Any] = {}
+
+    def add(self, section: str, unique_id: str, data: Dict[str, Any], keep_code: bool = False) -> Optional[ManifestNode]:
+        """Convert one manifest entry and file it under its section and label"""
+        node = ManifestNode(unique_id, data, keep_code)
+        if node.label is None:
+            return None
+        getattr(self, section)[node.unique_id] = node
+        self.by_label[node.label][node.unique_id] = node
+        return node
+
+    @classmethod
+    def from_dict(cls, manifest_data: Dict[str, Any], keep_code: bool = False, consume: bool = False) -> 'Manifest':
+        """Build the IR from a decoded manifest in a single pass.
+
+        With ``consume`` the raw entries are popped from ``manifest_data`` as they
+        are converted, so they can be freed while the IR is being built.
+        """
+        manifest = cls()
+        manifest.metadata = manifest_data.get('metadata') or {}
+        for section in ('nodes', 'sources', 'macros'):
+            entries = manifest_data.get(section) or {}
+            if consume:
+                for unique_id in list(entries):
+                    manifest.add(section, unique_id, entries.pop(unique_id), keep_code)
+            else:
+                for unique_id, data in entries.items():
+                    manifest.add(section, unique_id, data, keep_code)
+        manifest.parent_map = {
+            sys.intern(child): _intern_ids(parents)
+            for child, parents in (manifest_data.get('parent_map') or {}).items()
+        }
+        return manifest
+
+    @classmethod
+    def from_json(cls, manifest_str: Union[str, bytes], keep_code: bool = False) -> 'Manifest':
+        """Parse a manifest JSON document"""
+        return cls.from_dict(loads(manifest_str), keep_code, consume=True)
+
+    @classmethod
+    def from_file(cls, manifest_path: str, keep_code: bool = False) -> 'Manifest':
+        """Parse a manifest.json file"""
+        return cls.from_dict(read_json(manifest_path), keep_code, consume=True)
+
+    def records(self) -> Dict[str, ManifestNode]:
+        """Every record, keyed by unique_id"""
+        return {**self.nodes, **self.sources, **self.macros}
+
+    def labels(self) -> Dict[str, str]:
+        """Map every unique_id that is loaded as a node to its graph label"""
+        return {uid: label for label, nodes in self.by_label.items() for uid in nodes}
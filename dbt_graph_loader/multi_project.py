@@ -0,0 +1,200 @@
+"""Load many dbt projects at once, each into its own named graph.
+
+Every project is an artifact directory holding a manifest.json and an optional
+catalog.json. Projects are loaded by a pool of threads, at most ``concurrency``
+at a time, and all loaders share one client: one FalkorDB connection pool, or
+one Neo4j driver writing each project to its own database. Most of a load is
+spent waiting on the database, so refreshing all projects takes about as long
+as the slowest one as long as the server keeps up.
+"""
+
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, List, Optional
+
+from falkordb import FalkorDB
+from neo4j import GraphDatabase
+
+from .fingerprint import _HEAD_SIZE, _metadata_value
+from .loaders.base import BaseDBTLoader, DEFAULT_BATCH_SIZE
+from .loaders.falkordb_loader import DBTFalkorDBLoader
+from .loaders.neo4j_loader import DBTNeo4jLoader
+from .loaders.profiling import LoadProfile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+
+
+def graph_name_for(project_name: str, backend: str, prefix: str = '') -> str:
+    """Graph (FalkorDB) or database (Neo4j) name of a project"""
+    name = prefix + project_name
+    if backend == 'neo4j':
+        # Neo4j database names are lowercase ASCII letters, digits, dots and dashes
+        return re.sub(r'[^a-z0-9.-]', '-', name.lower())
+    return re.sub(r'\W', '_', name, flags=re.ASCII)
+
+
+class Project:
+    """Artifacts of one dbt project and the graph they are loaded into"""
+
+    __slots__ = ('name', 'graph_name', 'manifest_path', 'catalog_path')
+
+    def __init__(self, name: str, graph_name: str, manifest_path: str, catalog_path: Optional[str] = None):
+        self.name = name
+        self.graph_name = graph_name
+        self.manifest_path = manifest_path
+        self.catalog_path = catalog_path
+
+    @classmethod
+    def from_directory(cls, directory: str, backend: str = 'falkordb', prefix: str = '',
+                       name: Optional[str] = None) -> 'Project':
+        """Project of an artifact directory, named after the project_name in its manifest unless name is given"""
+        manifest_path = os.path.join(directory, 'manifest.json')
+        if not os.path.isfile(manifest_path):
+            raise ValueError(f"No manifest.json in {directory}")
+        catalog_path = os.path.join(directory, 'catalog.json')
+        if name is None:
+            with open(manifest_path, 'rb') as f:
+                name = _metadata_value(f.read(_HEAD_SIZE), 'project_name')
+            name = name or os.path.basename(os.path.normpath(os.path.abspath(directory)))
+        return cls(name, graph_name_for(name, backend, prefix), manifest_path,
+                   catalog_path if os.path.isfile(catalog_path) else None)
+
+    def __repr__(self):
+        return f"Project({self.name!r}, graph={self.graph_name!r})"
+
+
+def find_projects(specs: Iterable[str], backend: str = 'falkordb', prefix: str = '') -> List[Project]:
+    """Projects of artifact directories given as DIR or NAME=DIR; every project needs a graph of its own"""
+    projects = []
+    for spec in specs:
+        name, separator, directory = spec.partition('=')
+        if not separator:
+            name, directory = None, spec
+        projects.append(Project.from_directory(directory, backend, prefix, name))
+    graphs: Dict[str, Project] = {}
+    for project in projects:
+        other = graphs.setdefault(project.graph_name, project)
+        if other is not project:
+            raise ValueError(f"{other.manifest_path} and {project.manifest_path} would both load into graph "
+                             f"{project.graph_name}; name them with NAME=DIR")
+    return projects
+
+
+class ProjectResult:
+    """Outcome of loading one project"""
+
+    def __init__(self, project: Project, seconds: float, profile: Optional[LoadProfile] = None,
+                 error: Optional[str] = None):
+        self.project = project
+        self.seconds = seconds
+        self.profile = profile
+        self.error = error
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return 'failed'
+        return 'skipped' if self.profile.skipped else 'loaded'
+
+    @property
+    def rows(self) -> int:
+        return self.profile.rows if self.profile else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'project': self.project.name,
+            'graph': self.project.graph_name,
+            'status': self.status,
+            'seconds': round(self.seconds, 3),
+            'rows': self.rows,
+            'error': self.error,
+            'profile': self.profile.to_dict() if self.profile else None,
+        }
+
+
+def _load_project(make_loader: Callable[[Project], BaseDBTLoader], project: Project, streaming: bool,
+                  blue_green: bool) -> ProjectResult:
+    start = time.perf_counter()
+    loader = None
+    try:
+        loader = make_loader(project)
+        logger.info(f"Loading project {project.name} into {project.graph_name}")
+        if isinstance(loader, DBTFalkorDBLoader):
+            if blue_green:
+                loader.load_dbt_to_falkordb_blue_green(project.manifest_path, project.catalog_path,
+                                                       streaming=streaming)
+            elif streaming:
+                loader.load_dbt_to_falkordb_streaming(project.manifest_path, project.catalog_path)
+            else:
+                loader.load_dbt_to_falkordb(project.manifest_path, project.catalog_path)
+        elif streaming:
+            loader.load_dbt_to_neo4j_streaming(project.manifest_path, project.catalog_path)
+        else:
+            loader.load_dbt_to_neo4j_from_files(project.manifest_path, project.catalog_path)
+        return ProjectResult(project, time.perf_counter() - start, loader.profile)
+    except Exception as e:
+        logger.error(f"Failed to load project {project.name}: {e}")
+        return ProjectResult(project, time.perf_counter() - start, loader.profile if loader else None, str(e))
+    finally:
+        if loader is not None:
+            loader.close()
+
+
+def load_projects(projects: List[Project], backend: str = 'falkordb', concurrency: int = DEFAULT_CONCURRENCY,
+                  host: str = 'localhost', port: int = 6379, uri: Optional[str] = None, username: str = None,
+                  password: str = None, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1,
+                  streaming: bool = False, blue_green: bool = False, column_lineage: bool = False,
+                  parse_processes: Optional[int] = None, force: bool = False, pipeline: bool = False,
+                  pipeline_process: bool = False, resume: bool = False) -> List[ProjectResult]:
+    """Load every project into its own graph, at most concurrency at a time; results are in project order.
+
+    A project that fails is reported in its result and does not stop the others.
+    pipeline (and pipeline_process) and resume imply streaming loads.
+    """
+    pipeline = pipeline or pipeline_process
+    streaming = streaming or pipeline or resume
+    options = dict(batch_size=batch_size, workers=workers, column_lineage=column_lineage,
+                   parse_processes=parse_processes, force=force, pipeline=pipeline, pipeline_process=pipeline_process,
+                   resume=resume)
+    if backend == 'falkordb':
+        client = FalkorDB(host=host, port=port, username=username, password=password)
+
+        def make_loader(project: Project) -> BaseDBTLoader:
+            return DBTFalkorDBLoader(graph_name=project.graph_name, db=client, **options)
+    elif backend == 'neo4j':
+        if blue_green:
+            raise ValueError("Blue/green loads are only supported by FalkorDB")
+        client = GraphDatabase.driver(uri, auth=(username, password))
+
+        def make_loader(project: Project) -> BaseDBTLoader:
+            return DBTNeo4jLoader(uri, username, password, database=project.graph_name, driver=client, **options)
+    else:
+        raise ValueError(f"Unsupported backend {backend}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='dbt-project') as executor:
+            return list(executor.map(lambda project: _load_project(make_loader, project, streaming, blue_green),
+                                     projects))
+    finally:
+        client.close()
+
+
+def format_summary(results: List[ProjectResult], total_seconds: float) -> str:
+    """Per-project timings, slowest first, for printing"""
+    lines = [f"{'project':<28} {'graph':<28} {'status':<8} {'seconds':>9} {'rows':>10} {'rows/s':>10}"]
+    for result in sorted(results, key=lambda result: result.seconds, reverse=True):
+        rate = result.rows / result.seconds if result.seconds else 0.0
+        lines.append(f"{result.project.name:<28} {result.project.graph_name:<28} {result.status:<8} "
+                     f"{result.seconds:>9.2f} {result.rows:>10} {rate:>10.0f}")
+    slowest = max((result.seconds for result in results), default=0.0)
+    lines.append(f"{len(results)} projects in {total_seconds:.2f}s (slowest project {slowest:.2f}s, "
+                 f"sum of all projects {sum(result.seconds for result in results):.2f}s)")
+    for result in results:
+        if result.error is not None:
+            lines.append(f"{result.project.name}: {result.error}")
+    return '\n'.join(lines)
@@ -0,0 +1,130 @@
+"""Incremental reader for large dbt artifacts.
+
+``json.load`` materialises the whole manifest, which for large monorepos means
+several GB of Python objects. The reader below walks the top-level object of
+the file and decodes one section entry at a time, so memory is bounded by the
+largest single entry plus the read buffer rather than by the file size.
+"""
+
+import json
+from typing import Any, Iterable, Iterator, Optional, TextIO, Tuple
+
+# Characters read from the file per refill
+READ_CHUNK_SIZE = 1 << 20
+_WHITESPACE = ' \t\n\r'
+_decoder = json.JSONDecoder()
+
+
+class _JSONStream:
+    """Sliding window over a JSON text file with just enough parsing to walk objects"""
+
+    def __init__(self, fp: TextIO, chunk_size: int = READ_CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, min_chars: int = 0) -> bool:
+        """Read more text into the buffer; returns False at end of file"""
+        if self.eof:
+            return False
+        # Drop consumed text so the buffer only holds what is still needed
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.fp.read(max(self.chunk_size, min_chars))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r} in JSON input")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value continues past the buffer: grow it and retry.
+                # Doubling keeps the number of retries logarithmic in the value size.
+                if not self._fill(len(self.buf)):
+                    raise
+                continue
+            # A number at the very end of the buffer may still be truncated
+            if end == len(self.buf) and not self.eof and self.buf[end - 1] not in '"]}el':
+                self._fill(len(self.buf))
+                continue
+            self.pos = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the object starting here; the caller consumes each value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' but found {separator!r} in JSON input")
+
+    def skip(self):
+        """Consume the next value; objects are skipped entry by entry to keep memory bounded"""
+        if self.peek() == '{':
+            for _ in self.iter_object():
+                self.skip()
+        else:
+            self.value()
+
+
+def iter_sections(path: str, sections: Iterable[str],
+                  chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Tuple[str, str, Any]]:
+    """Stream ``(section, key, value)`` for every entry of the requested top-level
+    object sections of a JSON artifact, in file order.
+
+    Sections that are not requested are skipped without being kept in memory.
+    """
+    wanted = set(sections)
+    with open(path, 'r', encoding='utf-8') as fp:
+        stream = _JSONStream(fp, chunk_size)
+        for section in stream.iter_object():
+            if section not in wanted or stream.peek() != '{':
+                stream.skip()
+                continue
+            for key in stream.iter_object():
+                yield section, key, stream.value()
+
+
+def read_section(path: str, section: str, chunk_size: int = READ_CHUNK_SIZE) -> Optional[Any]:
+    """Decode a single (small) top-level value such as ``metadata`` without loading the rest"""
+    with open(path, 'r', encoding='utf-8') as fp:
+        stream = _JSONStream(fp, chunk_size)
+        for key in stream.iter_object():
+            if key == section:
+                return stream.value()
+            stream.skip()
+    return None
@@ -0,0 +1,390 @@
+"""Synthetic dbt projects for load testing.
+
+The sample projects are a few hundred KB; production manifests are hundreds of
+MB. ``generate_project`` builds a manifest and catalog of any size with the
+shape of a real dbt project: sources feeding layered models whose DAG depth and
+fan-in are configurable, generic tests attached to model columns, project
+macros, documented columns, and compiled SQL that column lineage can trace.
+The same arguments and seed always produce the same project, so benchmark runs
+are comparable. ``mutate_project`` derives the next version of a project, for
+incremental updates.
+"""
+
+import hashlib
+import json
+import random
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+# Fixed so that the same arguments produce byte-identical files
+GENERATED_AT = '2025-01-01T00:00:00.000000Z'
+
+# Share of the graph nodes that are of each resource type in scaled_counts
+NODE_SHARES = {'models': 0.4, 'tests': 0.4, 'sources': 0.1, 'macros': 0.1}
+
+GENERIC_TESTS = ('not_null', 'unique', 'accepted_values', 'relationships')
+MATERIALIZATIONS = ('view', 'view', 'table', 'table', 'incremental', 'ephemeral')
+COLUMN_TYPES = ('integer', 'bigint', 'text', 'numeric', 'timestamp', 'boolean', 'date')
+WORDS = (
+    'customer', 'order', 'payment', 'invoice', 'account', 'session', 'product', 'event', 'refund',
+    'shipment', 'subscription', 'campaign', 'lead', 'ledger', 'inventory', 'supplier', 'region',
+)
+LAYERS = ('stg', 'int', 'fct', 'dim', 'mart', 'rpt', 'agg', 'snap')
+
+
+def scaled_counts(nodes: int) -> Dict[str, int]:
+    """Models, tests, sources and macros adding up to about nodes dbt resources"""
+    counts = {key: max(1, int(nodes * share)) for key, share in NODE_SHARES.items()}
+    counts['tests'] = max(0, nodes - counts['models'] - counts['sources'] - counts['macros'])
+    return counts
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _sentence(rng: random.Random, subject: str) -> str:
+    return f"{subject.replace('_', ' ').capitalize()} {rng.choice(WORDS)} records, one row per {rng.choice(WORDS)}."
+
+
+def _column_names(count: int) -> List[str]:
+    return ['id'] + [f"col_{i}" for i in range(1, count)]
+
+
+def _documented_columns(rng: random.Random, names: List[str], relation: str) -> Dict[str, Any]:
+    """Manifest column docs for about half of a relation's columns, as in a partly documented project"""
+    return {
+        name: {
+            'name': name, 'description': _sentence(rng, f"{relation} {name}"), 'meta': {}, 'data_type': None,
+            'constraints': [], 'quote': None, 'tags': [], 'granularity': None,
+        }
+        for name in names if name == 'id' or rng.random() < 0.5
+    }
+
+
+def _catalog_entry(rng: random.Random, uid: str, database: str, schema: str, name: str,
+                   table_type: str, columns: List[str]) -> Dict[str, Any]:
+    return {
+        'metadata': {'type': table_type, 'schema': schema, 'name': name, 'database': database,
+                     'comment': None, 'owner': 'dbt'},
+        'columns': {
+            column: {'type': 'integer' if column == 'id' else rng.choice(COLUMN_TYPES), 'index': index,
+                     'name': column, 'comment': None}
+            for index, column in enumerate(columns, 1)
+        },
+        'stats': {'has_stats': {'id': 'has_stats', 'label': 'Has Stats?', 'value': False, 'include': False,
+                                'description': 'Indicates whether there are statistics for this table'}},
+        'unique_id': uid,
+    }
+
+
+def _relation(database: str, schema: str, name: str) -> str:
+    return f'"{database}"."{schema}"."{name}"'
+
+
+class _ProjectBuilder:
+    """Builds the manifest and catalog sections of one synthetic project"""
+
+    def __init__(self, project: str, rng: random.Random, columns: int, database: str = 'analytics'):
+        self.project = project
+        self.rng = rng
+        self.columns = _column_names(max(1, columns))
+        self.database = database
+        self.nodes: Dict[str, Any] = {}
+        self.sources: Dict[str, Any] = {}
+        self.macros: Dict[str, Any] = {}
+        self.parent_map: Dict[str, List[str]] = {}
+        self.catalog_nodes: Dict[str, Any] = {}
+        self.catalog_sources: Dict[str, Any] = {}
+        # unique_id -> (relation name, columns) of everything a model can select from
+        self.relations: Dict[str, Tuple[str, List[str]]] = {}
+
+    def _common(self, resource_type: str, name: str, path: str) -> Dict[str, Any]:
+        return {
+            'name': name, 'resource_type': resource_type, 'package_name': self.project, 'path': path,
+            'original_file_path': path if resource_type != 'test' else 'models/schema.yml',
+            'unique_id': None, 'fqn': [self.project, name], 'description': '', 'meta': {}, 'tags': [],
+            'docs': {'show': True, 'node_color': None}, 'patch_path': None, 'created_at': 1735689600.0,
+        }
+
+    def add_macro(self, index: int, macro_ids: List[str]) -> str:
+        name = f"macro_{index}"
+        uid = f"macro.{self.project}.{name}"
+        macro = self._common('macro', name, f"macros/{name}.sql")
+        depends = self.rng.sample(macro_ids, min(len(macro_ids), self.rng.randint(0, 2)))
+        macro.update({
+            'unique_id': uid,
+            'macro_sql': f"{{% macro {name}(column) -%}}\n    coalesce({{{{ column }}}}, 0)\n{{%- endmacro %}}",
+            'depends_on': {'macros': depends},
+            'description': _sentence(self.rng, name) if self.rng.random() < 0.3 else '',
+            'arguments': [{'name': 'column', 'type': None, 'description': ''}],
+            'supported_languages': None,
+        })
+        self.macros[uid] = macro
+        return uid
+
+    def add_builtin_test_macros(self):
+        for test_name in GENERIC_TESTS:
+            uid = f"macro.dbt.test_{test_name}"
+            macro = self._common('macro', f"test_{test_name}", f"macros/generic_test_sql/{test_name}.sql")
+            macro.update({'unique_id': uid, 'package_name': 'dbt', 'macro_sql': '', 'depends_on': {'macros': []},
+                          'arguments': [], 'supported_languages': None})
+            self.macros[uid] = macro
+
+    def add_source(self, index: int, groups: int) -> str:
+        source_name = f"raw_{index % groups}"
+        name = f"{self.rng.choice(WORDS)}s_{index}"
+        uid = f"source.{self.project}.{source_name}.{name}"
+        source = self._common('source', name, 'models/sources.yml')
+        source.update({
+            'unique_id': uid, 'database': self.database, 'schema': source_name, 'source_name': source_name,
+            'source_description': f"Raw tables loaded into {source_name}.", 'loader': 'fivetran',
+            'identifier': name, 'fqn': [self.project, source_name, name],
+            'quoting': {'database': None, 'schema': None, 'identifier': None, 'column': None},
+            'loaded_at_field': '_loaded_at',
+            'freshness': {'warn_after': {'count': 12, 'period': 'hour'}, 'error_after': {'count': 24, 'period': 'hour'},
+                          'filter': None},
+            'external': None, 'description': _sentence(self.rng, name),
+            'columns': _documented_columns(self.rng, self.columns, name),
+            'source_meta': {}, 'config': {'enabled': True, 'event_time': None},
+            'relation_name': _relation(self.database, source_name, name), 'unrendered_config': {},
+        })
+        self.sources[uid] = source
+        self.parent_map[uid] = []
+        self.relations[uid] = (_relation(self.database, source_name, name), self.columns)
+        self.catalog_sources[uid] = _catalog_entry(self.rng, uid, self.database, source_name, name, 'BASE TABLE',
+                                                   self.columns)
+        return uid
+
+    def _sql(self, parents: List[str]) -> str:
+        """SELECT joining the parents on id; output column i is read from parent i mod len(parents)"""
+        selects = []
+        for position, column in enumerate(self.columns):
+            alias = f"p{position % len(parents)}"
+            selects.append(f"    {alias}.{column}" if position else f"    p0.{column}")
+        joins = [f"from {self.relations[parents[0]][0]} as p0"]
+        for index, parent in enumerate(parents[1:], 1):
+            joins.append(f"left join {self.relations[parent][0]} as p{index} on p0.id = p{index}.id")
+        return "select\n" + ",\n".join(selects) + "\n" + "\n".join(joins)
+
+    def add_model(self, index: int, layer: int, parents: List[str], macro_ids: List[str]) -> str:
+        name = f"{LAYERS[layer % len(LAYERS)]}_{self.rng.choice(WORDS)}s_{index}"
+        uid = f"model.{self.project}.{name}"
+        schema = f"{LAYERS[layer % len(LAYERS)]}_layer"
+        materialized = self.rng.choice(MATERIALIZATIONS)
+        refs = [{'name': self.nodes[p]['name'], 'package': None, 'version': None} for p in parents if p in self.nodes]
+        sources = [[self.sources[p]['source_name'], self.sources[p]['name']] for p in parents if p in self.sources]
+        calls = self.rng.sample(macro_ids, min(len(macro_ids), self.rng.randint(0, 2)))
+        raw_code = "select * from " + " join ".join(
+            f"{{{{ ref('{self.nodes[p]['name']}') }}}}" if p in self.nodes
+            else f"{{{{ source('{self.sources[p]['source_name']}', '{self.sources[p]['name']}') }}}}"
+            for p in parents
+        )
+        model = self._common('model', name, f"models/{schema}/{name}.sql")
+        model.update({
+            'unique_id': uid, 'database': self.database, 'schema': schema, 'alias': name,
+            'checksum': {'name': 'sha256', 'checksum': _sha256(raw_code)},
+            'config': {
+                'enabled': True, 'alias': None, 'schema': None, 'database': None,
+                'tags': [LAYERS[layer % len(LAYERS)]] if self.rng.random() < 0.3 else [], 'meta': {},
+                'group': None, 'materialized': materialized, 'incremental_strategy': None,
+                'unique_key': 'id' if materialized == 'incremental' else None, 'on_schema_change': 'ignore',
+                'persist_docs': {}, 'post-hook': [], 'pre-hook': [], 'quoting': {}, 'column_types': {},
+                'contract': {'enforced': False, 'alias_types': True}, 'access': 'protected',
+            },
+            'tags': [LAYERS[layer % len(LAYERS)]] if self.rng.random() < 0.3 else [],
+            'description': _sentence(self.rng, name) if self.rng.random() < 0.7 else '',
+            'columns': _documented_columns(self.rng, self.columns, name),
+            'build_path': None, 'unrendered_config': {},
+            'relation_name': None if materialized == 'ephemeral' else _relation(self.database, schema, name),
+            'raw_code': raw_code, 'language': 'sql', 'refs': refs, 'sources': sources, 'metrics': [],
+            'depends_on': {'macros': calls, 'nodes': list(parents)},
+            'compiled_path': f"target/compiled/{self.project}/models/{schema}/{name}.sql", 'compiled': True,
+            'compiled_code': self._sql(parents), 'extra_ctes_injected': True, 'extra_ctes': [],
+            'contract': {'enforced': False, 'alias_types': True, 'checksum': None}, 'access': 'protected',
+            'constraints': [], 'version': None, 'latest_version': None, 'deprecation_date': None,
+            'primary_key': ['id'], 'time_spine': None,
+        })
+        self.nodes[uid] = model
+        self.parent_map[uid] = list(parents)
+        # Ephemeral models are inlined by dbt; selecting from their name still resolves to the model
+        self.relations[uid] = (_relation(self.database, schema, name), self.columns)
+        if materialized != 'ephemeral':
+            self.catalog_nodes[uid] = _catalog_entry(self.rng, uid, self.database, schema, name,
+                                                     'VIEW' if materialized == 'view' else 'BASE TABLE', self.columns)
+        return uid
+
+    def add_test(self, index: int, model_id: str, parents: List[str]) -> str:
+        model = self.nodes[model_id]
+        test_name = GENERIC_TESTS[index % len(GENERIC_TESTS)]
+        column = self.rng.choice(self.columns)
+        kwargs = {'column_name': column, 'model': f"{{{{ get_where_subquery(ref('{model['name']}')) }}}}"}
+        depends = [model_id]
+        if test_name == 'relationships' and parents and parents[0] in self.nodes:
+            kwargs.update({'to': f"ref('{self.nodes[parents[0]]['name']}')", 'field': 'id'})
+            depends.append(parents[0])
+        elif test_name == 'relationships':
+            test_name = 'not_null'
+        elif test_name == 'accepted_values':
+            kwargs['values'] = ['a', 'b', 'c']
+        name = f"{test_name}_{model['name']}_{column}_{index}"
+        uid = f"test.{self.project}.{name}.{_sha256(name)[:10]}"
+        test = self._common('test', name, f"{name}.sql")
+        test.update({
+            'unique_id': uid, 'database': self.database, 'schema': 'dbt_test__audit', 'alias': name,
+            'checksum': {'name': 'none', 'checksum': ''},
+            'config': {'enabled': True, 'alias': None, 'schema': 'dbt_test__audit', 'database': None, 'tags': [],
+                       'meta': {}, 'group': None, 'materialized': 'test',
+                       'severity': 'WARN' if self.rng.random() < 0.2 else 'ERROR', 'store_failures': None,
+                       'where': None, 'limit': None, 'fail_calc': 'count(*)', 'warn_if': '!= 0', 'error_if': '!= 0'},
+            'relation_name': None, 'raw_code': f"{{{{ test_{test_name}(**_dbt_generic_test_kwargs) }}}}",
+            'language': 'sql', 'refs': [{'name': self.nodes[uid_]['name'], 'package': None, 'version': None}
+                                        for uid_ in depends],
+            'sources': [], 'metrics': [],
+            'depends_on': {'macros': [f"macro.dbt.test_{test_name}"], 'nodes': depends},
+            'column_name': column, 'file_key_name': f"models.{model['name']}", 'attached_node': model_id,
+            'test_metadata': {'name': test_name, 'kwargs': kwargs, 'namespace': None},
+        })
+        self.nodes[uid] = test
+        self.parent_map[uid] = depends
+        return uid
+
+    def manifest(self, adapter_type: str) -> Dict[str, Any]:
+        child_map = {uid: [] for uid in self.parent_map}
+        for child, parents in self.parent_map.items():
+            for parent in parents:
+                child_map[parent].append(child)
+        return {
+            'metadata': {
+                'dbt_schema_version': 'https://schemas.getdbt.com/dbt/manifest/v12.json', 'dbt_version': '1.9.3',
+                'generated_at': GENERATED_AT, 'invocation_id': _sha256(self.project)[:32], 'env': {},
+                'project_name': self.project, 'project_id': _sha256(self.project)[:32], 'user_id': None,
+                'send_anonymous_usage_stats': False, 'adapter_type': adapter_type,
+            },
+            'nodes': self.nodes, 'sources': self.sources, 'macros': self.macros,
+            'docs': {}, 'exposures': {}, 'metrics': {}, 'groups': {}, 'selectors': {}, 'disabled': {},
+            'parent_map': self.parent_map, 'child_map': child_map, 'group_map': {},
+            'saved_queries': {}, 'semantic_models': {}, 'unit_tests': {},
+        }
+
+    def catalog(self) -> Dict[str, Any]:
+        return {
+            'metadata': {'dbt_schema_version': 'https://schemas.getdbt.com/dbt/catalog/v1.json',
+                         'dbt_version': '1.9.3', 'generated_at': GENERATED_AT, 'invocation_id': None, 'env': {}},
+            'nodes': self.catalog_nodes, 'sources': self.catalog_sources, 'errors': None,
+        }
+
+
+def generate_project(models: int = 100, sources: int = 10, tests: int = 100, macros: int = 10, columns: int = 8,
+                     depth: int = 6, fan_in: int = 3, seed: int = 0, project: str = 'synthetic_project',
+                     adapter_type: str = 'postgres') -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Decoded manifest.json and catalog.json of a synthetic dbt project.
+
+    Models are spread evenly over depth layers. The first layer selects from
+    one or two sources; every other model selects from 1 to fan_in models,
+    mostly of the layer right above it, so the longest lineage path has depth
+    models. Tests are attached round-robin to the models, and every relation
+    has columns columns.
+    """
+    rng = random.Random(seed)
+    builder = _ProjectBuilder(project, rng, columns)
+    builder.add_builtin_test_macros()
+    macro_ids: List[str] = []
+    for index in range(macros):
+        macro_ids.append(builder.add_macro(index, macro_ids))
+    source_ids = [builder.add_source(index, max(1, sources // 20)) for index in range(max(1, sources))]
+
+    depth = max(1, min(depth, models))
+    model_ids: List[str] = []
+    previous: List[str] = []
+    for layer in range(depth):
+        size = models // depth + (1 if layer < models % depth else 0)
+        # Models of every layer above the previous one
+        upstream = model_ids[:len(model_ids) - len(previous)]
+        current = []
+        for _ in range(size):
+            if layer == 0:
+                parents = rng.sample(source_ids, min(len(source_ids), rng.randint(1, 2)))
+            else:
+                # One parent from the layer above keeps the layer depth; the rest may come from any earlier layer
+                parents = [rng.choice(previous)]
+                for _ in range(rng.randint(1, max(1, fan_in)) - 1):
+                    pool = upstream if upstream and rng.random() < 0.5 else previous
+                    parent = rng.choice(pool)
+                    if parent not in parents:
+                        parents.append(parent)
+            uid = builder.add_model(len(model_ids) + len(current), layer, parents, macro_ids)
+            current.append(uid)
+        model_ids += current
+        previous = current
+
+    for index in range(tests if model_ids else 0):
+        model_id = model_ids[index % len(model_ids)]
+        builder.add_test(index, model_id, builder.parent_map[model_id])
+    return builder.manifest(adapter_type), builder.catalog()
+
+
+def mutate_project(manifest: Dict[str, Any], catalog: Dict[str, Any], fraction: float = 0.05,
+                   seed: int = 1) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Turn a generated project into its next version, for incremental updates.
+
+    About fraction of the models get a new description and materialization,
+    and a fifth as many leaf models (with their tests) are removed and as many
+    new leaf models added. The manifest and catalog are modified in place and
+    returned.
+    """
+    rng = random.Random(seed)
+    nodes = manifest['nodes']
+    models = sorted(uid for uid in nodes if uid.startswith('model.'))
+    if not models:
+        return manifest, catalog
+    changes = max(1, int(len(models) * fraction))
+
+    for uid in rng.sample(models, min(changes, len(models))):
+        model = nodes[uid]
+        model['description'] = _sentence(rng, f"revised {model['name']}")
+        model['config']['materialized'] = rng.choice(MATERIALIZATIONS[:-1])
+
+    child_map = manifest['child_map']
+    leaves = [uid for uid in models if not any(child.startswith('model.') for child in child_map.get(uid, ()))]
+    for uid in rng.sample(leaves, max(0, min(changes // 5 or 1, len(leaves) - 1))):
+        for removed in [uid] + [child for child in child_map.get(uid, ()) if child.startswith('test.')]:
+            nodes.pop(removed, None)
+            catalog['nodes'].pop(removed, None)
+            manifest['parent_map'].pop(removed, None)
+
+    builder = _ProjectBuilder(manifest['metadata']['project_name'], rng, len(_catalog_columns(catalog) or ['id']))
+    builder.nodes, builder.sources, builder.macros = nodes, manifest['sources'], manifest['macros']
+    builder.parent_map, builder.catalog_nodes = manifest['parent_map'], catalog['nodes']
+    builder.relations = {uid: (entry['relation_name'], builder.columns)
+                         for section in (nodes, manifest['sources']) for uid, entry in section.items()
+                         if entry.get('relation_name') and entry['resource_type'] in ('model', 'source')}
+    parents_pool = [uid for uid in builder.relations if uid.startswith('model.')]
+    project_macros = [uid for uid in manifest['macros'] if not uid.startswith('macro.dbt.')]
+    for index in range(max(1, changes // 5)):
+        parents = rng.sample(parents_pool, min(len(parents_pool), 2))
+        uid = builder.add_model(len(models) + index, len(LAYERS) - 1, parents, project_macros)
+        builder.add_test(len(nodes) + index, uid, parents)
+    # Rebuilt from the parent_map, now that models were removed and added
+    manifest['child_map'] = builder.manifest(manifest['metadata']['adapter_type'])['child_map']
+    return manifest, catalog
+
+
+def _catalog_columns(catalog: Dict[str, Any]) -> Optional[List[str]]:
+    """Column names of the first relation in a catalog"""
+    for section in ('nodes', 'sources'):
+        for entry in (catalog.get(section) or {}).values():
+            return list(entry.get('columns') or {})
+    return None
+
+
+def write_project(output_dir: str, manifest: Dict[str, Any], catalog: Dict[str, Any],
+                  suffix: str = '') -> Tuple[Path, Path]:
+    """Write manifest{suffix}.json and catalog{suffix}.json to output_dir; returns their paths"""
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = directory / f"manifest{suffix}.json", directory / f"catalog{suffix}.json"
+    for path, data in zip(paths, (manifest, catalog)):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+    return paths
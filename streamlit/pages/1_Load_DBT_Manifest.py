@@ -1,3 +1,5 @@
+import time
+
 import streamlit as st
 import requests
 
@@ -16,7 +18,22 @@ if submitted:
                 files={'catalog_file': catalog_file,
                        'manifest_file': manifest_file}
                 )
-        if response.status_code == 200:
-            st.write('The metadata has been successfully uploaded.')
+        if response.status_code == 202:
+            job_url = f"http://fastapi:8080/embeddings/jobs/{response.json()['job_id']}"
+            status = st.empty()
+            while True:
+                job = requests.get(job_url).json()
+                phases = ', '.join(f"{name}: {p['done']}/{p['total']}"
+                                   for name, p in job['phases'].items())
+                status.write(f"Job {job['status']} ({phases})")
+                if job['status'] not in ('queued', 'running'):
+                    break
+                time.sleep(2)
+            if job['status'] == 'succeeded':
+                st.write('The metadata has been successfully uploaded.')
+            elif job['status'] == 'superseded':
+                st.warning('A newer upload replaced this one before it started.')
+            else:
+                st.error(f"The upload failed: {job['error']}")
     else:
         st.warning("Please upload files before submitting and add node id.")
@@ -0,0 +1,222 @@
+import json
+
+from dbt_graph_loader.loaders.base import BaseDBTLoader
+from dbt_graph_loader.loaders.catalog_refresh import (
+    COLUMN_STATE_PROPERTIES, RELATION_STATE_PROPERTIES, STALE_COLUMN_DELETE, CatalogState, plan_refresh,
+)
+from dbt_graph_loader.loaders.common import (
+    COLUMN_LABEL, LOAD_METADATA_DELETE, LOAD_METADATA_QUERY, LOAD_METADATA_WRITE, RELATION_LABELS,
+)
+from dbt_graph_loader.manifest import Manifest
+
+
+def _column(parent_id, name, index, data_type='text'):
+    return {'unique_id': f'{parent_id}.{name}', 'parent_id': parent_id, 'name': name, 'data_type': data_type,
+            'index': index}
+
+
+def _state(columns=()):
+    relations = {
+        'model.orders': ('Model', {'unique_id': 'model.orders', 'table_type': 'table', 'owner': 'etl'}),
+        'source.raw': ('Source', {'unique_id': 'source.raw'}),
+    }
+    return CatalogState(relations, {column['unique_id']: column for column in columns})
+
+
+def test_unchanged_catalog_plans_nothing():
+    columns = [_column('model.orders', 'id', 1), _column('model.orders', 'amount', 2)]
+    state = _state(columns)
+    refresh = plan_refresh(state, dict(state.relations), {column['unique_id']: column for column in columns})
+    assert not refresh
+
+
+def test_table_metadata_and_column_types_are_updated():
+    state = _state([_column('model.orders', 'id', 1, 'int')])
+    relations = {'model.orders': ('Model', {'unique_id': 'model.orders', 'table_type': 'view', 'owner': 'etl'})}
+    columns = {'model.orders.id': _column('model.orders', 'id', 1, 'bigint')}
+    delta = plan_refresh(state, relations, columns).delta
+    assert delta.updated_nodes['Model'] == [{'unique_id': 'model.orders', 'props': {'table_type': 'view'}}]
+    assert delta.updated_nodes['Column'] == [{'unique_id': 'model.orders.id', 'props': {'data_type': 'bigint'}}]
+
+
+def test_new_and_dropped_catalog_columns():
+    state = _state([_column('model.orders', 'id', 1), _column('model.orders', 'legacy', 2)])
+    columns = {'model.orders.id': _column('model.orders', 'id', 1),
+               'source.raw.payload': _column('source.raw', 'payload', 1)}
+    refresh = plan_refresh(state, dict(state.relations), columns)
+    delta = refresh.delta
+    assert delta.removed_nodes == {'model.orders.legacy': 'Column'}
+    assert delta.added_nodes == {'Column': [columns['source.raw.payload']]}
+    assert delta.added_edges == {('source.raw', 'source.raw.payload', 'HAS_COLUMN')}
+    assert refresh.labels['model.orders.legacy'] == refresh.labels['source.raw.payload'] == 'Column'
+
+
+def test_relations_missing_from_the_graph_are_not_added():
+    state = _state()
+    relations = {'model.new': ('Model', {'unique_id': 'model.new', 'table_type': 'table'})}
+    columns = {'model.new.id': _column('model.new', 'id', 1)}
+    refresh = plan_refresh(state, relations, columns)
+    assert not refresh
+    assert 'model.new' not in refresh.current.relations
+
+
+def test_relations_missing_from_the_manifest_keep_their_state():
+    state = _state([_column('model.orders', 'id', 1)])
+    refresh = plan_refresh(state, {}, {})
+    assert not refresh
+    assert refresh.current.relations == state.relations
+
+
+def test_sql_only_columns_are_never_removed():
+    sql_only = {'unique_id': 'model.orders.total', 'parent_id': 'model.orders', 'name': 'total'}
+    state = _state([_column('model.orders', 'id', 1), sql_only])
+    refresh = plan_refresh(state, dict(state.relations), {'model.orders.id': _column('model.orders', 'id', 1)})
+    assert not refresh
+
+
+def test_state_round_trips_through_rows_and_catalog():
+    relation_rows = {'Model': [['model.orders', 'table', None, 'etl']], 'Source': [['source.raw', None, None, None]]}
+    column_rows = [['model.orders.amount', 'model.orders', 'amount', None, 'numeric', None, 2, 0],
+                   ['model.orders.id', 'model.orders', 'id', None, 'int', 'key', 1, 0],
+                   ['source.raw.payload', 'source.raw', 'payload', None, 'json', None, 1, 0],
+                   ['model.orders.total', 'model.orders', 'total', None, None, None, None, 2]]
+    assert len(relation_rows['Model'][0]) == len(RELATION_STATE_PROPERTIES)
+    # Column properties and the number of DERIVED_FROM relationships
+    assert len(column_rows[0]) == len(COLUMN_STATE_PROPERTIES) + 1
+
+    state = CatalogState.from_rows(relation_rows, column_rows)
+    assert state.relations['model.orders'] == ('Model', {'unique_id': 'model.orders', 'table_type': 'table',
+                                                         'owner': 'etl'})
+    assert 'index' not in state.columns['model.orders.total']
+    assert state.derived == {'model.orders.total'}
+
+    catalog = state.catalog()
+    assert catalog['nodes']['model.orders']['metadata'] == {'type': 'table', 'owner': 'etl'}
+    assert list(catalog['nodes']['model.orders']['columns']) == ['id', 'amount']
+    assert catalog['sources']['source.raw']['columns']['payload'] == {'name': 'payload', 'type': 'json',
+                                                                      'comment': None, 'index': 1}
+
+
+def test_dropped_column_linked_by_lineage_becomes_sql_only():
+    state = _state([_column('model.orders', 'id', 1), _column('model.orders', 'amount', 2)])
+    state.derived.add('model.orders.amount')
+    refresh = plan_refresh(state, dict(state.relations), {'model.orders.id': _column('model.orders', 'id', 1)})
+    delta = refresh.delta
+    assert delta.removed_nodes == {}
+    assert delta.updated_nodes['Column'] == [
+        {'unique_id': 'model.orders.amount', 'props': {'data_type': None, 'index': None}}]
+    assert delta.removed_edges == {('model.orders', 'model.orders.amount', 'HAS_COLUMN')}
+    assert refresh.current.columns['model.orders.amount'] == {'unique_id': 'model.orders.amount',
+                                                              'name': 'amount', 'parent_id': 'model.orders'}
+
+
+MANIFEST = {
+    'metadata': {'adapter_type': 'postgres'},
+    'nodes': {
+        'model.shop.stg_orders': {
+            'resource_type': 'model', 'name': 'stg_orders', 'package_name': 'shop', 'database': 'db',
+            'schema': 'analytics', 'alias': 'stg_orders', 'depends_on': {'nodes': ['source.shop.raw.orders']},
+            'compiled_code': 'select id, amount from db.raw.orders',
+        },
+    },
+    'sources': {
+        'source.shop.raw.orders': {
+            'resource_type': 'source', 'name': 'orders', 'source_name': 'raw', 'package_name': 'shop',
+            'database': 'db', 'schema': 'raw', 'identifier': 'orders',
+        },
+    },
+    'parent_map': {'model.shop.stg_orders': ['source.shop.raw.orders'], 'source.shop.raw.orders': []},
+}
+
+
+def _catalog(model_columns):
+    def entry(schema, name, columns):
+        return {'metadata': {'type': 'table', 'database': 'db', 'schema': schema, 'name': name},
+                'columns': {column: {'name': column, 'type': 'integer', 'index': index}
+                            for index, column in enumerate(columns, 1)}}
+
+    return {'nodes': {'model.shop.stg_orders': entry('analytics', 'stg_orders', model_columns)},
+            'sources': {'source.shop.raw.orders': entry('raw', 'orders', ['id', 'amount'])}}
+
+
+class GraphLoader(BaseDBTLoader):
+    """Serves the catalog state of an in-memory graph and records the queries sent"""
+
+    def __init__(self, nodes, edges):
+        super().__init__(column_lineage=True, parse_processes=1)
+        self.nodes, self.edges = nodes, edges
+        self.writes = []
+        self.metadata = None
+
+    def _read_rows(self, query):
+        if query == LOAD_METADATA_QUERY:
+            return [[self.metadata]] if self.metadata else []
+        if query.startswith(f'MATCH (c:{COLUMN_LABEL})'):
+            return [[props.get(name) for name in COLUMN_STATE_PROPERTIES]
+                    + [sum(uid in edge[:2] for edge in self.edges if edge[2] == 'DERIVED_FROM')]
+                    for uid, (label, props) in self.nodes.items() if label == COLUMN_LABEL]
+        label = query.split(':', 1)[1].split(')', 1)[0]
+        if label in RELATION_LABELS:
+            return [[props.get(name) for name in RELATION_STATE_PROPERTIES]
+                    for label_, props in self.nodes.values() if label_ == label]
+        return []
+
+    def _write_batch(self, query, batch, description):
+        if query in (LOAD_METADATA_WRITE, LOAD_METADATA_DELETE):
+            self.metadata = batch[0] if query == LOAD_METADATA_WRITE else None
+        self.writes.append((' '.join(query.split()), batch))
+        return len(batch)
+
+
+def _full_load(catalog):
+    """Column nodes and column relationships a full load with column lineage writes"""
+    loader = GraphLoader({}, set())
+    node_rows, edge_groups, _ = loader._plan_load(Manifest.from_dict(MANIFEST, keep_code=True), catalog)
+    nodes = {row['unique_id']: (label, row) for label, rows in node_rows.items() for row in rows}
+    edges = {(row['src'], row['dst'], rel_type)
+             for (_, _, rel_type), rows in edge_groups.items() for row in rows}
+    return nodes, edges
+
+
+def _columns(nodes, edges):
+    return ({uid: props for uid, (label, props) in nodes.items() if label == COLUMN_LABEL},
+            {edge for edge in edges if edge[2] in ('HAS_COLUMN', 'DERIVED_FROM')})
+
+
+def test_refresh_with_column_lineage_matches_a_full_load():
+    nodes, edges = _full_load(_catalog(['id', 'amount']))
+    # The catalog no longer lists a column the model's SQL still produces
+    catalog = _catalog(['id'])
+    loader = GraphLoader(nodes, edges)
+    delta = loader.refresh_catalog(Manifest.from_dict(MANIFEST, keep_code=True), catalog).delta
+
+    deleted = [uid for query, rows in loader.writes if query == ' '.join(STALE_COLUMN_DELETE.split())
+               for uid in rows]
+    assert 'model.shop.stg_orders.amount' not in deleted
+
+    for uid in delta.removed_nodes:
+        del nodes[uid]
+    edges = {edge for edge in edges - delta.removed_edges if edge[0] in nodes and edge[1] in nodes}
+    for label, rows in delta.added_nodes.items():
+        nodes.update((row['unique_id'], (label, row)) for row in rows)
+    for label, rows in delta.updated_nodes.items():
+        for row in rows:
+            props = {**nodes[row['unique_id']][1], **row['props']}
+            nodes[row['unique_id']] = (label, {key: value for key, value in props.items() if value is not None})
+    edges |= delta.added_edges
+    assert _columns(nodes, edges) == _columns(*_full_load(catalog))
+
+
+def test_refresh_records_the_hash_of_the_manifest_and_new_catalog(tmp_path):
+    manifest_path, catalog_path = tmp_path / 'manifest.json', tmp_path / 'catalog.json'
+    manifest_path.write_text(json.dumps(MANIFEST))
+    catalog_path.write_text(json.dumps(_catalog(['id', 'amount'])))
+    loader = GraphLoader(*_full_load(_catalog(['id', 'amount'])))
+    loader.record_load(loader.fingerprint_files(str(manifest_path), str(catalog_path)))
+
+    catalog_path.write_text(json.dumps(_catalog(['id'])))
+    fingerprint = loader.fingerprint_files(str(manifest_path), str(catalog_path))
+    assert not loader.is_unchanged(fingerprint)
+    assert loader.refresh_catalog_from_files(str(manifest_path), str(catalog_path))
+    # Loading the same manifest and catalog again is skipped
+    assert loader.is_unchanged(fingerprint)
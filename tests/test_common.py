@@ -0,0 +1,105 @@
+from dbt_graph_loader.loaders.common import RefResolver, _parse_ref
+from dbt_graph_loader.manifest import Manifest
+
+
+def _model(name, package='shop', version=None, refs=(), depends_on=(), sources=()):
+    data = {'resource_type': 'model', 'name': name, 'package_name': package, 'refs': list(refs),
+            'sources': list(sources), 'depends_on': {'nodes': list(depends_on)}}
+    if version is not None:
+        data['version'] = version
+    return data
+
+
+def _manifest(nodes, sources=None):
+    return Manifest.from_dict({'nodes': nodes, 'sources': sources or {}})
+
+
+def _refs(manifest):
+    resolver = RefResolver(manifest)
+    return set(resolver.ref_edges(manifest.nodes)), resolver
+
+
+def test_parse_ref_formats():
+    assert _parse_ref({'name': 'orders', 'package': 'shop', 'version': 2}) == ('orders', 'shop', '2')
+    assert _parse_ref({'name': 'orders'}) == ('orders', None, None)
+    assert _parse_ref(['orders']) == ('orders', None, None)
+    assert _parse_ref(['shop', 'orders']) == ('orders', 'shop', None)
+    assert _parse_ref([]) == (None, None, None)
+    assert _parse_ref('orders') == ('orders', None, None)
+
+
+def test_unique_name_resolves():
+    manifest = _manifest({
+        'model.shop.orders': _model('orders'),
+        'model.shop.revenue': _model('revenue', refs=[{'name': 'orders'}]),
+    })
+    edges, resolver = _refs(manifest)
+    assert edges == {('model.shop.revenue', 'model.shop.orders', 'REFERENCES')}
+    assert resolver.stats['refs']['resolved'] == 1
+
+
+def test_package_narrows_same_named_models():
+    manifest = _manifest({
+        'model.shop.orders': _model('orders'),
+        'model.vendor.orders': _model('orders', package='vendor'),
+        'model.shop.revenue': _model('revenue', refs=[{'name': 'orders', 'package': 'vendor'}]),
+    })
+    edges, _ = _refs(manifest)
+    assert edges == {('model.shop.revenue', 'model.vendor.orders', 'REFERENCES')}
+
+
+def test_version_narrows_versioned_models():
+    manifest = _manifest({
+        'model.shop.orders.v1': _model('orders', version=1),
+        'model.shop.orders.v2': _model('orders', version=2),
+        'model.shop.revenue': _model('revenue', refs=[{'name': 'orders', 'version': 2}]),
+    })
+    edges, _ = _refs(manifest)
+    assert edges == {('model.shop.revenue', 'model.shop.orders.v2', 'REFERENCES')}
+
+
+def test_depends_on_breaks_ties():
+    manifest = _manifest({
+        'model.shop.orders': _model('orders'),
+        'model.vendor.orders': _model('orders', package='vendor'),
+        'model.shop.revenue': _model('revenue', refs=[['orders']], depends_on=['model.vendor.orders']),
+    })
+    edges, resolver = _refs(manifest)
+    assert edges == {('model.shop.revenue', 'model.vendor.orders', 'REFERENCES')}
+    assert resolver.stats['refs']['ambiguous'] == 0
+
+
+def test_ambiguous_and_dangling_refs_are_counted_not_linked():
+    manifest = _manifest({
+        'model.shop.orders': _model('orders'),
+        'model.vendor.orders': _model('orders', package='vendor'),
+        'model.shop.revenue': _model('revenue', refs=['orders', 'missing']),
+    })
+    edges, resolver = _refs(manifest)
+    assert edges == set()
+    assert resolver.stats['refs']['ambiguous'] == 1
+    assert resolver.stats['refs']['dangling'] == 1
+
+
+def test_repeated_ref_yields_one_edge():
+    manifest = _manifest({
+        'model.shop.orders': _model('orders'),
+        'model.shop.revenue': _model('revenue', refs=['orders', ['orders']]),
+    })
+    edges, resolver = _refs(manifest)
+    assert edges == {('model.shop.revenue', 'model.shop.orders', 'REFERENCES')}
+    assert resolver.stats['refs']['resolved'] == 2
+
+
+def test_sources_match_source_and_table_name():
+    manifest = _manifest({
+        'model.shop.stg_orders': _model('stg_orders', sources=[['raw', 'orders'], ['raw', 'missing']]),
+    }, sources={
+        'source.shop.raw.orders': {'resource_type': 'source', 'name': 'orders', 'source_name': 'raw'},
+        'source.shop.archive.orders': {'resource_type': 'source', 'name': 'orders', 'source_name': 'archive'},
+    })
+    resolver = RefResolver(manifest)
+    assert set(resolver.source_edges(manifest.nodes)) == {
+        ('model.shop.stg_orders', 'source.shop.raw.orders', 'DEPENDS_ON')}
+    assert resolver.stats['sources']['resolved'] == 1
+    assert resolver.stats['sources']['dangling'] == 1
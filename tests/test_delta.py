@@ -0,0 +1,70 @@
+from dbt_graph_loader.loaders.delta import compute_delta
+
+
+def _nodes(**props):
+    return {uid: ('Model', {'unique_id': uid, **values}) for uid, values in props.items()}
+
+
+def test_identical_graphs_have_an_empty_delta():
+    nodes = _nodes(a={'name': 'a'}, b={'name': 'b'})
+    edges = {('b', 'a', 'DEPENDS_ON')}
+    delta = compute_delta(nodes, nodes, edges, edges)
+    assert not delta
+    assert delta.changed_properties == 0
+
+
+def test_added_and_removed_nodes():
+    old = _nodes(a={'name': 'a'}, gone={'name': 'gone'})
+    new = _nodes(a={'name': 'a'}, fresh={'name': 'fresh'})
+    delta = compute_delta(old, new, set(), set())
+    assert delta.removed_nodes == {'gone': 'Model'}
+    assert delta.added_nodes == {'Model': [{'unique_id': 'fresh', 'name': 'fresh'}]}
+    assert delta.updated_nodes == {}
+
+
+def test_only_changed_properties_are_updated():
+    old = _nodes(a={'name': 'a', 'tags': ['x'], 'description': 'old'})
+    new = _nodes(a={'name': 'a', 'tags': ['x', 'y'], 'materialized': 'table'})
+    delta = compute_delta(old, new, set(), set())
+    assert delta.updated_nodes == {
+        'Model': [{'unique_id': 'a', 'props': {'tags': ['x', 'y'], 'materialized': 'table', 'description': None}}]}
+    assert delta.changed_properties == 3
+
+
+def test_edges_are_diffed_as_sets():
+    nodes = _nodes(a={}, b={}, c={})
+    old_edges = {('b', 'a', 'DEPENDS_ON'), ('c', 'a', 'DEPENDS_ON')}
+    new_edges = {('b', 'a', 'DEPENDS_ON'), ('c', 'b', 'DEPENDS_ON')}
+    delta = compute_delta(nodes, nodes, old_edges, new_edges)
+    assert delta.added_edges == {('c', 'b', 'DEPENDS_ON')}
+    assert delta.removed_edges == {('c', 'a', 'DEPENDS_ON')}
+
+
+def test_edges_of_removed_nodes_go_with_them():
+    old = _nodes(a={}, b={})
+    new = _nodes(a={})
+    delta = compute_delta(old, new, {('b', 'a', 'DEPENDS_ON')}, set())
+    assert delta.removed_nodes == {'b': 'Model'}
+    assert delta.removed_edges == set()
+
+
+def test_edges_to_unloaded_nodes_are_not_added():
+    nodes = _nodes(a={})
+    delta = compute_delta(nodes, nodes, set(), {('a', 'macro.unloaded', 'USES_MACRO')})
+    assert delta.added_edges == set()
+    assert not delta
+
+
+def test_edges_of_added_nodes_are_added():
+    old = _nodes(a={})
+    new = _nodes(a={}, b={})
+    delta = compute_delta(old, new, set(), {('b', 'a', 'DEPENDS_ON')})
+    assert delta.added_edges == {('b', 'a', 'DEPENDS_ON')}
+
+
+def test_summary_counts():
+    old = _nodes(a={'name': 'a'}, gone={})
+    new = _nodes(a={'name': 'renamed'}, fresh={})
+    delta = compute_delta(old, new, set(), {('fresh', 'a', 'DEPENDS_ON')})
+    assert delta.summary() == ("Delta: 1 nodes removed, 1 added, 1 updated (1 properties); "
+                               "1 relationships added, 0 removed")
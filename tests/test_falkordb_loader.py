@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError, ResponseError
+
+from dbt_graph_loader.loaders.async_falkordb_loader import AsyncDBTFalkorDBLoader
+from dbt_graph_loader.loaders.base import BaseDBTLoader, LoaderCore
+from dbt_graph_loader.loaders.falkordb_loader import DBTFalkorDBLoader
+
+
+class FlakyGraph:
+    """Raises the given error for the first `failures` queries, then accepts every query"""
+
+    def __init__(self, failures, error):
+        self.failures, self.error = failures, error
+        self.calls = 0
+
+    def _query(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+
+    def query(self, query, params=None):
+        self._query()
+
+
+class AsyncFlakyGraph(FlakyGraph):
+    async def query(self, query, params=None):
+        self._query()
+
+
+def _sync_write(failures, error):
+    # Not connected: only the batch writer is exercised
+    loader = DBTFalkorDBLoader.__new__(DBTFalkorDBLoader)
+    BaseDBTLoader.__init__(loader)
+    loader.retry_backoff = 0
+    loader.graph = FlakyGraph(failures, error)
+    return loader, lambda: loader._write_batch('UNWIND $rows AS row RETURN row', [{}, {}], 'test')
+
+
+def _async_write(failures, error):
+    loader = AsyncDBTFalkorDBLoader.__new__(AsyncDBTFalkorDBLoader)
+    LoaderCore.__init__(loader)
+    loader.retry_backoff = 0
+    loader.graph = AsyncFlakyGraph(failures, error)
+    return loader, lambda: asyncio.run(loader._write_batch_async('UNWIND $rows AS row RETURN row', [{}, {}], 'test'))
+
+
+def _failed(loader):
+    return sum(stats.failed for stats in loader.profile.phases.values())
+
+
+@pytest.mark.parametrize('make_write', [_sync_write, _async_write])
+def test_transient_errors_are_retried(make_write):
+    loader, write = make_write(2, ConnectionError('connection reset'))
+    assert write() == 2
+    assert loader.graph.calls == 3
+    assert _failed(loader) == 0
+
+
+@pytest.mark.parametrize('make_write', [_sync_write, _async_write])
+def test_transient_errors_fail_the_load_once_retries_are_used_up(make_write):
+    loader, write = make_write(100, ConnectionError('connection refused'))
+    with pytest.raises(ConnectionError):
+        write()
+    assert loader.graph.calls == loader.max_retries + 1
+    assert _failed(loader) == 1
+
+
+@pytest.mark.parametrize('make_write', [_sync_write, _async_write])
+def test_rejected_batch_fails_the_load(make_write):
+    loader, write = make_write(1, ResponseError('Invalid input'))
+    with pytest.raises(ResponseError):
+        write()
+    assert loader.graph.calls == 1
+    assert _failed(loader) == 1
+    assert loader._metadata_rows(None) == []
@@ -0,0 +1,84 @@
+import json
+
+from dbt_graph_loader import fingerprint
+from dbt_graph_loader.fingerprint import ManifestFingerprint
+
+
+def _manifest(generated_at='2024-01-01T00:00:00Z', invocation_id='a1', created_at=1700000000.123456,
+              meta_created_at='2023-05-01', description='Orders'):
+    return json.dumps({
+        'metadata': {'dbt_version': '1.8.0', 'project_name': 'shop', 'generated_at': generated_at,
+                     'invocation_id': invocation_id, 'user_id': None, 'env': {}},
+        'nodes': {'model.shop.orders': {'name': 'orders', 'description': description, 'created_at': created_at,
+                                        'config': {'meta': {'created_at': meta_created_at}},
+                                        'columns': {'created_at': {'name': 'created_at'}}}},
+    })
+
+
+def _hash(manifest, catalog=None, **options):
+    return ManifestFingerprint.from_content(manifest, catalog, **options).manifest_hash
+
+
+def test_invocation_metadata_is_ignored():
+    assert _hash(_manifest()) == _hash(_manifest(generated_at='2025-06-30T12:00:00Z', invocation_id='b2'))
+
+
+def test_node_created_at_timestamps_are_ignored():
+    assert _hash(_manifest()) == _hash(_manifest(created_at=1800000000.5))
+
+
+def test_content_changes_are_detected():
+    assert _hash(_manifest()) != _hash(_manifest(description='All orders'))
+
+
+def test_created_at_in_meta_is_content():
+    assert _hash(_manifest()) != _hash(_manifest(meta_created_at='2024-02-02'))
+
+
+def test_volatile_names_outside_the_header_are_content():
+    def manifest(value):
+        return json.dumps({'metadata': {'generated_at': 'x'},
+                           'nodes': {'model.shop.a': {'config': {'meta': {'generated_at': value}}}}})
+
+    assert _hash(manifest('2024-01-01')) != _hash(manifest('2024-02-02'))
+
+
+def test_catalog_and_options_are_hashed():
+    manifest = _manifest()
+    assert _hash(manifest, '{"nodes": {}}') != _hash(manifest, '{"nodes": {"a": {}}}')
+    assert _hash(manifest, column_lineage=True) != _hash(manifest, column_lineage=False)
+
+
+def test_identifying_metadata_is_read_from_the_header():
+    result = ManifestFingerprint.from_content(_manifest())
+    assert (result.project_name, result.dbt_version, result.generated_at) == ('shop', '1.8.0',
+                                                                              '2024-01-01T00:00:00Z')
+
+
+def test_chunked_files_hash_like_content(tmp_path, monkeypatch):
+    nodes = {f'model.shop.m{i}': {'name': f'm{i}', 'created_at': 1700000000.0 + i} for i in range(200)}
+    manifest = json.dumps({'metadata': {'generated_at': '2024-01-01T00:00:00Z'}, 'nodes': nodes})
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text(manifest)
+    catalog_path = tmp_path / 'catalog.json'
+    catalog_path.write_text('{"nodes": {}}')
+
+    expected = _hash(manifest, '{"nodes": {}}')
+    # Chunks far smaller than a node, so created_at values straddle chunk boundaries
+    for chunk_size in (7, 64, 1000):
+        monkeypatch.setattr(fingerprint, 'CHUNK_SIZE', chunk_size)
+        result = ManifestFingerprint.from_files(str(manifest_path), str(catalog_path))
+        assert result.manifest_hash == expected
+
+
+def test_missing_catalog_file_hashes_like_no_catalog(tmp_path):
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text(_manifest())
+    result = ManifestFingerprint.from_files(str(manifest_path), str(tmp_path / 'catalog.json'))
+    assert result.manifest_hash == _hash(_manifest())
+
+
+def test_epoch_created_at_is_ignored_at_any_depth():
+    # Node-level keys cannot be told apart from nested ones while streaming, so a meta epoch float is dropped too
+    assert _hash(_manifest(meta_created_at=1700000000.5)) == _hash(_manifest(meta_created_at=1800000000.5))
+    assert _hash(_manifest(meta_created_at=1700000000)) != _hash(_manifest(meta_created_at=1800000000))
@@ -0,0 +1,82 @@
+import asyncio
+
+from app.server.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, SUPERSEDED, JobQueue
+
+
+def _recorder(ran, name):
+    async def run(job):
+        job.progress('nodes', 1, 2)
+        await asyncio.sleep(0.01)
+        job.progress('nodes', 2, 2)
+        ran.append(name)
+    return run
+
+
+async def _drain(queue):
+    while any(job.status in (QUEUED, RUNNING) for job in queue.jobs.values()):
+        await asyncio.sleep(0.01)
+
+
+def test_queued_job_is_superseded_by_a_newer_upload_of_the_same_graph():
+    async def scenario():
+        queue, ran = JobQueue(), []
+        first = queue.submit('falkordb', 'dbt_graph', _recorder(ran, 'first'))
+        second = queue.submit('falkordb', 'dbt_graph', _recorder(ran, 'second'))
+        third = queue.submit('falkordb', 'dbt_graph', _recorder(ran, 'third'))
+        await _drain(queue)
+        return ran, first, second, third
+
+    ran, first, second, third = asyncio.run(scenario())
+    assert ran == ['third']
+    assert (first.status, first.superseded_by) == (SUPERSEDED, second.id)
+    assert (second.status, second.superseded_by) == (SUPERSEDED, third.id)
+    assert third.status == SUCCEEDED
+    assert third.to_dict()['phases']['nodes'] == {'done': 2, 'total': 2, 'eta_seconds': None}
+
+
+def test_running_job_is_not_superseded():
+    async def scenario():
+        queue, ran = JobQueue(), []
+        running = queue.submit('neo4j', 'neo4j', _recorder(ran, 'running'))
+        await asyncio.sleep(0)
+        queued = queue.submit('neo4j', 'neo4j', _recorder(ran, 'queued'))
+        await _drain(queue)
+        return ran, running, queued
+
+    ran, running, queued = asyncio.run(scenario())
+    assert ran == ['running', 'queued']
+    assert running.status == queued.status == SUCCEEDED
+
+
+def test_jobs_are_coalesced_per_backend_and_graph_name():
+    async def scenario():
+        queue, ran = JobQueue(), []
+        jobs = [queue.submit('falkordb', 'dbt_graph', _recorder(ran, 'falkordb dbt_graph')),
+                queue.submit('falkordb', 'other_graph', _recorder(ran, 'falkordb other_graph')),
+                queue.submit('kuzu', 'dbt_graph', _recorder(ran, 'kuzu dbt_graph'))]
+        await _drain(queue)
+        return ran, jobs
+
+    ran, jobs = asyncio.run(scenario())
+    assert ran == ['falkordb dbt_graph', 'falkordb other_graph', 'kuzu dbt_graph']
+    assert all(job.status == SUCCEEDED for job in jobs)
+    assert [job.to_dict()['graph_db'] for job in jobs] == ['falkordb', 'falkordb', 'kuzu']
+
+
+def test_failed_job_records_the_error_and_the_queue_keeps_going():
+    async def scenario():
+        queue, ran = JobQueue(), []
+
+        async def fail(job):
+            raise ValueError('bad manifest')
+
+        failed = queue.submit('falkordb', 'dbt_graph', fail)
+        await asyncio.sleep(0)
+        after = queue.submit('falkordb', 'dbt_graph', _recorder(ran, 'after'))
+        await _drain(queue)
+        return ran, failed, after
+
+    ran, failed, after = asyncio.run(scenario())
+    assert (failed.status, failed.error) == (FAILED, 'bad manifest')
+    assert after.status == SUCCEEDED
+    assert ran == ['after']
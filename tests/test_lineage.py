@@ -0,0 +1,75 @@
+from dbt_graph_loader.loaders.lineage import ANCESTOR_OF, Lineage
+
+# raw -> stg -> orders -> revenue, with seed feeding orders and a test on orders
+PARENT_MAP = {
+    'source.raw': [],
+    'seed.fx': [],
+    'model.stg': ['source.raw'],
+    'model.orders': ['model.stg', 'seed.fx', 'model.stg'],
+    'model.revenue': ['model.orders'],
+    'test.orders_not_null': ['model.orders'],
+}
+LABELS = {
+    'source.raw': 'Source',
+    'seed.fx': 'Seed',
+    'model.stg': 'Model',
+    'model.orders': 'Model',
+    'model.revenue': 'Model',
+    'test.orders_not_null': 'Test',
+}
+
+
+def test_depths_are_the_longest_path_to_a_root():
+    lineage = Lineage(PARENT_MAP)
+    assert lineage.depths == {'source.raw': 0, 'seed.fx': 0, 'model.stg': 1, 'model.orders': 2,
+                              'model.revenue': 3, 'test.orders_not_null': 3}
+
+
+def test_ancestors_are_transitive():
+    lineage = Lineage(PARENT_MAP)
+    assert sorted(lineage.ancestors('model.revenue')) == ['model.orders', 'model.stg', 'seed.fx', 'source.raw']
+    assert sorted(lineage.ancestors('test.orders_not_null')) == ['model.orders', 'model.stg', 'seed.fx',
+                                                                 'source.raw']
+    assert lineage.ancestors('source.raw') == []
+    assert lineage.ancestors('model.unknown') == []
+
+
+def test_parents_missing_from_the_parent_map_are_roots():
+    lineage = Lineage({'model.a': ['source.b']})
+    assert lineage.depths == {'source.b': 0, 'model.a': 1}
+    assert lineage.ancestors('model.a') == ['source.b']
+
+
+def test_closure_links_only_relations():
+    edges = set(Lineage(PARENT_MAP).ancestor_edges(LABELS))
+    assert edges == {
+        ('source.raw', 'model.stg', ANCESTOR_OF),
+        ('source.raw', 'model.orders', ANCESTOR_OF),
+        ('model.stg', 'model.orders', ANCESTOR_OF),
+        ('seed.fx', 'model.orders', ANCESTOR_OF),
+        ('source.raw', 'model.revenue', ANCESTOR_OF),
+        ('model.stg', 'model.revenue', ANCESTOR_OF),
+        ('seed.fx', 'model.revenue', ANCESTOR_OF),
+        ('model.orders', 'model.revenue', ANCESTOR_OF),
+    }
+
+
+def test_closure_skips_unloaded_nodes():
+    labels = {uid: label for uid, label in LABELS.items() if uid != 'seed.fx'}
+    edges = set(Lineage(PARENT_MAP).ancestor_edges(labels))
+    assert not any('seed.fx' in edge for edge in edges)
+
+
+def test_cycles_get_no_closure():
+    lineage = Lineage({'model.a': ['model.b'], 'model.b': ['model.a'], 'model.c': ['model.a'], 'model.d': []})
+    assert lineage.depths == {'model.d': 0}
+    assert lineage.ancestors('model.c') == []
+
+
+def test_depth_rows_and_with_depth():
+    lineage = Lineage(PARENT_MAP)
+    rows = lineage.depth_rows(LABELS)
+    assert rows['Test'] == [{'unique_id': 'test.orders_not_null', 'lineage_depth': 3}]
+    assert {'unique_id': 'model.revenue', 'lineage_depth': 3} in rows['Model']
+    assert lineage.with_depth('model.stg', {'name': 'stg'}) == {'name': 'stg', 'lineage_depth': 1}
+    assert lineage.with_depth('macro.m', {'name': 'm'}) == {'name': 'm'}
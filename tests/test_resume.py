@@ -0,0 +1,109 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from dbt_graph_loader.fingerprint import ManifestFingerprint
+from dbt_graph_loader.loaders.base import BaseDBTLoader
+
+TARGET = Path(__file__).resolve().parent.parent / 'DbtExampleProject' / 'target'
+MANIFEST = str(TARGET / 'manifest.json')
+CATALOG = str(TARGET / 'catalog.json')
+
+
+class Interrupted(Exception):
+    pass
+
+
+class MemoryLoader(BaseDBTLoader):
+    """Records every written row, keeping the LoadProgress journal like a graph would"""
+
+    def __init__(self, graph, fail_after=None, **kwargs):
+        super().__init__(batch_size=5, resume=True, **kwargs)
+        self.graph = graph
+        self.fail_after = fail_after
+        self.checkpoint_interval = 3
+        self.written = 0
+
+    def _read_rows(self, query):
+        if 'LoadProgress' in query and self.graph['progress'] is not None:
+            return [[self.graph['progress']]]
+        return []
+
+    def _delete_batch(self, query):
+        self.graph['clears'] += 1
+        self.graph['rows'].clear()
+        return 0
+
+    def create_constraints(self):
+        pass
+
+    def _write_batch(self, query, batch, description):
+        if 'LoadProgress' in query:
+            self.graph['progress'] = None if 'DELETE' in query else batch[0]
+            return len(batch)
+        if self.fail_after is not None:
+            if self.fail_after == 0:
+                raise Interrupted(description)
+            self.fail_after -= 1
+        self.written += len(batch)
+        # Resumable loads merge every batch, so a row written twice is stored once
+        self.graph['rows'].update(' '.join(query.split()) + json.dumps(row, sort_keys=True, default=str)
+                                  for row in batch)
+        return len(batch)
+
+
+def _graph():
+    return {'rows': set(), 'progress': None, 'clears': 0}
+
+
+@pytest.fixture(scope='module')
+def fingerprint():
+    return ManifestFingerprint.from_files(MANIFEST, CATALOG)
+
+
+@pytest.fixture(scope='module')
+def reference(fingerprint):
+    graph = _graph()
+    loader = MemoryLoader(graph)
+    loader._load_manifest_streaming(MANIFEST, CATALOG, fingerprint)
+    graph['written'] = loader.written
+    return graph
+
+
+def test_completed_load_leaves_no_journal(reference):
+    assert reference['rows']
+    assert reference['progress'] is None
+
+
+@pytest.mark.parametrize('fail_after', [0, 4, 20])
+def test_interrupted_load_resumes_from_its_last_checkpoint(fingerprint, reference, fail_after):
+    graph = _graph()
+    with pytest.raises(Interrupted):
+        MemoryLoader(graph, fail_after)._load_manifest_streaming(MANIFEST, CATALOG, fingerprint)
+    journal = graph['progress']
+    assert journal['manifest_hash'] == fingerprint.manifest_hash
+    clears = graph['clears']
+
+    loader = MemoryLoader(graph)
+    assert loader._resume_point(fingerprint) == journal
+    loader._load_manifest_streaming(MANIFEST, CATALOG, fingerprint)
+    assert graph['clears'] == clears
+    assert graph['rows'] == reference['rows']
+    assert graph['progress'] is None
+    # Batches up to the checkpoint are not written again
+    assert loader.written <= reference['written'] - journal['batch']
+
+
+def test_journal_of_other_content_or_batch_sizes_is_ignored(fingerprint):
+    graph = _graph()
+    with pytest.raises(Interrupted):
+        MemoryLoader(graph, 10)._load_manifest_streaming(MANIFEST, CATALOG, fingerprint)
+
+    assert MemoryLoader(graph, workers=2)._resume_point(fingerprint) is None
+    other = ManifestFingerprint.from_content('{"metadata": {}}')
+    assert MemoryLoader(graph)._resume_point(other) is None
+
+    clears = graph['clears']
+    MemoryLoader(graph)._load_manifest_streaming(MANIFEST, CATALOG, other)
+    assert graph['clears'] > clears